@@ -1,112 +1,249 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ..db.database import get_db, get_read_db
 from ..models.user import User
-from ..models.course import Course, Module, Enrollment, Progress
-from ..schemas.course import CourseCreate, ModuleCreate
+from ..models.course import Course, Module, UserCourseProgress
+from ..models.stats import CourseStats, LearnerActivity
+from ..schemas.admin import (
+    CacheStats, CatalogCacheStats, DashboardActivity, DashboardTotals, ForumEventStats, PasswordHashingStats,
+    ProfileToken
+)
+from ..schemas.common import Message
+from ..schemas.course import CourseCreate, CourseSummary, ModuleCreate, ModuleResponse
+from ..schemas.user import UserAdminUpdate, UserResponse
+from ..core.config import settings
+from ..core.profiler import (
+    PROFILE_HEADER, ProfilerBusyError, collapse, create_profile_token, profile_process, request_profiles
+)
+from ..core.security import password_hasher
+from ..services.catalog import catalog_cache
+from ..services.forum import forum_events
+from ..services.progress import shift_module_counters
+from ..services.search import (
+    course_document, doc_id, index_documents, module_document, remove_course, remove_documents
+)
+from ..services.stats import get_activity, get_totals, recount_course_completions
+from ..services.sync import record_deletions
 from .auth import get_current_user
+from .dependencies import user_cache
+from .pagination import decode_id_cursor, page_limit, paginate
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-def verify_admin(current_user: User = Depends(get_current_user)):
+async def verify_admin(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
-@router.get("/stats")
-def get_stats(db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    total_users = db.query(User).count()
-    total_courses = db.query(Course).count()
-    total_enrollments = db.query(Enrollment).count()
-    total_modules = db.query(Module).count()
-    
-    return {
-        "totalUsers": total_users,
-        "totalCourses": total_courses,
-        "totalEnrollments": total_enrollments,
-        "totalModules": total_modules
-    }
+@router.get("/stats", response_model=DashboardTotals)
+async def get_stats(db: AsyncSession = Depends(get_read_db), admin: User = Depends(verify_admin)):
+    return await get_totals(db)
 
-@router.get("/users")
-def get_users(db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    users = db.query(User).all()
+@router.get("/stats/activity", response_model=DashboardActivity)
+async def get_stats_activity(
+    days: int = Query(30, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db),
+    admin: User = Depends(verify_admin)
+):
+    return await get_activity(db, days)
+
+@router.get("/users", response_model=List[UserResponse])
+async def get_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
+    db: AsyncSession = Depends(get_read_db),
+    admin: User = Depends(verify_admin)
+):
+    query = select(User).order_by(User.id).limit(limit + 1)
+    if cursor:
+        query = query.where(User.id > decode_id_cursor(cursor))
+    users = paginate((await db.scalars(query)).all(), limit, response, lambda u: (u.id,))
     return users
 
-@router.delete("/users/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    user = db.query(User).filter(User.id == user_id).first()
+@router.delete("/users/{user_id}", response_model=Message)
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.role == "admin":
         raise HTTPException(status_code=403, detail="Cannot delete admin users")
     
-    db.delete(user)
-    db.commit()
+    await db.execute(delete(UserCourseProgress).where(UserCourseProgress.user_id == user_id))
+    await db.execute(delete(LearnerActivity).where(LearnerActivity.user_id == user_id))
+    await db.delete(user)
+    await db.commit()
+    user_cache.invalidate(user_id)
     return {"message": "User deleted successfully"}
 
-@router.get("/courses")
-def get_admin_courses(db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    courses = db.query(Course).all()
+@router.put("/users/{user_id}", response_model=UserResponse)
+async def update_user(user_id: int, data: UserAdminUpdate, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if data.role is not None and data.role not in ("learner", "admin"):
+        raise HTTPException(status_code=400, detail="Invalid role")
+    
+    # Both columns are non-nullable, so an explicit null leaves the field as it is
+    for key, value in data.model_dump(exclude_unset=True, exclude_none=True).items():
+        setattr(user, key, value)
+    
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user_id)
+    return user
+
+@router.get("/cache/users", response_model=CacheStats)
+async def get_user_cache_stats(admin: User = Depends(verify_admin)):
+    return user_cache.stats()
+
+@router.get("/cache/catalog", response_model=CatalogCacheStats)
+async def get_catalog_cache_stats(admin: User = Depends(verify_admin)):
+    return {**catalog_cache.stats(), "version": await catalog_cache.version()}
+
+@router.get("/forum-events", response_model=ForumEventStats)
+async def get_forum_event_stats(admin: User = Depends(verify_admin)):
+    return forum_events.stats()
+
+@router.get("/password-hashing", response_model=PasswordHashingStats)
+async def get_password_hashing_stats(admin: User = Depends(verify_admin)):
+    return password_hasher.stats()
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(settings.PROFILER_INTERVAL_MS, ge=1, le=1000),
+    all_threads: bool = False,
+    admin: User = Depends(verify_admin)
+):
+    """Sample the worker serving this request; returns collapsed stacks for a flamegraph."""
+    try:
+        sampler = await profile_process(seconds, interval_ms / 1000, all_threads)
+    except ProfilerBusyError:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    return collapse(sampler.samples)
+
+@router.post("/profile/token", response_model=ProfileToken)
+async def get_profile_token(admin: User = Depends(verify_admin)):
+    """A token that, sent as the X-Profile-Token header, profiles that one request."""
+    return {
+        "token": create_profile_token(admin.email),
+        "header": PROFILE_HEADER,
+        "expires_in": settings.PROFILER_TOKEN_TTL_SECONDS
+    }
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(profile_id: str, admin: User = Depends(verify_admin)):
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+@router.get("/courses", response_model=List[CourseSummary])
+async def get_admin_courses(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
+    db: AsyncSession = Depends(get_read_db),
+    admin: User = Depends(verify_admin)
+):
+    query = select(Course).order_by(Course.id).limit(limit + 1)
+    if cursor:
+        query = query.where(Course.id > decode_id_cursor(cursor))
+    courses = paginate((await db.scalars(query)).all(), limit, response, lambda c: (c.id,))
     return courses
 
-@router.post("/courses")
-def create_admin_course(course: CourseCreate, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
+@router.post("/courses", response_model=CourseSummary)
+async def create_admin_course(course: CourseCreate, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
     new_course = Course(**course.dict())
     db.add(new_course)
-    db.commit()
-    db.refresh(new_course)
+    await db.flush()
+    await index_documents(db, [course_document(new_course)])
+    await db.commit()
+    await catalog_cache.bump()
+    await db.refresh(new_course)
     return new_course
 
-@router.put("/courses/{course_id}")
-def update_course(course_id: int, course: CourseCreate, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    db_course = db.query(Course).filter(Course.id == course_id).first()
+@router.put("/courses/{course_id}", response_model=CourseSummary)
+async def update_course(course_id: int, course: CourseCreate, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    db_course = await db.get(Course, course_id)
     if not db_course:
         raise HTTPException(status_code=404, detail="Course not found")
     
     for key, value in course.dict().items():
         setattr(db_course, key, value)
     
-    db.commit()
-    db.refresh(db_course)
+    await index_documents(db, [course_document(db_course)])
+    await db.commit()
+    await catalog_cache.bump()
+    await db.refresh(db_course)
     return db_course
 
-@router.delete("/courses/{course_id}")
-def delete_course(course_id: int, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    db_course = db.query(Course).filter(Course.id == course_id).first()
+@router.delete("/courses/{course_id}", response_model=Message)
+async def delete_course(course_id: int, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    db_course = await db.get(Course, course_id)
     if not db_course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    db.delete(db_course)
-    db.commit()
+    await db.execute(delete(UserCourseProgress).where(UserCourseProgress.course_id == course_id))
+    await db.execute(delete(CourseStats).where(CourseStats.course_id == course_id))
+    await remove_course(db, course_id)
+    module_ids = (await db.scalars(select(Module.id).where(Module.course_id == course_id))).all()
+    await record_deletions(db, "module", module_ids)
+    await record_deletions(db, "course", [course_id])
+    await db.delete(db_course)
+    await db.commit()
+    await catalog_cache.bump()
     return {"message": "Course deleted successfully"}
 
-@router.post("/courses/{course_id}/modules")
-def create_admin_module(course_id: int, module: ModuleCreate, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    new_module = Module(course_id=course_id, **module.dict())
+@router.post("/courses/{course_id}/modules", response_model=ModuleResponse)
+async def create_admin_module(course_id: int, module: ModuleCreate, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    new_module = Module(course_id=course_id, **module.dict(exclude={"course_id"}))
     db.add(new_module)
-    db.commit()
-    db.refresh(new_module)
+    await db.flush()
+    await shift_module_counters(db, new_module.id, course_id, 1)
+    await recount_course_completions(db, course_id)
+    await index_documents(db, [module_document(new_module)])
+    await db.commit()
+    await catalog_cache.bump()
+    await db.refresh(new_module)
     return new_module
 
-@router.put("/modules/{module_id}")
-def update_module(module_id: int, module: ModuleCreate, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    db_module = db.query(Module).filter(Module.id == module_id).first()
+@router.put("/modules/{module_id}", response_model=ModuleResponse)
+async def update_module(module_id: int, module: ModuleCreate, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    db_module = await db.get(Module, module_id)
     if not db_module:
         raise HTTPException(status_code=404, detail="Module not found")
     
+    if module.course_id != db_module.course_id:
+        await shift_module_counters(db, module_id, db_module.course_id, -1)
+        await shift_module_counters(db, module_id, module.course_id, 1)
+        await recount_course_completions(db, db_module.course_id)
+        await recount_course_completions(db, module.course_id)
+    
     for key, value in module.dict().items():
         setattr(db_module, key, value)
     
-    db.commit()
-    db.refresh(db_module)
+    await index_documents(db, [module_document(db_module)])
+    await db.commit()
+    await catalog_cache.bump()
+    await db.refresh(db_module)
     return db_module
 
-@router.delete("/modules/{module_id}")
-def delete_module(module_id: int, db: Session = Depends(get_db), admin: User = Depends(verify_admin)):
-    db_module = db.query(Module).filter(Module.id == module_id).first()
+@router.delete("/modules/{module_id}", response_model=Message)
+async def delete_module(module_id: int, db: AsyncSession = Depends(get_db), admin: User = Depends(verify_admin)):
+    db_module = await db.get(Module, module_id)
     if not db_module:
         raise HTTPException(status_code=404, detail="Module not found")
     
-    db.delete(db_module)
-    db.commit()
+    await shift_module_counters(db, module_id, db_module.course_id, -1)
+    await recount_course_completions(db, db_module.course_id)
+    await remove_documents(db, [doc_id("module", module_id)])
+    await record_deletions(db, "module", [module_id])
+    await db.delete(db_module)
+    await db.commit()
+    await catalog_cache.bump()
     return {"message": "Module deleted successfully"}
@@ -1,22 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from ..db.database import get_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserResponse, Token, UserLogin
-from ..core.security import verify_password, get_password_hash, create_access_token
+from ..core.security import HashingBusyError, create_access_token, hash_password, verify_and_update_password
 from ..core.config import settings
-from .dependencies import get_current_user
+from .dependencies import get_current_user, inactive_exception
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+def _busy_exception():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+async def _get_credentials(db: AsyncSession, email: str):
+    result = await db.execute(select(User.id, User.email, User.hashed_password, User.is_active).where(User.email == email))
+    row = result.first()
+    # Hand the pooled connection back before the slow bcrypt step
+    await db.close()
+    return row
+
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await _get_credentials(db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await hash_password(user.password)
+    except HashingBusyError:
+        raise _busy_exception()
     new_user = User(
         name=user.name,
         email=user.email,
@@ -24,26 +42,38 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         role="learner"
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
+    db_user = await _get_credentials(db, user.email)
+    verified, new_hash = False, None
+    if db_user:
+        try:
+            verified, new_hash = await verify_and_update_password(user.password, db_user.hashed_password)
+        except HashingBusyError:
+            raise _busy_exception()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not db_user.is_active:
+        raise inactive_exception()
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was written
+        await db.execute(update(User).where(User.id == db_user.id).values(hashed_password=new_hash))
+        await db.commit()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": db_user.email}, expires_delta=access_token_expires
+        data={"sub": db_user.email, "uid": db_user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
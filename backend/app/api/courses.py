@@ -1,158 +1,219 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+import orjson
+from functools import lru_cache
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
-from ..db.database import get_db
+from ..core.compression import deflate_part
+from ..core.config import settings
+from ..db.database import dialect_insert, get_db, get_read_db
 from ..models.user import User
 from ..models.course import Course, Module, Enrollment, Progress
-from ..schemas.course import CourseCreate, CourseResponse, ModuleCreate, ModuleResponse, EnrollmentResponse, ProgressUpdate, ProgressResponse
+from ..schemas.course import (
+    CatalogCourse, CourseCreate, CourseDetail, CourseProgressTotals, CourseResponse, ModuleCreate, ModuleResponse,
+    EnrollmentResponse, ProgressBatchItem, ProgressBatchResponse, ProgressResponse, ProgressSummary, ProgressUpdate
+)
+from ..services.catalog import (
+    build_catalog_page, build_course, build_module_list, catalog_cache, deflated_parts, get_enrolled_course_ids
+)
+from ..services.progress import (
+    ensure_course_progress, get_course_progress, get_module_course_ids, get_progress_summary, progress_percentage,
+    refresh_course_progress, shift_module_counters, write_progress
+)
+from ..services.search import course_document, index_documents, module_document
+from ..services.stats import record_enrollment, record_progress, recount_course_completions
 from .auth import get_current_user
+from .http_cache import etag_response, shared_etag_response
+from .pagination import NEXT_CURSOR_HEADER, decode_id_cursor, encode_cursor, page_limit
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
-@router.get("/")
-def get_courses(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    courses = db.query(Course).all()
-    
-    # Add enrollment status for each course
-    result = []
-    for course in courses:
-        enrollment = db.query(Enrollment).filter(
-            Enrollment.user_id == current_user.id,
-            Enrollment.course_id == course.id
-        ).first()
-        
-        course_dict = {
-            "id": course.id,
-            "title": course.title,
-            "description": course.description,
-            "image": course.image,
-            "duration": course.duration,
-            "level": course.level,
-            "created_at": course.created_at,
-            "enrolled": enrollment is not None,
-            "modules": course.modules
-        }
-        result.append(course_dict)
+@lru_cache(maxsize=None)
+def _deflated_constant(piece: str) -> bytes:
+    return deflate_part(piece.encode())
+
+@router.get("/", response_model=List[CatalogCourse])
+async def get_courses(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Catalog entries are built from the primary: one built from a lagging
+    # replica would be cached under the new catalog version until it expires.
+    after_id = decode_id_cursor(cursor) if cursor else None
+    page = await catalog_cache.get_or_build(
+        f"courses:{after_id}:{limit}",
+        lambda: build_catalog_page(db, after_id, limit)
+    )
+    enrolled_ids = await get_enrolled_course_ids(read_db, current_user.id)
     
-    return result
+    # The shared fragments were deflated when the page was cached; only the
+    # small per-user pieces between them are compressed here.
+    pieces, parts = ["["], [_deflated_constant("[")]
+    last = len(page["ids"]) - 1
+    for i, (course_id, fragment, deflated) in enumerate(zip(page["ids"], page["fragments"], deflated_parts(page["deflated"]))):
+        tail = ('"enrolled":true}' if course_id in enrolled_ids else '"enrolled":false}') + ("," if i < last else "")
+        pieces += [fragment, tail]
+        parts += [deflated, _deflated_constant(tail)]
+    pieces.append("]")
+    parts.append(_deflated_constant("]"))
+    headers = {NEXT_CURSOR_HEADER: encode_cursor(page["next"])} if page["next"] is not None else {}
+    return etag_response(request, "".join(pieces).encode(), headers, gzip_parts=parts)
 
-@router.get("/{course_id}")
-def get_course(course_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    course = db.query(Course).filter(Course.id == course_id).first()
+@router.get("/{course_id}", response_model=CourseDetail)
+async def get_course(
+    course_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    course = await catalog_cache.get_or_build(f"course:{course_id}", lambda: build_course(db, course_id))
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    enrollment = db.query(Enrollment).filter(
+    enrollment = await read_db.scalar(select(Enrollment.id).where(
         Enrollment.user_id == current_user.id,
         Enrollment.course_id == course_id
-    ).first()
-    
-    # Calculate progress
-    modules = db.query(Module).filter(Module.course_id == course_id).all()
-    progress_records = db.query(Progress).filter(
-        Progress.user_id == current_user.id,
-        Progress.module_id.in_([m.id for m in modules])
-    ).all()
+    ).limit(1))
     
-    completed_count = len([p for p in progress_records if p.completed])
-    progress_percentage = 0
-    if len(modules) > 0:
-        progress_percentage = int((completed_count / len(modules)) * 100)
+    completed_count, total_modules = await get_course_progress(read_db, current_user.id, course_id)
     
-    return {
-        "id": course.id,
-        "title": course.title,
-        "description": course.description,
-        "image": course.image,
-        "duration": course.duration,
-        "level": course.level,
-        "created_at": course.created_at,
+    tail = orjson.dumps({
         "enrolled": enrollment is not None,
-        "progress": progress_percentage,
-        "modules": course.modules
-    }
+        "progress": progress_percentage(completed_count, total_modules)
+    })[1:]
+    return etag_response(
+        request,
+        course["fragment"].encode() + tail,
+        gzip_parts=deflated_parts([course["deflated"]]) + [deflate_part(tail)]
+    )
 
 @router.post("/", response_model=CourseResponse)
-def create_course(course: CourseCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_course(course: CourseCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
     new_course = Course(**course.dict())
     db.add(new_course)
-    db.commit()
-    db.refresh(new_course)
+    await db.flush()
+    await index_documents(db, [course_document(new_course)])
+    await db.commit()
+    await catalog_cache.bump()
+    await db.refresh(new_course, ["modules"])
     return new_course
 
 @router.post("/{course_id}/enroll", response_model=EnrollmentResponse)
-def enroll_course(course_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    course = db.query(Course).filter(Course.id == course_id).first()
+async def enroll_course(course_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    course = await db.get(Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    existing = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id,
-        Enrollment.course_id == course_id
-    ).first()
-    if existing:
-        return existing
-    
-    enrollment = Enrollment(user_id=current_user.id, course_id=course_id)
-    db.add(enrollment)
-    db.commit()
-    db.refresh(enrollment)
+    # Insert-or-ignore so concurrent enrolls cannot create duplicates; only the
+    # request that actually inserted the row counts towards the rollups.
+    stmt = dialect_insert(db, Enrollment).values(
+        user_id=current_user.id,
+        course_id=course_id,
+        enrolled_at=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "course_id"]).returning(Enrollment)
+    enrollment = await db.scalar(stmt)
+    if enrollment is None:
+        enrollment = await db.scalar(
+            select(Enrollment).where(Enrollment.user_id == current_user.id, Enrollment.course_id == course_id)
+        )
+    else:
+        await record_enrollment(db, current_user.id, course_id)
+    await ensure_course_progress(db, current_user.id, course_id)
+    await db.commit()
     return enrollment
 
 @router.get("/{course_id}/modules", response_model=List[ModuleResponse])
-def get_modules(course_id: int, db: Session = Depends(get_db)):
-    modules = db.query(Module).filter(Module.course_id == course_id).order_by(Module.order).all()
-    return modules
+async def get_modules(course_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    modules = await catalog_cache.get_or_build(f"modules:{course_id}", lambda: build_module_list(db, course_id))
+    return await shared_etag_response(request, modules["body"].encode())
 
 @router.post("/{course_id}/modules", response_model=ModuleResponse)
-def create_module(course_id: int, module: ModuleCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_module(course_id: int, module: ModuleCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
     new_module = Module(**module.dict())
     db.add(new_module)
-    db.commit()
-    db.refresh(new_module)
+    await db.flush()
+    await shift_module_counters(db, new_module.id, new_module.course_id, 1)
+    await recount_course_completions(db, new_module.course_id)
+    await index_documents(db, [module_document(new_module)])
+    await db.commit()
+    await catalog_cache.bump()
+    await db.refresh(new_module)
     return new_module
 
 @router.post("/modules/{module_id}/progress", response_model=ProgressResponse)
-def update_progress(module_id: int, progress_data: ProgressUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    module = db.query(Module).filter(Module.id == module_id).first()
+async def update_progress(module_id: int, progress_data: ProgressUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    module = await db.get(Module, module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
     
-    progress = db.query(Progress).filter(
-        Progress.user_id == current_user.id,
-        Progress.module_id == module_id
-    ).first()
-    
-    if progress:
-        progress.completed = 1 if progress_data.completed else 0
-        progress.completed_at = datetime.utcnow() if progress_data.completed else None
-    else:
-        progress = Progress(
-            user_id=current_user.id,
-            module_id=module_id,
-            completed=1 if progress_data.completed else 0,
-            completed_at=datetime.utcnow() if progress_data.completed else None
-        )
-        db.add(progress)
-    
-    db.commit()
-    db.refresh(progress)
+    completed = 1 if progress_data.completed else 0
+    now = datetime.utcnow()
+    stmt = dialect_insert(db, Progress).values(
+        user_id=current_user.id,
+        module_id=module_id,
+        completed=completed,
+        completed_at=now if progress_data.completed else None,
+        updated_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "module_id"],
+        set_={
+            "completed": stmt.excluded.completed,
+            "completed_at": stmt.excluded.completed_at,
+            "updated_at": stmt.excluded.updated_at
+        }
+    ).returning(Progress)
+    progress = await db.scalar(stmt, execution_options={"populate_existing": True})
+    counts = await refresh_course_progress(db, current_user.id, module.course_id)
+    await record_progress(db, current_user.id, module.course_id, *counts)
+    await db.commit()
     return progress
 
-@router.get("/user/progress")
-def get_user_progress(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    enrollments = db.query(Enrollment).filter(Enrollment.user_id == current_user.id).all()
-    progress = db.query(Progress).filter(Progress.user_id == current_user.id).all()
+@router.post("/progress:batch", response_model=ProgressBatchResponse)
+async def update_progress_batch(
+    updates: List[ProgressBatchItem] = Body(..., min_length=1, max_length=settings.PROGRESS_BATCH_MAX_SIZE),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # One query validates every module, one statement writes every row and the
+    # batch commits once; a later entry for the same module wins.
+    now = datetime.utcnow()
+    entries = {update.module_id: (update.completed, now) for update in updates}
+    course_ids = await get_module_course_ids(db, list(entries))
+    missing = sorted(entries.keys() - course_ids.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Modules not found: {', '.join(map(str, missing))}")
+    
+    progress, totals = await write_progress(db, current_user.id, entries, course_ids)
+    for course_id in set(course_ids.values()) - totals.keys():
+        # Only reached when a concurrent request wrote these rows after ``now``
+        totals[course_id] = await get_course_progress(db, current_user.id, course_id)
+    await db.commit()
+    return ProgressBatchResponse(
+        progress=sorted(progress, key=lambda p: p.module_id),
+        courses=[CourseProgressTotals(
+            course_id=course_id,
+            completed_modules=completed,
+            total_modules=total,
+            progress=progress_percentage(completed, total)
+        ) for course_id, (completed, total) in sorted(totals.items())]
+    )
+
+@router.get("/user/progress", response_model=ProgressSummary)
+async def get_user_progress(db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
+    enrolled_courses, completed_modules = await get_progress_summary(db, current_user.id)
     
-    return {
-        "enrolledCourses": len(enrollments),
-        "completedModules": len([p for p in progress if p.completed]),
-        "certificatesEarned": 0
-    }
+    return ProgressSummary(enrolled_courses=enrolled_courses, completed_modules=completed_modules)
@@ -1,25 +1,49 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..db.database import get_db
 from ..models.user import User
+from ..core.cache import TTLCache
+from ..core.config import settings
 from ..core.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Authenticated users keyed by id. Entries are detached from their session,
+# so only column attributes may be read from a cached user.
+user_cache = TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+def inactive_exception():
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="This account has been deactivated")
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     payload = decode_token(token)
-    if payload is None:
+    # Scoped tokens (see ``create_profile_token``) only grant their scope
+    if payload is None or "scope" in payload:
         raise credentials_exception
     email: str = payload.get("sub")
     if email is None:
         raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+    user_id = payload.get("uid")
+    user = user_cache.get(user_id) if user_id is not None else None
+    if user is None or user.email != email:
+        if user_id is not None:
+            user = await db.get(User, user_id)
+        else:
+            # Tokens issued before the uid claim existed
+            user = await db.scalar(select(User).where(User.email == email))
+        if user is None or user.email != email:
+            raise credentials_exception
+        db.expunge(user)
+        user_cache.set(user.id, user)
+    # Admin changes to a user evict the cached entry, so deactivation applies
+    # to tokens that were issued before it
+    if not user.is_active:
+        raise inactive_exception()
     return user
@@ -1,46 +1,68 @@
-from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
-from ..db.database import get_db
-from ..models.forum import ForumTopic
+import anyio
+import time
+from fastapi import APIRouter, Request, Depends, HTTPException, Response, WebSocket
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from typing import List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from ..core.config import settings
+from ..db.database import get_db, get_read_db
+from ..models.forum import ForumTopic, ForumComment
+from ..services.forum import forum_events, topic_summary, topic_summary_query
+from ..services.search import comment_document, index_documents, remove_topic, topic_document
+from ..services.sync import record_deletions
 from .dependencies import get_current_user
+from .pagination import decode_time_id_cursor, page_limit, paginate
 from ..models.user import User
+from ..schemas.common import ErrorMessage, Message
+from ..schemas.forum import CommentResponse, TopicDetail, TopicSummary
 from datetime import datetime
 
 router = APIRouter(prefix="/forum", tags=["Forum"])
 
-@router.get("/topics")
-async def get_topics(db: Session = Depends(get_db)):
-    topics = db.query(ForumTopic).order_by(ForumTopic.created_at.desc()).all()
-    return [{
-        "id": t.id,
-        "title": t.title,
-        "excerpt": t.content[:150] + "..." if len(t.content) > 150 else t.content,
-        "category": t.category,
-        "author": t.user.name if t.user else "Anonymous",
-        "createdAt": t.created_at.isoformat(),
-        "commentsCount": 0,
-        "votesCount": 0
-    } for t in topics]
+@router.get("/topics", response_model=List[TopicSummary])
+async def get_topics(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_limit),
+    db: AsyncSession = Depends(get_read_db)
+):
+    query = (
+        topic_summary_query()
+        .order_by(ForumTopic.created_at.desc(), ForumTopic.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, last_id = decode_time_id_cursor(cursor)
+        query = query.where(or_(
+            ForumTopic.created_at < created_at,
+            and_(ForumTopic.created_at == created_at, ForumTopic.id < last_id)
+        ))
+    topics = paginate((await db.execute(query)).all(), limit, response, lambda t: (t.created_at, t.id))
+    return [topic_summary(t) for t in topics]
 
-@router.get("/topics/{topic_id}")
-async def get_topic(topic_id: int, db: Session = Depends(get_db)):
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
+@router.get("/topics/{topic_id}", response_model=TopicDetail)
+async def get_topic(topic_id: int, db: AsyncSession = Depends(get_read_db)):
+    topic = await db.scalar(
+        select(ForumTopic).options(joinedload(ForumTopic.user)).where(ForumTopic.id == topic_id)
+    )
     if not topic:
         return {"id": topic_id, "title": "Not Found", "content": "Topic not found"}
-    return {
-        "id": topic.id,
-        "title": topic.title,
-        "content": topic.content,
-        "category": topic.category,
-        "author": topic.user.name if topic.user else "Anonymous",
-        "createdAt": topic.created_at.isoformat()
-    }
+    return TopicDetail(
+        id=topic.id,
+        title=topic.title,
+        content=topic.content,
+        category=topic.category,
+        author=topic.user.name if topic.user else "Anonymous",
+        created_at=topic.created_at
+    )
 
-@router.post("/topics")
+@router.post("/topics", response_model=TopicDetail)
 async def create_topic(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     data = await request.json()
     topic = ForumTopic(
@@ -51,29 +73,115 @@ async def create_topic(
         created_at=datetime.utcnow()
     )
     db.add(topic)
-    db.commit()
-    db.refresh(topic)
-    return {
-        "id": topic.id,
-        "title": topic.title,
-        "content": topic.content,
-        "category": topic.category,
-        "author": current_user.name,
-        "createdAt": topic.created_at.isoformat()
-    }
+    await db.flush()
+    await index_documents(db, [topic_document(topic)])
+    await db.commit()
+    await db.refresh(topic)
+    summary = topic_summary((await db.execute(topic_summary_query().where(ForumTopic.id == topic.id))).one())
+    await forum_events.publish("topic.created", summary.model_dump(mode="json", by_alias=True))
+    return TopicDetail(
+        id=topic.id,
+        title=topic.title,
+        content=topic.content,
+        category=topic.category,
+        author=current_user.name,
+        created_at=topic.created_at
+    )
 
-@router.delete("/topics/{topic_id}")
+@router.delete("/topics/{topic_id}", response_model=Union[Message, ErrorMessage])
 async def delete_topic(
     topic_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    topic = db.query(ForumTopic).filter(ForumTopic.id == topic_id).first()
+    topic = await db.get(ForumTopic, topic_id)
     if not topic:
         return {"error": "Topic not found"}
     if topic.user_id != current_user.id and current_user.role != "admin":
         return {"error": "Not authorized"}
     
-    db.delete(topic)
-    db.commit()
+    await remove_topic(db, topic_id)
+    await record_deletions(db, "topic", [topic_id])
+    await db.delete(topic)
+    await db.commit()
+    await forum_events.publish("topic.deleted", {"id": topic_id})
     return {"message": "Topic deleted successfully"}
+
+@router.post("/topics/{topic_id}/comments", response_model=CommentResponse)
+@router.post("/topics/{topic_id}/replies", response_model=CommentResponse, include_in_schema=False)
+async def create_comment(
+    topic_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    topic = await db.get(ForumTopic, topic_id)
+    if not topic:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    data = await request.json()
+    if not (data.get("content") or "").strip():
+        raise HTTPException(status_code=400, detail="Comment content is required")
+    comment = ForumComment(
+        topic_id=topic_id,
+        user_id=current_user.id,
+        content=data["content"],
+        created_at=datetime.utcnow()
+    )
+    db.add(comment)
+    # The topic's comment count changed, so it is part of the next sync
+    topic.updated_at = comment.created_at
+    await db.flush()
+    await index_documents(db, [comment_document(comment)])
+    await db.commit()
+    response = CommentResponse(
+        id=comment.id,
+        topic_id=topic_id,
+        content=comment.content,
+        author=current_user.name,
+        created_at=comment.created_at
+    )
+    await forum_events.publish("comment.created", response.model_dump(mode="json", by_alias=True))
+    return response
+
+# Push channels: each event is one JSON object {"type", "data"} where type is
+# topic.created (data is a topic list item), topic.deleted ({"id"}) or
+# comment.created (data is the comment). A client that falls too far behind
+# is disconnected and should refetch before reconnecting.
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events():
+    async def stream():
+        # The server waits for open responses before it stops, so streams end
+        # on their own after a while and EventSource reconnects.
+        ends_at = time.monotonic() + settings.FORUM_EVENTS_MAX_STREAM_SECONDS
+        async with forum_events.subscribe() as subscription:
+            yield b"retry: 5000\n\n"
+            async for message in subscription.messages():
+                if message is not None:
+                    yield b"data: " + message + b"\n\n"
+                elif time.monotonic() >= ends_at:
+                    return
+                else:
+                    yield b": keepalive\n\n"
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def socket_events(websocket: WebSocket):
+    await websocket.accept()
+    async with forum_events.subscribe() as subscription, anyio.create_task_group() as tasks:
+        async def send():
+            async for message in subscription.messages():
+                if message is not None:
+                    await websocket.send_text(message.decode())
+            await websocket.close()
+            tasks.cancel_scope.cancel()
+        
+        tasks.start_soon(send)
+        # The channel is one-way; reading only notices the client going away
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+        tasks.cancel_scope.cancel()
@@ -0,0 +1,70 @@
+import hashlib
+from fastapi import Request, Response
+from ..core.compression import accepts, encoded_etag, get_precompressed, gzip_join, negotiate, strip_encoding
+from ..core.config import settings
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = strip_encoding(candidate.strip())
+        if candidate == "*" or candidate == etag or candidate == "W/" + etag:
+            return True
+    return False
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and _etag_matches(if_none_match, etag)
+
+def etag_response(request: Request, body: bytes, headers: dict = None, gzip_parts=None) -> Response:
+    """Return a JSON body with a strong ETag, or an empty 304 if the client already has it.
+    
+    ``gzip_parts`` are the pieces of ``body`` deflated with ``deflate_part``;
+    when given and the client accepts gzip, they are joined instead of
+    leaving the whole body to the compression middleware.
+
+    The ETag names the encoding the 200 goes out in, whether it is joined
+    here or compressed by the middleware, so a 304 carries the same
+    validator as the representation the client has.
+    """
+    etag = make_etag(body)
+    accept_encoding = request.headers.get("accept-encoding")
+    encoding = None
+    if len(body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = "gzip" if gzip_parts is not None and accepts(accept_encoding, "gzip") else negotiate(accept_encoding)
+    headers = {
+        **(headers or {}),
+        "ETag": encoded_etag(etag, encoding) if encoding else etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding == "gzip" and gzip_parts is not None:
+        body = gzip_join(body, gzip_parts)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def shared_etag_response(request: Request, body: bytes, headers: dict = None) -> Response:
+    """Like ``etag_response`` for bodies that are identical for every client.
+    
+    The compressed variants are built once per body at the highest settings
+    and reused, instead of being recompressed by the middleware per request.
+    """
+    etag = make_etag(body)
+    encoding = None
+    if len(body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = negotiate(request.headers.get("accept-encoding"))
+    headers = {
+        **(headers or {}),
+        "ETag": encoded_etag(etag, encoding) if encoding else etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        body = await get_precompressed(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, Query, Response
+from ..core.config import settings
+
+# Keyset pagination: list endpoints return a plain JSON array and, when more
+# rows exist, an opaque cursor in the X-Next-Cursor header. Clients pass it
+# back as ?cursor= to fetch the next page.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def page_limit(limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE)):
+    return limit
+
+def encode_cursor(*values) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def decode_id_cursor(cursor: str) -> int:
+    (last_id,) = decode_cursor(cursor, 1)
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+def decode_time_id_cursor(cursor: str):
+    created_at, last_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), int(last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(rows, limit: int, response: Response, cursor_values):
+    """Trim a ``limit + 1`` row fetch to one page and set the next-page cursor header.
+
+    ``cursor_values`` maps the last row of the page to the values of its sort key.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*cursor_values(rows[-1]))
+    return rows
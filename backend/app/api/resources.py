@@ -1,104 +1,56 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from ..db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from ..db.database import get_read_db
 from ..models.resource import Resource
+from ..schemas.common import ErrorMessage
+from ..schemas.resource import NearbyResource, ResourceResponse
+from ..services.resources import MAX_RADIUS_KM, find_nearest
+from .pagination import decode_id_cursor, page_limit, paginate
 
 router = APIRouter(prefix="/resources", tags=["Resources"])
 
-@router.get("/")
-async def get_resources(type: str = None, db: Session = Depends(get_db)):
-    query = db.query(Resource)
-    if type:
-        query = query.filter(Resource.type == type)
-    resources = query.all()
-    
-    if not resources:
-        # Return mock data if no resources in database
-        mock_resources = [
-            {
-                "id": 1,
-                "name": "Kenyatta National Hospital VCT",
-                "type": "testing_center",
-                "description": "Free HIV testing and counseling services",
-                "address": "Hospital Rd, Upper Hill, Nairobi",
-                "phone": "+254-20-2726300",
-                "email": "info@knh.or.ke",
-                "website": "https://knh.or.ke",
-                "hours": "Mon-Fri 8AM-5PM, Sat 8AM-12PM",
-                "services": "HIV Testing, STD Testing, Counseling, PrEP"
-            },
-            {
-                "id": 2,
-                "name": "Kenya AIDS NGOs Consortium (KANCO)",
-                "type": "support_service",
-                "description": "Peer support and advocacy for people living with HIV",
-                "address": "Argwings Kodhek Rd, Hurlingham, Nairobi",
-                "phone": "+254-20-2715790",
-                "email": "info@kanco.org",
-                "website": "https://kanco.org",
-                "hours": "24/7 Hotline, Office: Mon-Fri 8AM-5PM",
-                "services": "Peer Support, Legal Aid, Advocacy, Community Outreach"
-            },
-            {
-                "id": 3,
-                "name": "Mombasa Counseling Center",
-                "type": "counseling",
-                "description": "Mental health and wellness support",
-                "address": "Digo Rd, Mombasa",
-                "phone": "+254-41-2312345",
-                "email": "help@mombasacounseling.org",
-                "website": "https://mombasacounseling.org",
-                "hours": "Mon-Sat 9AM-6PM",
-                "services": "Individual Therapy, Group Therapy, Crisis Intervention"
-            },
-            {
-                "id": 4,
-                "name": "Kisumu District Hospital VCT",
-                "type": "testing_center",
-                "description": "Comprehensive HIV care and treatment",
-                "address": "Kakamega Rd, Kisumu",
-                "phone": "+254-57-2023456",
-                "email": "vct@kisumuhospital.go.ke",
-                "website": "https://kisumuhospital.go.ke",
-                "hours": "Mon-Fri 8AM-5PM",
-                "services": "HIV Testing, Treatment, PrEP, PEP, Specialist Care"
-            },
-            {
-                "id": 5,
-                "name": "Nakuru Family Health Options Kenya",
-                "type": "support_service",
-                "description": "Family planning and HIV prevention services",
-                "address": "Kenyatta Ave, Nakuru",
-                "phone": "+254-51-2212345",
-                "email": "nakuru@fhok.org",
-                "website": "https://fhok.org",
-                "hours": "Mon-Fri 8AM-5PM, Sat 9AM-1PM",
-                "services": "Family Planning, HIV Prevention, Youth Services"
-            },
-            {
-                "id": 6,
-                "name": "Eldoret AMPATH Center",
-                "type": "testing_center",
-                "description": "Academic Model Providing Access to Healthcare",
-                "address": "Moi Teaching Hospital, Eldoret",
-                "phone": "+254-53-2033471",
-                "email": "info@ampath.org",
-                "website": "https://ampath.org",
-                "hours": "Mon-Fri 7AM-6PM",
-                "services": "HIV Testing, Treatment, Research, Training"
-            }
+def parse_point(near: str):
+    try:
+        lat, lng = (float(v) for v in near.split(","))
+    except ValueError:
+        lat = lng = None
+    if lat is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(status_code=400, detail="near must be 'lat,lng' in degrees")
+    return lat, lng
+
+@router.get("/", response_model=Union[List[NearbyResource], List[ResourceResponse]])
+async def get_resources(
+    response: Response,
+    type: str = None,
+    cursor: Optional[str] = None,
+    near: Optional[str] = Query(None, description="lat,lng"),
+    radius_km: Optional[float] = Query(None, gt=0, le=MAX_RADIUS_KM),
+    limit: int = Depends(page_limit),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if near:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with near")
+        lat, lng = parse_point(near)
+        return [
+            NearbyResource(**ResourceResponse.model_validate(resource).model_dump(), distance_km=round(distance, 3))
+            for resource, distance in await find_nearest(db, lat, lng, limit, radius_km, type)
         ]
-        
-        if type:
-            mock_resources = [r for r in mock_resources if r["type"] == type]
-        
-        return mock_resources
+    if radius_km is not None:
+        raise HTTPException(status_code=400, detail="radius_km requires near")
     
-    return resources
+    query = select(Resource).order_by(Resource.id).limit(limit + 1)
+    if type:
+        query = query.where(Resource.type == type)
+    if cursor:
+        query = query.where(Resource.id > decode_id_cursor(cursor))
+    return paginate((await db.scalars(query)).all(), limit, response, lambda r: (r.id,))
 
-@router.get("/{resource_id}")
-async def get_resource(resource_id: int, db: Session = Depends(get_db)):
-    resource = db.query(Resource).filter(Resource.id == resource_id).first()
+@router.get("/{resource_id}", response_model=Union[ResourceResponse, ErrorMessage])
+async def get_resource(resource_id: int, db: AsyncSession = Depends(get_read_db)):
+    resource = await db.get(Resource, resource_id)
     if not resource:
         return {"error": "Resource not found"}
     return resource
\ No newline at end of file
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ..db.database import get_read_db
+from ..schemas.search import SearchResult
+from ..services.search import KINDS, search_documents
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if type and type not in KINDS:
+        raise HTTPException(status_code=400, detail=f"type must be one of: {', '.join(KINDS)}")
+    return await search_documents(db, q, limit, type)
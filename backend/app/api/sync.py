@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime
+from ..db.database import get_db
+from ..models.user import User
+from ..schemas.sync import SyncChanges, SyncPush, SyncPushResult
+from ..services.sync import apply_progress_updates, get_changes
+from .auth import get_current_user
+from .pagination import decode_cursor, encode_cursor
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+def decode_sync_token(token: str) -> datetime:
+    (synced_at,) = decode_cursor(token, 1)
+    try:
+        return datetime.fromisoformat(synced_at)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+@router.get("", response_model=SyncChanges)
+async def get_sync(
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Taken before reading, so anything written during the reads is newer
+    # than the token and comes back on the next sync. Reads stay on the
+    # primary: a row a lagging replica had not yet received would be older
+    # than the token and never sent.
+    now = datetime.utcnow()
+    changes = await get_changes(db, current_user.id, decode_sync_token(since) if since else None, now)
+    return SyncChanges(token=encode_cursor(now), **changes)
+
+@router.post("", response_model=SyncPushResult)
+async def push_sync(push: SyncPush, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    applied, stale, rejected = await apply_progress_updates(db, current_user.id, push.progress)
+    await db.commit()
+    return SyncPushResult(applied=len(applied), stale=stale, rejected=rejected)
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": self.hits / lookups if lookups else 0.0
+            }
+
+class MemoryCacheBackend:
+    """In-process cache backend: an LRU of byte values plus plain counters."""
+    
+    def __init__(self, max_entries: int, ttl: float):
+        self._entries = TTLCache(max_entries, ttl)
+        self._counters = {}
+        self._lock = threading.Lock()
+    
+    async def get(self, key: str):
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        return self._entries.get(key)
+    
+    async def set(self, key: str, value: bytes):
+        self._entries.set(key, value)
+    
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+class RedisCacheBackend:
+    """Cache backend over any client exposing the async redis ``get``/``set``/``incr`` API.
+    
+    Shared by every worker, so one admin write invalidates them all. Tests and
+    local runs can pass an in-memory fake such as ``fakeredis.aioredis.FakeRedis``.
+    """
+    
+    def __init__(self, client, ttl: float):
+        self.client = client
+        self.ttl = ttl
+    
+    async def get(self, key: str):
+        return await self.client.get(key)
+    
+    async def set(self, key: str, value: bytes):
+        await self.client.set(key, value, ex=int(self.ttl))
+    
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+def create_cache_backend(url: str, max_entries: int, ttl: float):
+    """Build a backend from a URL: empty for in-process, ``redis://...`` for Redis."""
+    if not url:
+        return MemoryCacheBackend(max_entries, ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("The redis package is required for a redis:// cache URL")
+        return RedisCacheBackend(aioredis.from_url(url), ttl)
+    raise ValueError(f"Unsupported cache URL: {url}")
@@ -0,0 +1,156 @@
+import gzip
+import zlib
+import brotli
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from .cache import TTLCache
+from .config import settings
+
+# Response compression. Dynamic responses are compressed by the middleware at
+# fast settings; bodies shared by every client (see ``http_cache``) are
+# compressed once at the highest settings and served from ``precompressed``.
+# Bodies that are mostly shared pieces plus a few per-user ones are gzipped by
+# joining pieces deflated ahead of time (``deflate_part`` / ``gzip_join``).
+
+ENCODINGS = ("br", "gzip")
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 11
+# Bodies above this size are compressed on a worker thread so the event loop
+# keeps serving other requests.
+THREADPOOL_MIN_SIZE = 64 * 1024
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+DEFLATE_FINAL_BLOCK = b"\x03\x00"
+
+precompressed = TTLCache(settings.PRECOMPRESSED_CACHE_MAX_ENTRIES, settings.CATALOG_CACHE_TTL_SECONDS)
+
+def _weights(accept_encoding: str) -> dict:
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    return weights
+
+def accepts(accept_encoding: str, encoding: str) -> bool:
+    weights = _weights(accept_encoding or "")
+    return weights.get(encoding, weights.get("*", 0.0)) > 0
+
+def negotiate(accept_encoding: str):
+    """Pick the preferred supported encoding from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights = _weights(accept_encoding)
+    default = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = weights.get(encoding, default)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(
+            body,
+            mode=brotli.MODE_TEXT,
+            quality=PRECOMPRESS_BROTLI_QUALITY if best else settings.COMPRESSION_BROTLI_QUALITY
+        )
+    return gzip.compress(body, compresslevel=PRECOMPRESS_GZIP_LEVEL if best else settings.COMPRESSION_GZIP_LEVEL)
+
+async def compress_async(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if len(body) >= THREADPOOL_MIN_SIZE:
+        return await run_in_threadpool(compress, body, encoding, best)
+    return compress(body, encoding, best)
+
+def deflate_part(data: bytes) -> bytes:
+    """Deflate one piece of a larger body so it can be joined with others by ``gzip_join``.
+    
+    The output is a raw deflate stream flushed to a byte boundary without a
+    final block, which makes independently compressed pieces concatenable.
+    """
+    compressor = zlib.compressobj(PRECOMPRESS_GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+def gzip_join(body: bytes, parts) -> bytes:
+    """Wrap the deflated ``parts`` of ``body``, in order, into a single gzip member."""
+    trailer = zlib.crc32(body).to_bytes(4, "little") + (len(body) & 0xFFFFFFFF).to_bytes(4, "little")
+    return GZIP_HEADER + b"".join(parts) + DEFLATE_FINAL_BLOCK + trailer
+
+async def get_precompressed(key: str, body: bytes, encoding: str) -> bytes:
+    """Return ``body`` compressed at the highest settings, compressing it only once per ``key``."""
+    cache_key = (key, encoding)
+    compressed = precompressed.get(cache_key)
+    if compressed is None:
+        compressed = await compress_async(body, encoding, best=True)
+        precompressed.set(cache_key, compressed)
+    return compressed
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Give each encoding of a representation its own strong validator."""
+    return etag[:-1] + f'-{encoding}"' if etag.endswith('"') else etag
+
+def strip_encoding(etag: str) -> str:
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def is_compressible(content_type: str) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+class CompressionMiddleware:
+    """Compress complete responses of at least ``minimum_size`` bytes with br or gzip.
+
+    Streaming responses (more than one body message) and responses that
+    already carry a Content-Encoding are passed through untouched.
+    """
+    
+    def __init__(self, app, minimum_size: int = settings.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope, receive, send):
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if (message.get("more_body", False) or "content-encoding" in headers
+                    or len(body) < self.minimum_size or not is_compressible(headers.get("content-type"))):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            compressed = await compress_async(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            # ETags from ``http_cache`` already name the encoding, for 304s too
+            etag = headers.get("etag")
+            if etag and strip_encoding(etag) == etag:
+                headers["ETag"] = encoded_etag(etag, encoding)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+        
+        await self.app(scope, receive, send_compressed)
@@ -5,6 +5,57 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours for development
     DATABASE_URL: str = "sqlite:///./afyahub.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; ignored for SQLite
+    DB_POOL_PRE_PING: bool = True
+    DATABASE_REPLICA_URL: str = ""  # read-only replica for GET routes; empty to read from the primary
+    REPLICA_STICKY_SECONDS: int = 5  # after a write, the caller reads from the primary this long; keep above replica lag
+    REPLICA_STICKY_URL: str = ""  # where writes are remembered: empty for per-worker memory, or redis://host:6379/0
+    REPLICA_STICKY_MAX_CALLERS: int = 10000
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_SERIALIZE_WRITES: bool = True  # queue a worker's writers in order instead of racing for the file lock
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_URL: str = ""  # empty for an in-process LRU, or redis://host:6379/0
+    CATALOG_CACHE_MAX_ENTRIES: int = 1024
+    CATALOG_CACHE_TTL_SECONDS: int = 3600
+    ADMIN_STATS_TTL_SECONDS: int = 30
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    PRECOMPRESSED_CACHE_MAX_ENTRIES: int = 256
+    FORUM_EVENTS_URL: str = ""  # empty for in-process fan-out, or redis://host:6379/0
+    FORUM_EVENTS_QUEUE_SIZE: int = 64
+    FORUM_EVENTS_KEEPALIVE_SECONDS: int = 15
+    FORUM_EVENTS_MAX_STREAM_SECONDS: int = 300  # SSE clients reconnect after this, so a stopping worker is not held open
+    PROGRESS_BATCH_MAX_SIZE: int = 500
+    SYNC_OVERLAP_SECONDS: int = 5  # re-send rows written this close to a token, in case their commit lagged
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    SYNC_MAX_TOPICS: int = 100
+    SYNC_MAX_PUSH_SIZE: int = 500
+    SLOW_REQUEST_MS: int = 0  # log requests slower than this with their SQL; 0 disables
+    SLOW_REQUEST_MAX_STATEMENTS: int = 20
+    PROFILER_MAX_SECONDS: int = 60
+    PROFILER_INTERVAL_MS: int = 10
+    PROFILER_REQUEST_INTERVAL_MS: int = 1
+    PROFILER_TOKEN_TTL_SECONDS: int = 300
+    PROFILER_MAX_REQUEST_PROFILES: int = 32
+    PROFILER_RESULT_TTL_SECONDS: int = 3600
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 0  # serve.py workers; 0 for one per available CPU once the caches are shared
+    GRACEFUL_SHUTDOWN_SECONDS: int = 25  # for in-flight requests after SIGTERM; keep under the platform's kill timeout
+    READINESS_DB_TIMEOUT_SECONDS: float = 2
+    READINESS_POOL_THRESHOLD: float = 1.0  # share of pool connections in use at which a worker reports not ready
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Pushes forum events to connected clients. Each subscriber has a bounded
+# queue; one that falls behind is dropped instead of buffering without limit
+# or slowing down delivery to everyone else, and reconnects to catch up.
+
+CLOSED = object()
+KEEPALIVE = None
+
+class Subscription:
+    """A bounded queue with a single reader.
+
+    Lighter than ``asyncio.Queue``: an offer is one append and, when the
+    reader is waiting, one wakeup, which matters when every event is
+    offered to thousands of subscribers.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._messages = deque()
+        self._waiter = None
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def offer(self, message) -> bool:
+        if len(self._messages) >= self.max_size:
+            return False
+        self._messages.append(message)
+        self._wake()
+        return True
+
+    def close(self):
+        # Discard whatever is queued so the reader stops right away
+        self._messages.clear()
+        self._messages.append(CLOSED)
+        self._wake()
+
+    async def messages(self):
+        """Yield queued messages until closed; ``KEEPALIVE`` (None) marks an idle interval."""
+        while True:
+            while not self._messages:
+                self._waiter = asyncio.get_running_loop().create_future()
+                await self._waiter
+            message = self._messages.popleft()
+            if message is CLOSED:
+                return
+            yield message
+
+class LocalEventBroker:
+    """Delivers events to the subscribers of this process only."""
+
+    async def start(self, deliver):
+        self._deliver = deliver
+
+    async def publish(self, message: bytes):
+        self._deliver(message)
+
+    async def close(self):
+        pass
+
+class RedisEventBroker:
+    """Relays events through a Redis pub/sub channel so every worker receives them.
+
+    Works with any client exposing the async redis ``publish``/``pubsub`` API;
+    local runs can pass ``fakeredis.aioredis.FakeRedis``.
+    """
+
+    def __init__(self, client, channel: str = "forum:events"):
+        self.client = client
+        self.channel = channel
+        self._listener = None
+
+    async def start(self, deliver):
+        if self._listener is None or self._listener.done():
+            pubsub = self.client.pubsub()
+            await pubsub.subscribe(self.channel)
+            self._listener = asyncio.create_task(self._listen(pubsub, deliver))
+
+    async def _listen(self, pubsub, deliver):
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                deliver(message["data"])
+
+    async def publish(self, message: bytes):
+        # This worker's own subscribers get it back through the channel
+        await self.client.publish(self.channel, message)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+class EventHub:
+    def __init__(self, broker, queue_size: int, keepalive: float):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.delivered = 0
+        self.dropped = 0
+        self._subscribers = set()
+        self._ticker = None
+
+    async def publish(self, type: str, data: dict):
+        """Send an event to every subscriber; failures are logged, never raised.
+
+        Publishing happens after the write has committed, so a broker outage
+        must not turn a successful request into an error.
+        """
+        message = orjson.dumps({"type": type, "data": data})
+        try:
+            await self.broker.start(self._receive)
+            await self.broker.publish(message)
+        except Exception:
+            logger.exception("Could not publish %s event", type)
+
+    def _deliver(self, message):
+        # The message is serialized once and the same bytes are queued for everyone
+        delivered = 0
+        for subscriber in list(self._subscribers):
+            if subscriber.offer(message):
+                delivered += 1
+            else:
+                self._subscribers.discard(subscriber)
+                subscriber.close()
+                self.dropped += 1
+        return delivered
+
+    def _receive(self, message: bytes):
+        self.delivered += self._deliver(message)
+
+    async def _tick(self):
+        # One timer for the whole hub rather than a timeout per idle reader
+        while True:
+            await asyncio.sleep(self.keepalive)
+            self._deliver(KEEPALIVE)
+
+    @asynccontextmanager
+    async def subscribe(self):
+        await self.broker.start(self._receive)
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._tick())
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    async def close(self):
+        """End every open stream, e.g. on shutdown."""
+        for subscriber in self._subscribers:
+            subscriber.close()
+        self._subscribers.clear()
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        await self.broker.close()
+
+    def stats(self):
+        return {
+            "broker": type(self.broker).__name__,
+            "subscribers": len(self._subscribers),
+            "delivered": self.delivered,
+            "dropped": self.dropped
+        }
+
+def create_event_broker(url: str):
+    """Build a broker from a URL: empty for in-process, ``redis://...`` for Redis."""
+    if not url:
+        return LocalEventBroker()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("The redis package is required for a redis:// events URL")
+        return RedisEventBroker(aioredis.from_url(url))
+    raise ValueError(f"Unsupported events URL: {url}")
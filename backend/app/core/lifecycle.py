@@ -0,0 +1,30 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Worker shutdown. When the server is asked to stop (``serve.py`` on
+# SIGTERM) the worker starts draining: it stops accepting connections,
+# readiness turns false, and the drain hooks end long-lived streams so
+# their clients reconnect to another worker instead of holding this one
+# open. In-flight requests get up to ``GRACEFUL_SHUTDOWN_SECONDS`` to finish.
+
+_state = {"draining": False}
+_drain_hooks = []
+
+def on_drain(hook):
+    """Register an async callable to run once when the worker starts draining."""
+    _drain_hooks.append(hook)
+    return hook
+
+def is_draining() -> bool:
+    return _state["draining"]
+
+async def drain():
+    if _state["draining"]:
+        return
+    _state["draining"] = True
+    for hook in _drain_hooks:
+        try:
+            await hook()
+        except Exception:
+            logger.exception("Drain hook %s failed", getattr(hook, "__qualname__", hook))
@@ -0,0 +1,225 @@
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Request metrics in the Prometheus text format. The middleware times every
+# request under its route template (``/api/courses/{course_id}``, never the
+# raw path, so label values stay bounded) and the engine hooks add each SQL
+# statement's count and duration to the request that issued it. Metrics are
+# kept per process; scrape every worker.
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Response appends the charset
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+UNMATCHED = "unmatched"
+STATEMENT_PREVIEW_LENGTH = 300
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra="") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, value, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            # One count per bucket plus +Inf, then the sum
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _number(float(bound))) + '"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-1])}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return ("\n".join(lines) + "\n").encode()
+
+registry = Registry()
+requests_total = registry.register(Counter(
+    "http_requests_total", "Requests handled, by route template and status code.", ("method", "route", "status")))
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending the last of its response.",
+    ("method", "route")))
+requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "Requests (and open event streams) currently being handled.", ("method",)))
+request_queries = registry.register(Histogram(
+    "http_request_db_queries", "SQL statements issued per request.", ("method", "route"), QUERY_BUCKETS))
+request_db_duration = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time per request spent executing SQL statements.", ("method", "route")))
+queries_total = registry.register(Counter(
+    "db_queries_total", "SQL statements executed, including those issued outside a request.", ("engine",)))
+query_errors_total = registry.register(Counter(
+    "db_query_errors_total", "SQL statements that raised an error.", ("engine",)))
+
+class RequestStats:
+    """What the engine hooks attribute to the request being handled."""
+
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self, capture: bool):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # (seconds, sql) of each statement, kept only for the slow-request log
+        self.statements = [] if capture else None
+
+current_request: ContextVar = ContextVar("current_request", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _record(conn, statement, label):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    queries_total.inc(label)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((elapsed, statement))
+
+def instrument_engine(engine, label: str):
+    """Count and time every statement ``engine`` executes.
+
+    Pass ``async_engine.sync_engine`` for an async engine: SQLAlchemy runs
+    its hooks inside the request's context, so statements are attributed to
+    the request that awaited them.
+    """
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record(conn, statement, label)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        query_errors_total.inc(label)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+def route_template(scope) -> str:
+    """The path template of the route that handled ``scope``.
+
+    The router stores the matched route in the scope, so this is only known
+    once the request has been dispatched.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED)
+
+def _log_slow_request(method, route, path, status, elapsed, stats):
+    statements = sorted(stats.statements, key=lambda s: s[0], reverse=True)[:settings.SLOW_REQUEST_MAX_STATEMENTS]
+    logger.warning(
+        "Slow request %s %s (%s) -> %s in %.1fms, %d SQL statements in %.1fms%s",
+        method, path, route, status, elapsed * 1000, stats.queries, stats.db_seconds * 1000,
+        "".join(f"\n  {seconds * 1000:8.2f}ms  {' '.join(sql.split())[:STATEMENT_PREVIEW_LENGTH]}"
+                for seconds, sql in statements)
+    )
+
+class MetricsMiddleware:
+    """Record latency, status and SQL usage for every HTTP request by route.
+
+    Requests slower than ``SLOW_REQUEST_MS`` (0 disables) are logged along
+    with their slowest SQL statements.
+    """
+
+    def __init__(self, app, slow_request_ms: int = settings.SLOW_REQUEST_MS):
+        self.app = app
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(capture=self.slow_request_seconds > 0)
+        token = current_request.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        requests_in_progress.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = route_template(scope)
+            requests_in_progress.dec(method)
+            requests_total.inc(method, route, str(status))
+            request_duration.observe(elapsed, method, route)
+            request_queries.observe(stats.queries, method, route)
+            request_db_duration.observe(stats.db_seconds, method, route)
+            if self.slow_request_seconds and elapsed >= self.slow_request_seconds:
+                _log_slow_request(method, route, scope["path"], status, elapsed, stats)
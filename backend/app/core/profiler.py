@@ -0,0 +1,228 @@
+import asyncio
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from functools import lru_cache
+from sqlalchemy import select
+from starlette.datastructures import MutableHeaders
+from .cache import TTLCache
+from .config import settings
+from .security import create_access_token, decode_token
+from ..db.database import AsyncSessionLocal
+from ..models.user import User
+
+# Sampling profiler for live workers. Nothing runs until a profile is asked
+# for: a thread then reads the sampled thread's stack with
+# ``sys._current_frames()`` every interval and counts identical stacks. The
+# output is the "collapsed" format read by flamegraph.pl, speedscope and
+# inferno: one ``root;caller;callee count`` line per distinct stack.
+
+PROFILE_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SCOPE = "profile"
+# Profile tokens name their own audience, so they never pass as access tokens
+PROFILE_AUDIENCE = "profile"
+_PROFILE_HEADER_BYTES = PROFILE_HEADER.encode()
+
+request_profiles = TTLCache(settings.PROFILER_MAX_REQUEST_PROFILES, settings.PROFILER_RESULT_TTL_SECONDS)
+
+class ProfilerBusyError(Exception):
+    """Raised when a process profile is requested while another one is running."""
+
+_path_prefixes = sorted({p.rstrip("/") + "/" for p in sys.path if p}, key=len, reverse=True)
+
+@lru_cache(maxsize=4096)
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for prefix in _path_prefixes:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix):]
+            break
+    # Semicolons separate frames in the collapsed format
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+def _stack(frame) -> tuple:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+# A thread holding the GIL only hands it over every switch interval (5ms by
+# default), which would cap the sampling rate while the event loop is busy.
+# It is shortened while any sampler runs and restored after the last one.
+_switch_lock = threading.Lock()
+_switch_state = {"samplers": 0, "saved": None}
+
+def _shorten_switch_interval(interval: float):
+    with _switch_lock:
+        if _switch_state["samplers"] == 0:
+            _switch_state["saved"] = sys.getswitchinterval()
+        _switch_state["samplers"] += 1
+        sys.setswitchinterval(min(sys.getswitchinterval(), interval))
+
+def _restore_switch_interval():
+    with _switch_lock:
+        _switch_state["samplers"] -= 1
+        if _switch_state["samplers"] == 0:
+            sys.setswitchinterval(_switch_state["saved"])
+
+class StackSampler:
+    """Sample the stacks of ``thread_ids`` (every other thread if None) on a thread of its own."""
+
+    def __init__(self, interval: float, thread_ids=None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples = Counter()
+        self.started = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        _shorten_switch_interval(self.interval)
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        _restore_switch_interval()
+        self.elapsed = time.perf_counter() - self.started
+        return self.samples
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(own_id)
+
+    def sample(self, own_id):
+        names = None if self.thread_ids is not None else {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                continue
+            stack = _stack(frame)
+            if names is not None:
+                stack = (f"thread {names.get(thread_id, thread_id)}",) + stack
+            self.samples[stack] += 1
+
+def _await_stack(coro) -> tuple:
+    """The chain of coroutines a suspended task is waiting in, outermost first."""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    labels.append("(waiting)")
+    return tuple(labels)
+
+class TaskSampler(StackSampler):
+    """Sample one asyncio task, running or not, so the profile covers its wall time.
+
+    While the task runs, the loop thread's stack is sampled from the task's
+    outermost coroutine down; while it is suspended (on the database, say),
+    the coroutines it is waiting in are, ending in ``(waiting)``. Other
+    tasks sharing the loop never appear.
+    """
+
+    def __init__(self, interval: float, task: asyncio.Task):
+        super().__init__(interval, {threading.get_ident()})
+        self.task = task
+        self.loop = task.get_loop()
+        self.root = _frame_label(task.get_coro().cr_code)
+
+    def sample(self, own_id):
+        if asyncio.current_task(self.loop) is self.task:
+            frame = sys._current_frames().get(next(iter(self.thread_ids)))
+            stack = _stack(frame) if frame is not None else ()
+            if self.root in stack:
+                stack = stack[stack.index(self.root):]
+        else:
+            stack = _await_stack(self.task.get_coro())
+        if stack:
+            self.samples[stack] += 1
+
+def collapse(samples: Counter) -> str:
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in samples.most_common())
+
+_process_profile = threading.Lock()
+
+async def profile_process(seconds: float, interval: float, all_threads: bool = False) -> StackSampler:
+    """Sample this worker for ``seconds``; by default only its event loop thread.
+
+    The caller's coroutine sleeps meanwhile, so the loop keeps serving
+    requests and those are what the profile shows.
+    """
+    if not _process_profile.acquire(blocking=False):
+        raise ProfilerBusyError()
+    try:
+        sampler = StackSampler(interval, None if all_threads else {threading.get_ident()}).start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            # Joining the sampler thread can take up to an interval
+            await asyncio.to_thread(sampler.stop)
+        return sampler
+    finally:
+        _process_profile.release()
+
+def create_profile_token(email: str) -> str:
+    """A short-lived token that has the request carrying it profiled."""
+    return create_access_token(
+        {"sub": email, "scope": PROFILE_SCOPE, "aud": PROFILE_AUDIENCE},
+        timedelta(seconds=settings.PROFILER_TOKEN_TTL_SECONDS)
+    )
+
+async def _is_admin(email: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        query = select(User.id).where(User.email == email, User.role == "admin", User.is_active.is_(True))
+        return await db.scalar(query) is not None
+
+async def _profile_requested(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == _PROFILE_HEADER_BYTES:
+            payload = decode_token(value.decode("latin-1"), audience=PROFILE_AUDIENCE)
+            if payload is None or payload.get("scope") != PROFILE_SCOPE:
+                return False
+            # A token outlives its admin being demoted or deactivated
+            return await _is_admin(payload.get("sub"))
+    return False
+
+class ProfileRequestMiddleware:
+    """Profile single requests that carry a token from ``POST /api/admin/profile/token``.
+
+    Only the request's own task is sampled (see ``TaskSampler``), so
+    concurrent requests do not show up in its profile. The response gets an ``X-Profile-Id`` header naming the stored result.
+    Requests without the header cost one header lookup; with it, one query
+    checks that the token's subject is still an active admin.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = secrets.token_hex(8)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        sampler = TaskSampler(settings.PROFILER_REQUEST_INTERVAL_MS / 1000, asyncio.current_task()).start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+            request_profiles.set(profile_id, collapse(sampler.samples))
@@ -1,10 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+class HashingBusyError(Exception):
+    """Raised when the password hashing queue is full."""
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool.
+    
+    Hashing never borrows threads from the request threadpool, so a burst of
+    logins queues here instead of starving other handlers. Work beyond
+    ``max_queue`` waiting jobs is rejected with ``HashingBusyError``.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+    
+    def _run(self, func, *args):
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+    
+    async def run(self, func, *args):
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HashingBusyError()
+            self.queued += 1
+        future = self._executor.submit(self._run, func, *args)
+        # A caller cancelled while its job waits (client gone, timeout) also
+        # cancels the job, which then never reaches _run to give back its slot
+        future.add_done_callback(self._release_cancelled)
+        return await asyncio.wrap_future(future)
+    
+    def _release_cancelled(self, future):
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "inFlight": self.in_flight,
+                "queued": self.queued,
+                "maxQueue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "bcryptRounds": settings.BCRYPT_ROUNDS
+            }
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,6 +78,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify off the event loop; also return a new hash if the stored cost is outdated."""
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(pwd_context.hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -22,9 +95,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str):
+def decode_token(token: str, audience: Optional[str] = None):
+    """The token's claims, or None. Tokens with an ``aud`` claim only decode when ``audience`` matches it."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=audience)
         return payload
     except JWTError:
         return None
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+import time
+import uvicorn
+from uvicorn._subprocess import get_subprocess
+from uvicorn.supervisors import Multiprocess
+from . import lifecycle
+from .config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# Production server: uvicorn worker processes sharing one listening socket,
+# by default one per CPU this process may use once the caches and event hub
+# are shared (see ``unshared_state``). Workers are spawned, not forked, so
+# each imports the app and opens its own database pool, caches and event
+# hub; the parent only binds the socket and watches the workers.
+
+CHECK_INTERVAL_SECONDS = 1
+MIN_WORKER_UPTIME_SECONDS = 10  # a worker dying sooner than this is a startup failure, not restarted
+
+def _cgroup_cpu_quota():
+    """The container's CPU limit in CPUs, or None when it has none."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:  # cgroup v1
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+def available_cpus() -> int:
+    """CPUs this process may run on, capped by the container's CPU quota.
+
+    ``os.cpu_count()`` reports the host's CPUs, which overcounts inside a
+    container; one worker per host CPU on a two-CPU quota only adds
+    throttling.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS, Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, int(quota)))
+    return cpus
+
+def unshared_state() -> list:
+    """Settings left empty that keep state inside each worker, where other workers cannot see it.
+
+    With several workers, an admin write would then only invalidate the
+    catalog cache of the worker that handled it, forum events would only
+    reach that worker's subscribers and a writer's next read could land on
+    a lagging replica.
+    """
+    names = ["CATALOG_CACHE_URL", "FORUM_EVENTS_URL"]
+    if settings.DATABASE_REPLICA_URL:
+        names.append("REPLICA_STICKY_URL")
+    return [name for name in names if not getattr(settings, name)]
+
+def worker_count(requested: int = 0, per_worker_state: bool = False) -> int:
+    """``requested`` workers, or one per available CPU for 0.
+
+    Unless ``per_worker_state`` is set, the automatic count drops to one
+    worker while ``unshared_state()`` names anything, and an explicit count
+    above one raises ``ValueError``.
+    """
+    missing = [] if per_worker_state else unshared_state()
+    if requested <= 0:
+        if missing:
+            logger.warning("Running 1 worker because %s %s not set; point them at Redis to run one per CPU",
+                           ", ".join(missing), "is" if len(missing) == 1 else "are")
+            return 1
+        return available_cpus()
+    if requested > 1 and missing:
+        raise ValueError(f"{requested} workers would each keep their own state; set {', '.join(missing)}")
+    return requested
+
+class DrainingServer(uvicorn.Server):
+    """A uvicorn server that starts the app draining (see ``lifecycle``) as soon as it is told to stop."""
+
+    def handle_exit(self, sig, frame):
+        super().handle_exit(sig, frame)
+        if not lifecycle.is_draining():
+            # Kept referenced until it is done
+            self._drain = asyncio.get_event_loop().create_task(lifecycle.drain())
+
+class Supervisor(Multiprocess):
+    """uvicorn's worker supervisor, replacing workers that die and stopping all of them at once.
+
+    uvicorn's own stops its workers one after another, so the last one
+    only starts draining once every other has finished.
+    """
+
+    def run(self):
+        self.startup()
+        self.started_at = {process.pid: time.monotonic() for process in self.processes}
+        self.exit_code = 0
+        while not self.should_exit.wait(CHECK_INTERVAL_SECONDS):
+            self.replace_dead_workers()
+        self.shutdown()
+        return self.exit_code
+
+    def replace_dead_workers(self):
+        for index, process in enumerate(self.processes):
+            if process.exitcode is None:
+                continue
+            uptime = time.monotonic() - self.started_at.pop(process.pid)
+            if uptime < MIN_WORKER_UPTIME_SECONDS:
+                logger.error("Worker [%d] exited with code %s %.1fs after starting; stopping",
+                             process.pid, process.exitcode, uptime)
+                self.exit_code = 1
+                self.should_exit.set()
+                return
+            logger.warning("Worker [%d] exited with code %s; starting a new one", process.pid, process.exitcode)
+            replacement = get_subprocess(config=self.config, target=self.target, sockets=self.sockets)
+            replacement.start()
+            self.processes[index] = replacement
+            self.started_at[replacement.pid] = time.monotonic()
+
+    def shutdown(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        logger.info("Stopping parent process [%d]", self.pid)
+
+def serve(app: str, host: str, port: int, workers: int, graceful_shutdown: int) -> int:
+    """Run ``app`` (an import string) until SIGTERM or SIGINT and return the exit code."""
+    config = uvicorn.Config(app, host=host, port=port, workers=workers,
+                            timeout_graceful_shutdown=graceful_shutdown)
+    server = DrainingServer(config)
+    logger.info("Serving with %d worker(s), up to %d database connections", workers,
+                workers * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW))
+    if workers == 1:
+        server.run()
+        return 0 if server.started else 1
+    return Supervisor(config, target=server.run, sockets=[config.bind_socket()]).run()
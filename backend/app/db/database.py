@@ -1,15 +1,181 @@
-from sqlalchemy import create_engine
+import asyncio
+import hashlib
+import logging
+import weakref
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from sqlalchemy.util import await_only
+from starlette.requests import HTTPConnection
+from ..core.cache import create_cache_backend
 from ..core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+logger = logging.getLogger(__name__)
+
+# Requests go through the async engine; the sync engine is kept for schema
+# management and command-line scripts such as seed_data.py.
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+def normalize_database_url(url: str) -> str:
+    # Render and Heroku hand out postgres:// URLs, which SQLAlchemy no longer accepts
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+def async_database_url(url: str) -> str:
+    """Swap the URL's driver for its asyncio counterpart (aiosqlite, asyncpg)."""
+    url = make_url(normalize_database_url(url))
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url.render_as_string(hide_password=False)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Keyword arguments for ``create_engine`` tuned for the URL's backend."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+        if url.database in (None, "", ":memory:"):
+            # A private in-memory database only exists on a single connection
+            options["poolclass"] = StaticPool
+            return options
+        if is_async:
+            # aiosqlite would otherwise open a new connection per checkout
+            options["poolclass"] = AsyncAdaptedQueuePool
+    else:
+        options = {"pool_recycle": settings.DB_POOL_RECYCLE}
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+def create_db_engine(url: str):
+    url = normalize_database_url(url)
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+# SQLite allows one writer at a time and a blocked writer polls with growing
+# sleeps, so under load some requests lose every race and hit the busy
+# timeout. On the async engine, a connection's first write statement waits
+# on a per-loop asyncio lock instead, held until the connection goes back to
+# the pool (after its commit or rollback), which queues a worker's writers
+# in order; the busy timeout still covers other processes. The hooks sit on
+# the connection, so autoflushes and every session method go through them.
+
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+_write_locks = weakref.WeakKeyDictionary()
+
+def _acquire_write_lock(conn, cursor, statement, parameters, context, executemany):
+    if "write_lock" not in conn.info and statement.lstrip().upper().startswith(WRITE_VERBS):
+        lock = _write_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        # Runs inside the async engine's greenlet, which can wait on the loop
+        await_only(lock.acquire())
+        conn.info["write_lock"] = lock
+
+def _release_write_lock(dbapi_connection, connection_record, *args):
+    lock = connection_record.info.pop("write_lock", None)
+    if lock is not None:
+        lock.release()
+
+def create_async_db_engine(url: str):
+    url = async_database_url(url)
+    engine = create_async_engine(url, **engine_options(url, is_async=True))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        if settings.SQLITE_SERIALIZE_WRITES:
+            event.listen(engine.sync_engine, "before_cursor_execute", _acquire_write_lock)
+            event.listen(engine.sync_engine, "checkin", _release_write_lock)
+            event.listen(engine.sync_engine, "invalidate", _release_write_lock)
+    return engine
+
+engine = create_db_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+# GET routes read through ``get_read_db``, which uses the replica at
+# DATABASE_REPLICA_URL when one is configured. Replication lags, so a caller
+# that has just written (any other method, through ``get_db``) reads from
+# the primary for REPLICA_STICKY_SECONDS and sees its own writes. Callers
+# are told apart by their Authorization header.
+read_engine = create_async_db_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else async_engine
+AsyncReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+recent_writers = create_cache_backend(
+    settings.REPLICA_STICKY_URL, settings.REPLICA_STICKY_MAX_CALLERS, settings.REPLICA_STICKY_SECONDS
+)
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+def pool_status(engine):
+    """Connections checked out of ``engine``'s pool against its limit, or None if it has none."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return None
+    return {"size": pool.size(), "checked_out": pool.checkedout(), "capacity": pool.size() + pool._max_overflow}
+
+def dialect_insert(db, model):
+    """Return an ``INSERT`` for the session's backend that supports ``on_conflict_*`` upserts."""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+def _caller_key(connection: HTTPConnection):
+    authorization = connection.headers.get("authorization")
+    if not authorization:
+        return None
+    return "sticky:" + hashlib.blake2b(authorization.encode(), digest_size=16).hexdigest()
+
+async def _pin_to_primary(key: str):
+    # Runs both before the handler and after it, since the response may
+    # reach the client before code after ``yield`` does
     try:
+        await recent_writers.set(key, b"1")
+    except Exception:
+        logger.exception("Could not record a write for replica routing")
+
+async def _pinned_to_primary(key: str) -> bool:
+    try:
+        return await recent_writers.get(key) is not None
+    except Exception:
+        logger.exception("Could not look up recent writes for replica routing")
+        return True
+
+async def get_db(connection: HTTPConnection):
+    key = None
+    if read_engine is not async_engine and connection.scope.get("method") not in SAFE_METHODS:
+        key = _caller_key(connection)
+    if key is not None:
+        await _pin_to_primary(key)
+    async with AsyncSessionLocal() as db:
+        yield db
+    if key is not None:
+        await _pin_to_primary(key)
+
+async def get_read_db(connection: HTTPConnection):
+    """A session for reads only: the replica, unless there is none or the caller wrote recently."""
+    if read_engine is async_engine:
+        session_factory = AsyncSessionLocal
+    else:
+        key = _caller_key(connection)
+        pinned = key is not None and await _pinned_to_primary(key)
+        session_factory = AsyncSessionLocal if pinned else AsyncReadSessionLocal
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
@@ -1,12 +1,22 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from .db.database import engine, Base
-from .api import auth, courses, users, forum, admin, resources
+from .core.compression import CompressionMiddleware
+from .core import lifecycle, metrics
+from .core.profiler import PROFILE_ID_HEADER, ProfileRequestMiddleware
+from .db.database import engine, async_engine, read_engine
+from .api import auth, courses, users, forum, admin, resources, search, sync
+from .api.pagination import NEXT_CURSOR_HEADER
+from .schemas.common import HealthStatus, Message, ReadinessStatus
+from .services.health import check_readiness
+from .services.forum import forum_events
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (``alembic upgrade head``) once per deploy;
+# importing the app has no database side effects, so workers start fast.
 
-app = FastAPI(title="AfyaHub API", version="1.0.0")
+# Every route declares a response_model, so responses are validated and dumped
+# by pydantic and encoded with orjson instead of going through jsonable_encoder.
+app = FastAPI(title="AfyaHub API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -15,7 +25,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, PROFILE_ID_HEADER],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfileRequestMiddleware)
+# Outermost, so timings include compression
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(async_engine.sync_engine, "async")
+metrics.instrument_engine(engine, "sync")
+if read_engine is not async_engine:
+    metrics.instrument_engine(read_engine.sync_engine, "replica")
 
 # Include routers
 app.include_router(auth.router, prefix="/api")
@@ -24,11 +43,36 @@ app.include_router(users.router, prefix="/api")
 app.include_router(forum.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
 app.include_router(resources.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
 
-@app.get("/")
-def root():
+# A draining worker ends its event streams right away, so clients reconnect
+# to another worker instead of keeping this one open until the grace period
+lifecycle.on_drain(forum_events.close)
+
+@app.on_event("shutdown")
+async def close_event_hub():
+    # Stops the keepalive timer and the Redis listener, and ends any stream
+    # still open after a graceful-shutdown timeout
+    await forum_events.close()
+
+@app.get("/", response_model=Message)
+async def root():
     return {"message": "AfyaHub API is running"}
 
-@app.get("/api/health")
-def health_check():
+@app.get("/api/health", response_model=HealthStatus)
+@app.get("/api/health/live", response_model=HealthStatus)
+async def health_check():
+    # Liveness: the worker's event loop answers
     return {"status": "healthy"}
+
+@app.get("/api/health/ready", response_model=ReadinessStatus, responses={503: {"model": ReadinessStatus}})
+async def readiness_check(response: Response):
+    readiness = await check_readiness()
+    if readiness["status"] != "ready":
+        response.status_code = 503
+    return readiness
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..db.database import Base
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("ix_courses_updated_at", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -13,12 +16,17 @@ class Course(Base):
     duration = Column(String)
     level = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    modules = relationship("Module", back_populates="course", cascade="all, delete-orphan")
+    modules = relationship("Module", back_populates="course", cascade="all, delete-orphan", order_by="Module.order")
     enrollments = relationship("Enrollment", back_populates="course")
 
 class Module(Base):
     __tablename__ = "modules"
+    __table_args__ = (
+        Index("ix_modules_course_id_order", "course_id", "order"),
+        Index("ix_modules_updated_at", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     course_id = Column(Integer, ForeignKey("courses.id"))
@@ -26,29 +34,49 @@ class Module(Base):
     content = Column(Text)
     video_url = Column(String)
     order = Column(Integer)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     course = relationship("Course", back_populates="modules")
     progress = relationship("Progress", back_populates="module")
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        Index("uq_enrollments_user_id_course_id", "user_id", "course_id", unique=True),
+        Index("ix_enrollments_user_id_updated_at", "user_id", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     course_id = Column(Integer, ForeignKey("courses.id"))
     enrolled_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
 
 class Progress(Base):
     __tablename__ = "progress"
+    __table_args__ = (
+        Index("uq_progress_user_id_module_id", "user_id", "module_id", unique=True),
+        Index("ix_progress_module_id", "module_id"),
+        Index("ix_progress_user_id_updated_at", "user_id", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     module_id = Column(Integer, ForeignKey("modules.id"))
     completed = Column(Integer, default=0)
     completed_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="progress")
     module = relationship("Module", back_populates="progress")
+
+class UserCourseProgress(Base):
+    __tablename__ = "user_course_progress"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), primary_key=True)
+    completed_modules = Column(Integer, default=0, nullable=False)
+    total_modules = Column(Integer, default=0, nullable=False)
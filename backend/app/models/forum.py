@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..db.database import Base
 
 class ForumTopic(Base):
     __tablename__ = "forum_topics"
+    __table_args__ = (
+        Index("ix_forum_topics_created_at_id", "created_at", "id"),
+        Index("ix_forum_topics_updated_at", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -12,6 +16,7 @@ class ForumTopic(Base):
     content = Column(Text)
     category = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User")
     comments = relationship("ForumComment", back_populates="topic")
@@ -20,7 +25,7 @@ class ForumComment(Base):
     __tablename__ = "forum_comments"
     
     id = Column(Integer, primary_key=True, index=True)
-    topic_id = Column(Integer, ForeignKey("forum_topics.id"))
+    topic_id = Column(Integer, ForeignKey("forum_topics.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
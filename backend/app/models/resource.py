@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, Float
+from sqlalchemy import Column, Integer, String, Text, Float, Index
 from datetime import datetime
 from ..db.database import Base
 
 class Resource(Base):
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_type_id", "type", "id"),
+        Index("ix_resources_latitude_longitude", "latitude", "longitude"),
+        Index("ix_resources_type_latitude_longitude", "type", "latitude", "longitude"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
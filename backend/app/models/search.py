@@ -0,0 +1,30 @@
+from sqlalchemy import DDL, event
+from ..db.database import Base
+
+# Full-text index over forum topics and comments, courses and modules. It is
+# not an ORM model because it is an FTS5 virtual table on SQLite and a table
+# with a generated ``tsvector`` column on Postgres; the DDL below runs as part
+# of ``Base.metadata.create_all``. Rows are written by ``services.search`` and
+# keyed by a document id (the FTS5 rowid on SQLite) so updates and deletes are
+# point lookups.
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind UNINDEXED, ref_id UNINDEXED, parent_id UNINDEXED, title, body, "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+)
+
+POSTGRES_DDL = (
+    "CREATE TABLE IF NOT EXISTS search_index ("
+    "doc_id BIGINT PRIMARY KEY, kind VARCHAR NOT NULL, ref_id INTEGER NOT NULL, parent_id INTEGER, "
+    "title TEXT NOT NULL DEFAULT '', body TEXT NOT NULL DEFAULT '', "
+    "document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', body), 'B')) STORED)",
+    "CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING GIN (document)",
+)
+
+for statement in SQLITE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from ..db.database import Base
+
+# Rollups for the admin dashboard, updated on every enrollment and progress
+# write so reading them never scans enrollments or progress.
+#
+# ``daily_stats`` counts events recorded on each day and is never
+# decremented: a course completion that is later undone, or that a new
+# module reopens, stays in the day it happened. ``course_stats.completions``
+# is the number of learners who have finished the course now.
+
+class DailyStats(Base):
+    __tablename__ = "daily_stats"
+    
+    day = Column(Date, primary_key=True)
+    enrollments = Column(Integer, default=0, nullable=False)
+    module_completions = Column(Integer, default=0, nullable=False)
+    course_completions = Column(Integer, default=0, nullable=False)
+    active_learners = Column(Integer, default=0, nullable=False)
+
+class CourseStats(Base):
+    __tablename__ = "course_stats"
+    
+    course_id = Column(Integer, ForeignKey("courses.id"), primary_key=True)
+    enrollments = Column(Integer, default=0, nullable=False)
+    completions = Column(Integer, default=0, nullable=False)
+
+class LearnerActivity(Base):
+    __tablename__ = "learner_activity"
+    
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
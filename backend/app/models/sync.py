@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from ..db.database import Base
+
+# Deleted rows leave a tombstone so offline clients can drop them on their
+# next delta sync. Tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS are
+# pruned; clients that have been away longer get a full snapshot instead.
+
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    ref_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,61 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+from .common import CamelModel
+
+class DashboardTotals(CamelModel):
+    total_users: int
+    total_courses: int
+    total_enrollments: int
+    total_modules: int
+
+class DailyActivity(CamelModel):
+    day: date
+    enrollments: int
+    module_completions: int
+    course_completions: int
+    active_learners: int
+
+class CourseActivity(BaseModel):
+    id: int
+    title: str
+    enrollments: int
+    completions: int
+
+class DashboardActivity(BaseModel):
+    daily: List[DailyActivity]
+    courses: List[CourseActivity]
+
+class CacheStats(CamelModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+class CatalogCacheStats(CamelModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    version: int
+
+class PasswordHashingStats(CamelModel):
+    workers: int
+    in_flight: int
+    queued: int
+    max_queue: int
+    completed: int
+    rejected: int
+    bcrypt_rounds: int
+
+class ForumEventStats(CamelModel):
+    broker: str
+    subscribers: int
+    delivered: int
+    dropped: int
+
+class ProfileToken(CamelModel):
+    token: str
+    header: str
+    expires_in: int
@@ -0,0 +1,32 @@
+from typing import Optional
+from pydantic import BaseModel
+from pydantic.alias_generators import to_camel
+
+class CamelModel(BaseModel):
+    """Schema whose fields are snake_case in Python and camelCase in JSON."""
+    
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+        from_attributes = True
+
+class Message(BaseModel):
+    message: str
+
+class ErrorMessage(BaseModel):
+    error: str
+
+class HealthStatus(BaseModel):
+    status: str
+
+class PoolStatus(CamelModel):
+    size: int
+    checked_out: int
+    capacity: int
+
+class ReadinessStatus(CamelModel):
+    status: str
+    draining: bool
+    database: Optional[bool] = None
+    pool: Optional[PoolStatus] = None
+    replica_pool: Optional[PoolStatus] = None
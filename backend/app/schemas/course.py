@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import List, Optional
+from .common import CamelModel
 
 class ModuleBase(BaseModel):
     title: str
@@ -36,6 +37,19 @@ class CourseResponse(CourseBase):
     class Config:
         from_attributes = True
 
+class CourseSummary(CourseBase):
+    id: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class CatalogCourse(CourseResponse):
+    enrolled: bool
+
+class CourseDetail(CatalogCourse):
+    progress: int
+
 class EnrollmentResponse(BaseModel):
     id: int
     user_id: int
@@ -57,3 +71,38 @@ class ProgressResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class ProgressBatchItem(ProgressUpdate):
+    module_id: int
+
+class CourseProgressTotals(BaseModel):
+    course_id: int
+    completed_modules: int
+    total_modules: int
+    progress: int
+
+class ProgressBatchResponse(BaseModel):
+    progress: List[ProgressResponse]
+    courses: List[CourseProgressTotals]
+
+class ProgressSummary(CamelModel):
+    enrolled_courses: int
+    completed_modules: int
+    certificates_earned: int = 0
+
+class EnrolledCourse(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    thumbnail: Optional[str] = None
+    progress: int
+    enrolled: bool = True
+
+class ProgressStats(CamelModel):
+    courses_enrolled: int
+    modules_completed: int
+    certificates_earned: int = 0
+
+class ProgressOverview(ProgressSummary):
+    enrolled_courses_data: List[EnrolledCourse]
+    stats: ProgressStats
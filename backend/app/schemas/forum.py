@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
+from .common import CamelModel
 
 class TopicCreate(BaseModel):
     title: str
@@ -17,3 +18,28 @@ class TopicResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class TopicSummary(CamelModel):
+    id: int
+    title: str
+    excerpt: str
+    category: Optional[str] = None
+    author: str
+    created_at: datetime
+    comments_count: int
+    votes_count: int = 0
+
+class TopicDetail(CamelModel):
+    id: int
+    title: str
+    content: Optional[str] = None
+    category: Optional[str] = None
+    author: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class CommentResponse(CamelModel):
+    id: int
+    topic_id: int
+    content: str
+    author: str
+    created_at: datetime
@@ -0,0 +1,19 @@
+from typing import Optional
+from .common import CamelModel
+
+class ResourceResponse(CamelModel):
+    id: int
+    name: str
+    type: str
+    description: Optional[str] = None
+    address: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    website: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    hours: Optional[str] = None
+    services: Optional[str] = None
+
+class NearbyResource(ResourceResponse):
+    distance_km: float
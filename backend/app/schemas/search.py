@@ -0,0 +1,10 @@
+from typing import Optional
+from .common import CamelModel
+
+class SearchResult(CamelModel):
+    type: str
+    id: int
+    parent_id: Optional[int] = None
+    title: str
+    snippet: str
+    score: float
@@ -0,0 +1,42 @@
+from pydantic import Field
+from datetime import datetime
+from typing import List, Optional
+from ..core.config import settings
+from .common import CamelModel
+from .course import CourseSummary, EnrollmentResponse, ModuleResponse, ProgressResponse
+from .forum import TopicSummary
+
+class SyncDeletions(CamelModel):
+    courses: List[int] = []
+    modules: List[int] = []
+    topics: List[int] = []
+
+class SyncChanges(CamelModel):
+    """Everything that changed for the learner since their last sync token.
+
+    Items use the same shapes as the list endpoints, so the client can upsert
+    them into the caches it already keeps. When ``reset`` is true the response
+    is a full snapshot and the client should replace its caches instead.
+    """
+    token: str
+    reset: bool
+    courses: List[CourseSummary]
+    modules: List[ModuleResponse]
+    topics: List[TopicSummary]
+    topics_truncated: bool
+    progress: List[ProgressResponse]
+    enrollments: List[EnrollmentResponse]
+    deleted: SyncDeletions
+
+class QueuedProgress(CamelModel):
+    module_id: int
+    completed: bool
+    updated_at: Optional[datetime] = None
+
+class SyncPush(CamelModel):
+    progress: List[QueuedProgress] = Field(default=[], max_length=settings.SYNC_MAX_PUSH_SIZE)
+
+class SyncPushResult(CamelModel):
+    applied: int
+    stale: List[int]
+    rejected: List[int]
@@ -24,6 +24,10 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class UserAdminUpdate(BaseModel):
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str
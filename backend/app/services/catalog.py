@@ -0,0 +1,123 @@
+import base64
+import orjson
+from typing import List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+from ..core.cache import create_cache_backend
+from ..core.compression import deflate_part
+from ..core.config import settings
+from ..models.course import Course, Enrollment
+from ..schemas.course import CourseResponse, ModuleResponse
+
+# Course and module content only changes through admin writes, each of which
+# bumps the catalog version. Cached entries are keyed by version, so a bump
+# makes every older entry unreachable and it simply ages out of the backend.
+
+class CatalogCache:
+    VERSION_KEY = "catalog:version"
+    
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+    
+    async def version(self) -> int:
+        value = await self.backend.get(self.VERSION_KEY)
+        return int(value) if value is not None else 0
+    
+    async def bump(self) -> int:
+        return await self.backend.incr(self.VERSION_KEY)
+    
+    async def get_or_build(self, name: str, build):
+        """Return the cached JSON value for ``name``, calling ``build()`` on a miss.
+        
+        ``build`` may return None for "does not exist", which is not cached.
+        """
+        key = f"catalog:{await self.version()}:{name}"
+        raw = await self.backend.get(key)
+        if raw is not None:
+            self.hits += 1
+            return orjson.loads(raw)
+        self.misses += 1
+        value = await build()
+        if value is not None:
+            await self.backend.set(key, orjson.dumps(value))
+        return value
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hits / lookups if lookups else 0.0
+        }
+
+catalog_cache = CatalogCache(create_cache_backend(
+    settings.CATALOG_CACHE_URL,
+    settings.CATALOG_CACHE_MAX_ENTRIES,
+    settings.CATALOG_CACHE_TTL_SECONDS
+))
+
+module_list = TypeAdapter(List[ModuleResponse])
+
+def course_fragment(course: Course) -> str:
+    """Serialize a course and its modules as an unterminated JSON object.
+    
+    The result ends in a comma so per-user fields can be appended before the
+    closing brace without re-serializing the shared part.
+    """
+    return CourseResponse.model_validate(course).model_dump_json()[:-1] + ","
+
+def _deflate_fragments(fragments):
+    return [base64.b64encode(deflate_part(f.encode())).decode() for f in fragments]
+
+def deflated_parts(encoded):
+    """Decode the ``deflated`` entries stored next to cached fragments."""
+    return [base64.b64decode(e) for e in encoded]
+
+async def build_catalog_page(db: AsyncSession, after_id: Optional[int], limit: int):
+    """Load one page of courses with their ordered modules as cacheable fragments.
+
+    Each fragment is also stored deflated so responses can be gzipped
+    without recompressing the shared course content.
+
+    Runs a fixed number of queries regardless of how many courses exist:
+    one for courses and one ``IN`` query for all their modules.
+    """
+    query = select(Course).options(selectinload(Course.modules)).order_by(Course.id).limit(limit + 1)
+    if after_id is not None:
+        query = query.where(Course.id > after_id)
+    courses = (await db.scalars(query)).all()
+    next_id = courses[limit - 1].id if len(courses) > limit else None
+    courses = courses[:limit]
+    fragments = [course_fragment(c) for c in courses]
+    return {
+        "ids": [c.id for c in courses],
+        "fragments": fragments,
+        "deflated": await run_in_threadpool(_deflate_fragments, fragments),
+        "next": next_id
+    }
+
+async def build_course(db: AsyncSession, course_id: int):
+    course = await db.scalar(
+        select(Course).options(selectinload(Course.modules)).where(Course.id == course_id)
+    )
+    if course is None:
+        return None
+    fragment = course_fragment(course)
+    return {"fragment": fragment, "deflated": (await run_in_threadpool(_deflate_fragments, [fragment]))[0]}
+
+async def build_module_list(db: AsyncSession, course_id: int):
+    course = await db.scalar(
+        select(Course).options(selectinload(Course.modules)).where(Course.id == course_id)
+    )
+    modules = module_list.validate_python(course.modules if course else [], from_attributes=True)
+    return {"body": module_list.dump_json(modules).decode()}
+
+async def get_enrolled_course_ids(db: AsyncSession, user_id: int):
+    result = await db.scalars(select(Enrollment.course_id).where(Enrollment.user_id == user_id))
+    return set(result.all())
@@ -0,0 +1,49 @@
+from sqlalchemy import func, select
+from ..core.config import settings
+from ..core.events import EventHub, create_event_broker
+from ..models.forum import ForumTopic, ForumComment
+from ..models.user import User
+from ..schemas.forum import TopicSummary
+
+EXCERPT_LENGTH = 150
+
+forum_events = EventHub(
+    create_event_broker(settings.FORUM_EVENTS_URL),
+    settings.FORUM_EVENTS_QUEUE_SIZE,
+    settings.FORUM_EVENTS_KEEPALIVE_SECONDS
+)
+
+def topic_summary_query():
+    """Select the columns of ``TopicSummary`` for topics, without loading their bodies."""
+    comments_count = (
+        select(func.count(ForumComment.id))
+        .where(ForumComment.topic_id == ForumTopic.id)
+        .correlate(ForumTopic)
+        .scalar_subquery()
+    )
+    # Author, comment count and excerpt are all computed in SQL, so full topic
+    # bodies are never loaded for list views.
+    return (
+        select(
+            ForumTopic.id,
+            ForumTopic.title,
+            func.substr(ForumTopic.content, 1, EXCERPT_LENGTH).label("excerpt"),
+            (func.length(ForumTopic.content) > EXCERPT_LENGTH).label("truncated"),
+            ForumTopic.category,
+            ForumTopic.created_at,
+            User.name.label("author"),
+            comments_count.label("comments_count")
+        )
+        .outerjoin(User, User.id == ForumTopic.user_id)
+    )
+
+def topic_summary(row) -> TopicSummary:
+    return TopicSummary(
+        id=row.id,
+        title=row.title,
+        excerpt=(row.excerpt or "") + ("..." if row.truncated else ""),
+        category=row.category,
+        author=row.author or "Anonymous",
+        created_at=row.created_at,
+        comments_count=row.comments_count
+    )
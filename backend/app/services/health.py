@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from sqlalchemy import text
+from ..core.config import settings
+from ..core.lifecycle import is_draining
+from ..db.database import async_engine, pool_status, read_engine
+
+logger = logging.getLogger(__name__)
+
+# Readiness is per worker: the load balancer should stop sending this worker
+# requests while it drains, cannot reach the database, or has every pool
+# connection in use (a new request would queue for DB_POOL_TIMEOUT seconds).
+# Liveness deliberately checks none of this, so a database outage takes
+# workers out of rotation instead of getting them all restarted. A read
+# replica is checked like the primary, since every GET route depends on it.
+
+def _saturated(pool) -> bool:
+    return pool is not None and pool["checked_out"] >= pool["capacity"] * settings.READINESS_POOL_THRESHOLD
+
+async def _ping(engines):
+    for engine in engines:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+async def check_readiness() -> dict:
+    engines = [async_engine] if read_engine is async_engine else [async_engine, read_engine]
+    pool = pool_status(async_engine)
+    replica_pool = pool_status(read_engine) if len(engines) > 1 else None
+    readiness = {
+        "status": "ready", "draining": is_draining(), "database": None, "pool": pool, "replica_pool": replica_pool
+    }
+    if readiness["draining"]:
+        readiness["status"] = "draining"
+    elif _saturated(pool) or _saturated(replica_pool):
+        # Checking out another connection would itself wait for the pool
+        readiness["status"] = "saturated"
+    else:
+        try:
+            await asyncio.wait_for(_ping(engines), settings.READINESS_DB_TIMEOUT_SECONDS)
+            readiness["database"] = True
+        except Exception as exc:
+            logger.warning("Readiness check could not reach the database: %r", exc)
+            readiness["database"] = False
+            readiness["status"] = "unavailable"
+    return readiness
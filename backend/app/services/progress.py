@@ -0,0 +1,238 @@
+from sqlalchemy import and_, delete, distinct, func, insert, or_, select, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.database import dialect_insert
+from ..models.course import Course, Module, Enrollment, Progress, UserCourseProgress
+from .stats import record_progress
+
+# Per-user course counters live in ``user_course_progress`` and are kept up to
+# date on every write, so dashboard reads never have to aggregate ``progress``.
+
+def progress_percentage(completed: int, total: int) -> int:
+    if total == 0:
+        return 0
+    return int((completed / total) * 100)
+
+def _counts_query():
+    """Select ``(user_id, course_id, completed, total)`` computed from raw rows."""
+    pairs = union(
+        select(Enrollment.user_id, Enrollment.course_id),
+        select(Progress.user_id, Module.course_id).join(Module, Module.id == Progress.module_id)
+    ).subquery()
+    totals = (
+        select(Module.course_id, func.count(Module.id).label("total"))
+        .group_by(Module.course_id)
+        .subquery()
+    )
+    completed = (
+        select(
+            Progress.user_id,
+            Module.course_id,
+            func.count(distinct(Progress.module_id)).label("completed")
+        )
+        .join(Module, Module.id == Progress.module_id)
+        .where(Progress.completed == 1)
+        .group_by(Progress.user_id, Module.course_id)
+        .subquery()
+    )
+    return (
+        select(
+            pairs.c.user_id,
+            pairs.c.course_id,
+            func.coalesce(completed.c.completed, 0),
+            func.coalesce(totals.c.total, 0)
+        )
+        .outerjoin(totals, totals.c.course_id == pairs.c.course_id)
+        .outerjoin(completed, and_(
+            completed.c.user_id == pairs.c.user_id,
+            completed.c.course_id == pairs.c.course_id
+        ))
+        .where(pairs.c.user_id.isnot(None), pairs.c.course_id.isnot(None))
+    )
+
+def _count_subqueries(user_id: int, course_id: int):
+    """Scalar subqueries for the user's completed and the course's total module counts."""
+    completed = (
+        select(func.count(distinct(Progress.module_id)))
+        .join(Module, Module.id == Progress.module_id)
+        .where(
+            Progress.user_id == user_id,
+            Progress.completed == 1,
+            Module.course_id == course_id
+        )
+        .scalar_subquery()
+    )
+    total = select(func.count(Module.id)).where(Module.course_id == course_id).scalar_subquery()
+    return completed, total
+
+async def ensure_course_progress(db: AsyncSession, user_id: int, course_id: int):
+    """Create the user's counter row for a course from raw rows unless it already exists."""
+    completed, total = _count_subqueries(user_id, course_id)
+    await db.execute(
+        dialect_insert(db, UserCourseProgress)
+        .values(user_id=user_id, course_id=course_id, completed_modules=completed, total_modules=total)
+        .on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+    )
+
+async def refresh_course_progress(db: AsyncSession, user_id: int, course_id: int):
+    """Recount the user's completed modules for one course after a progress write.
+
+    The count is taken inside the same statement as the update, so it stays
+    correct when several progress writes for the same course race. Returns
+    ``(previous, completed, total)`` so callers can detect transitions.
+    """
+    key = (UserCourseProgress.user_id == user_id, UserCourseProgress.course_id == course_id)
+    previous = await db.scalar(
+        select(UserCourseProgress.completed_modules).where(*key).with_for_update()
+    )
+    completed, _ = _count_subqueries(user_id, course_id)
+    row = (await db.execute(
+        update(UserCourseProgress)
+        .where(*key)
+        .values(completed_modules=completed)
+        .returning(UserCourseProgress.completed_modules, UserCourseProgress.total_modules)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if row is None:
+        await ensure_course_progress(db, user_id, course_id)
+        row = (await db.execute(
+            select(UserCourseProgress.completed_modules, UserCourseProgress.total_modules).where(*key)
+        )).one()
+    return previous or 0, row[0], row[1]
+
+async def get_module_course_ids(db: AsyncSession, module_ids) -> dict:
+    """Map each of ``module_ids`` that exists to its course id, in one query."""
+    result = await db.execute(
+        select(Module.id, Module.course_id).where(Module.id.in_(module_ids), Module.course_id.isnot(None))
+    )
+    return dict(result.all())
+
+async def write_progress(db: AsyncSession, user_id: int, entries: dict, course_ids: dict):
+    """Upsert ``{module_id: (completed, written_at)}`` in one statement and refresh counters.
+
+    ``course_ids`` maps each module to its course (see ``get_module_course_ids``).
+    A row already written after ``written_at`` is left alone, so the latest
+    write wins. Returns the progress rows that were written and
+    ``{course_id: (completed, total)}`` for their courses.
+    """
+    stmt = dialect_insert(db, Progress).values([
+        {
+            "user_id": user_id,
+            "module_id": module_id,
+            "completed": 1 if completed else 0,
+            "completed_at": written_at if completed else None,
+            "updated_at": written_at
+        }
+        for module_id, (completed, written_at) in sorted(entries.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "module_id"],
+        set_={
+            "completed": stmt.excluded.completed,
+            "completed_at": stmt.excluded.completed_at,
+            "updated_at": stmt.excluded.updated_at
+        },
+        where=or_(Progress.updated_at.is_(None), Progress.updated_at <= stmt.excluded.updated_at)
+    ).returning(Progress)
+    written = (await db.scalars(stmt, execution_options={"populate_existing": True})).all()
+    
+    # Courses are refreshed in a fixed order so concurrent batches lock the
+    # counter rows in the same order.
+    totals = {}
+    for course_id in sorted({course_ids[p.module_id] for p in written}):
+        previous, completed, total = await refresh_course_progress(db, user_id, course_id)
+        await record_progress(db, user_id, course_id, previous, completed, total)
+        totals[course_id] = (completed, total)
+    return written, totals
+
+async def shift_module_counters(db: AsyncSession, module_id: int, course_id: int, delta: int):
+    """Add or remove one module from every counter of a course.
+
+    Call with ``delta=1`` after a module is added to ``course_id`` and with
+    ``delta=-1`` before it is removed from it, so learners who completed the
+    module are adjusted as well.
+    """
+    await db.execute(
+        update(UserCourseProgress)
+        .where(UserCourseProgress.course_id == course_id)
+        .values(total_modules=UserCourseProgress.total_modules + delta)
+        .execution_options(synchronize_session=False)
+    )
+    completed_by = select(Progress.user_id).where(
+        Progress.module_id == module_id,
+        Progress.completed == 1
+    )
+    await db.execute(
+        update(UserCourseProgress)
+        .where(UserCourseProgress.course_id == course_id, UserCourseProgress.user_id.in_(completed_by))
+        .values(completed_modules=UserCourseProgress.completed_modules + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+async def rebuild_course_progress(db: AsyncSession) -> int:
+    """Recompute the whole ``user_course_progress`` table from raw rows."""
+    await db.execute(delete(UserCourseProgress))
+    await db.execute(
+        insert(UserCourseProgress).from_select(
+            ["user_id", "course_id", "completed_modules", "total_modules"],
+            _counts_query()
+        )
+    )
+    return await db.scalar(select(func.count()).select_from(UserCourseProgress))
+
+async def find_progress_drift(db: AsyncSession):
+    """Return ``(user_id, course_id, stored, expected)`` for counters that disagree with raw rows."""
+    expected = {
+        (user_id, course_id): (completed, total)
+        for user_id, course_id, completed, total in await db.execute(_counts_query())
+    }
+    stored = {
+        (c.user_id, c.course_id): (c.completed_modules, c.total_modules)
+        for c in await db.scalars(select(UserCourseProgress))
+    }
+    drift = []
+    for user_id, course_id in sorted(expected.keys() | stored.keys()):
+        key = (user_id, course_id)
+        if stored.get(key) != expected.get(key):
+            drift.append((user_id, course_id, stored.get(key), expected.get(key)))
+    return drift
+
+async def get_enrolled_course_progress(db: AsyncSession, user_id: int):
+    """Return ``(course, completed, total)`` for every course the user is enrolled in."""
+    result = await db.execute(
+        select(
+            Course,
+            func.coalesce(UserCourseProgress.completed_modules, 0),
+            func.coalesce(UserCourseProgress.total_modules, 0)
+        )
+        .join(Enrollment, Enrollment.course_id == Course.id)
+        .outerjoin(UserCourseProgress, and_(
+            UserCourseProgress.course_id == Course.id,
+            UserCourseProgress.user_id == user_id
+        ))
+        .where(Enrollment.user_id == user_id)
+        .distinct()
+        .order_by(Course.id)
+    )
+    return result.all()
+
+async def get_course_progress(db: AsyncSession, user_id: int, course_id: int):
+    """Return ``(completed, total)`` module counts for one course."""
+    counter = await db.get(UserCourseProgress, (user_id, course_id))
+    if counter is None:
+        return 0, 0
+    return counter.completed_modules, counter.total_modules
+
+async def get_progress_summary(db: AsyncSession, user_id: int):
+    """Return ``(enrolled_courses, completed_modules)`` for the user in one round trip."""
+    enrolled = (
+        select(func.count(Enrollment.id))
+        .where(Enrollment.user_id == user_id)
+        .scalar_subquery()
+    )
+    completed = (
+        select(func.count(Progress.id))
+        .where(Progress.user_id == user_id, Progress.completed == 1)
+        .scalar_subquery()
+    )
+    result = await db.execute(select(enrolled, completed))
+    return result.one()
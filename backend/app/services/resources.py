@@ -0,0 +1,65 @@
+import math
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.resource import Resource
+
+# Nearest-resource lookup: a bounding box on the indexed (latitude, longitude)
+# columns narrows the candidates, then exact haversine distances rank them.
+# The box starts small and grows fourfold, up to the requested radius, until
+# enough resources fall inside the circle it encloses, so dense areas stay cheap.
+
+EARTH_RADIUS_KM = 6371.0088
+INITIAL_RADIUS_KM = 1.0
+MAX_RADIUS_KM = math.pi * EARTH_RADIUS_KM
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(lat: float, lng: float, radius_km: float):
+    """Return a filter matching every point within ``radius_km`` of ``(lat, lng)``."""
+    d_lat = radius_km / KM_PER_DEGREE
+    conditions = [Resource.latitude.between(max(-90.0, lat - d_lat), min(90.0, lat + d_lat))]
+    # Longitude degrees shrink towards the poles; near them, or for huge radii,
+    # the box spans every longitude.
+    if lat + d_lat < 90 and lat - d_lat > -90:
+        d_lng = math.degrees(math.asin(min(1.0, math.sin(math.radians(d_lat)) / math.cos(math.radians(lat)))))
+        west, east = lng - d_lng, lng + d_lng
+        if west < -180:
+            conditions.append(or_(Resource.longitude >= west + 360, Resource.longitude <= east))
+        elif east > 180:
+            conditions.append(or_(Resource.longitude >= west, Resource.longitude <= east - 360))
+        else:
+            conditions.append(Resource.longitude.between(west, east))
+    return and_(*conditions)
+
+async def _within(db: AsyncSession, lat: float, lng: float, radius_km: float, type: str = None):
+    """Return ``(distance_km, id)`` for every resource within the radius, nearest first."""
+    # Only the coordinates are read here, straight from the covering
+    # coordinate indexes; full rows are loaded for the winners alone.
+    query = select(Resource.id, Resource.latitude, Resource.longitude).where(bounding_box(lat, lng, radius_km))
+    if type:
+        query = query.where(Resource.type == type)
+    ranked = []
+    for resource_id, resource_lat, resource_lng in await db.execute(query):
+        distance = haversine_km(lat, lng, resource_lat, resource_lng)
+        if distance <= radius_km:
+            ranked.append((distance, resource_id))
+    ranked.sort()
+    return ranked
+
+async def find_nearest(db: AsyncSession, lat: float, lng: float, limit: int, radius_km: float = None, type: str = None):
+    """Return up to ``limit`` ``(resource, distance_km)`` pairs, nearest first."""
+    max_radius = min(radius_km or MAX_RADIUS_KM, MAX_RADIUS_KM)
+    radius = min(INITIAL_RADIUS_KM, max_radius)
+    while True:
+        nearest = (await _within(db, lat, lng, radius, type))[:limit]
+        if len(nearest) >= limit or radius >= max_radius:
+            break
+        radius = min(radius * 4, max_radius)
+    resources = {r.id: r for r in await db.scalars(select(Resource).where(Resource.id.in_([i for _, i in nearest])))}
+    return [(resources[resource_id], distance) for distance, resource_id in nearest]
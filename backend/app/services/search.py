@@ -0,0 +1,187 @@
+import html
+import re
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.course import Course, Module
+from ..models.forum import ForumTopic, ForumComment
+from ..models import search  # noqa: F401 - registers the search_index DDL
+
+# Every searchable row is one document in ``search_index``. Its document id
+# packs the source kind into the low bits of the source primary key, so a
+# document can be replaced or removed without scanning the index.
+
+KINDS = {"topic": 1, "comment": 2, "course": 3, "module": 4}
+MAX_TERMS = 8
+MIN_PREFIX_LENGTH = 3
+SNIPPET_TOKENS = 24
+REBUILD_BATCH_SIZE = 1000
+
+# Highlight markers that cannot occur in stored text, swapped for <mark> tags
+# after the snippet has been HTML-escaped.
+OPEN, CLOSE = "\x02", "\x03"
+
+_TAG = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]*>", re.IGNORECASE | re.DOTALL)
+_SPACE = re.compile(r"\s+")
+_TERM = re.compile(r"\w+")
+
+SQLITE = {
+    "delete": "DELETE FROM search_index WHERE rowid IN :doc_ids",
+    "insert": (
+        "INSERT INTO search_index (rowid, kind, ref_id, parent_id, title, body) "
+        "VALUES (:doc_id, :kind, :ref_id, :parent_id, :title, :body)"
+    ),
+    "clear": "DELETE FROM search_index",
+    "search": (
+        "SELECT kind, ref_id, parent_id, "
+        "highlight(search_index, 3, :open, :close) AS title, "
+        "snippet(search_index, 4, :open, :close, '…', :tokens) AS snippet, "
+        "-bm25(search_index, 0.0, 0.0, 0.0, 10.0, 1.0) AS score "
+        "FROM search_index WHERE search_index MATCH :query {kind_filter}"
+        "ORDER BY score DESC LIMIT :limit"
+    ),
+}
+
+POSTGRES = {
+    "delete": "DELETE FROM search_index WHERE doc_id IN :doc_ids",
+    "insert": (
+        "INSERT INTO search_index (doc_id, kind, ref_id, parent_id, title, body) "
+        "VALUES (:doc_id, :kind, :ref_id, :parent_id, :title, :body) "
+        "ON CONFLICT (doc_id) DO UPDATE SET parent_id = excluded.parent_id, "
+        "title = excluded.title, body = excluded.body"
+    ),
+    "clear": "DELETE FROM search_index",
+    # Rank and limit first so headlines are only generated for the returned rows.
+    "search": (
+        "SELECT kind, ref_id, parent_id, "
+        "ts_headline('english', title, q, :title_options) AS title, "
+        "ts_headline('english', body, q, :body_options) AS snippet, score "
+        "FROM (SELECT search_index.*, q, ts_rank_cd(document, q) AS score "
+        "FROM search_index, to_tsquery('english', :query) q "
+        "WHERE document @@ q {kind_filter}"
+        "ORDER BY score DESC LIMIT :limit) ranked "
+        "ORDER BY score DESC"
+    ),
+}
+
+def _sql(db: AsyncSession):
+    return SQLITE if db.bind.dialect.name == "sqlite" else POSTGRES
+
+def strip_html(value: str) -> str:
+    """Reduce stored rich text to plain words for indexing."""
+    if not value:
+        return ""
+    return _SPACE.sub(" ", html.unescape(_TAG.sub(" ", value))).strip()
+
+def doc_id(kind: str, ref_id: int) -> int:
+    return ref_id * 8 + KINDS[kind]
+
+def _document(kind: str, ref_id: int, title, body, parent_id=None):
+    return {
+        "doc_id": doc_id(kind, ref_id),
+        "kind": kind,
+        "ref_id": ref_id,
+        "parent_id": parent_id,
+        "title": title or "",
+        "body": strip_html(body)
+    }
+
+def topic_document(topic: ForumTopic):
+    return _document("topic", topic.id, topic.title, topic.content)
+
+def comment_document(comment: ForumComment):
+    return _document("comment", comment.id, "", comment.content, comment.topic_id)
+
+def course_document(course: Course):
+    return _document("course", course.id, course.title, course.description)
+
+def module_document(module: Module):
+    return _document("module", module.id, module.title, module.content, module.course_id)
+
+async def index_documents(db: AsyncSession, documents):
+    """Add or replace documents in the same transaction as the source write."""
+    if not documents:
+        return
+    sql = _sql(db)
+    if sql is SQLITE:
+        # FTS5 tables have no upsert, so replace by deleting first.
+        await remove_documents(db, [d["doc_id"] for d in documents])
+    await db.execute(text(sql["insert"]), documents)
+
+async def remove_documents(db: AsyncSession, doc_ids):
+    if not doc_ids:
+        return
+    await db.execute(
+        text(_sql(db)["delete"]).bindparams(bindparam("doc_ids", expanding=True)),
+        {"doc_ids": list(doc_ids)}
+    )
+
+async def remove_topic(db: AsyncSession, topic_id: int):
+    """Remove a topic and its comments from the index."""
+    comment_ids = await db.scalars(select(ForumComment.id).where(ForumComment.topic_id == topic_id))
+    await remove_documents(db, [doc_id("topic", topic_id)] + [doc_id("comment", c) for c in comment_ids])
+
+async def remove_course(db: AsyncSession, course_id: int):
+    """Remove a course and its modules from the index."""
+    module_ids = await db.scalars(select(Module.id).where(Module.course_id == course_id))
+    await remove_documents(db, [doc_id("course", course_id)] + [doc_id("module", m) for m in module_ids])
+
+def _match_query(db: AsyncSession, q: str):
+    """Turn free text into a safe prefix-matching query, or None if it has no terms."""
+    terms = _TERM.findall(q.lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    # Only the last term is matched as a prefix (search-as-you-type), and only
+    # once it is long enough not to expand into a large part of the vocabulary.
+    prefix = len(terms[-1]) >= MIN_PREFIX_LENGTH
+    if _sql(db) is SQLITE:
+        return " ".join(f'"{t}"' for t in terms) + ("*" if prefix else "")
+    return " & ".join(terms) + (":*" if prefix else "")
+
+def _render(fragment: str) -> str:
+    return html.escape(fragment or "").replace(OPEN, "<mark>").replace(CLOSE, "</mark>")
+
+async def search_documents(db: AsyncSession, q: str, limit: int, kind: str = None):
+    """Return ranked matches with ``<mark>``-highlighted title and snippet."""
+    query = _match_query(db, q)
+    if query is None:
+        return []
+    sql = _sql(db)
+    statement = sql["search"].format(kind_filter="AND kind = :kind " if kind else "")
+    params = {"query": query, "limit": limit, "kind": kind}
+    if sql is SQLITE:
+        params.update(open=OPEN, close=CLOSE, tokens=SNIPPET_TOKENS)
+    else:
+        selectors = f"StartSel={OPEN}, StopSel={CLOSE}"
+        params.update(
+            title_options=f"{selectors}, HighlightAll=true",
+            body_options=f"{selectors}, MaxWords={SNIPPET_TOKENS}, MinWords={SNIPPET_TOKENS // 2}"
+        )
+    if not kind:
+        del params["kind"]
+    rows = await db.execute(text(statement), params)
+    return [{
+        "type": row.kind,
+        "id": row.ref_id,
+        "parentId": row.parent_id,
+        "title": _render(row.title),
+        "snippet": _render(row.snippet),
+        "score": round(float(row.score), 4)
+    } for row in rows]
+
+async def rebuild_search_index(db: AsyncSession) -> int:
+    """Recreate every document from the source tables, in batches."""
+    await db.execute(text(_sql(db)["clear"]))
+    sources = (
+        (select(ForumTopic), topic_document),
+        (select(ForumComment), comment_document),
+        (select(Course), course_document),
+        (select(Module), module_document),
+    )
+    total = 0
+    for query, to_document in sources:
+        result = await db.stream_scalars(query.execution_options(yield_per=REBUILD_BATCH_SIZE))
+        async for rows in result.partitions():
+            documents = [to_document(row) for row in rows]
+            await db.execute(text(_sql(db)["insert"]), documents)
+            total += len(documents)
+    return total
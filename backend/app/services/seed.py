@@ -0,0 +1,310 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+from ..core.security import get_password_hash
+from ..models.user import User
+from ..models.course import Course, Module, Enrollment, Progress
+from ..models.forum import ForumTopic, ForumComment
+from ..models.resource import Resource
+
+# Demo content for new installs and synthetic data for benchmarks. Both are
+# written with bulk inserts on the caller's connection (one transaction) and
+# both are idempotent: rows are matched on a natural key and only missing
+# ones are inserted, so seeding an already seeded database costs a few
+# SELECTs and no password hashing.
+
+DEMO_USERS = [
+    {"name": "Admin User", "email": "admin@afyahub.com", "password": "admin123", "role": "admin"},
+    {"name": "Demo User", "email": "demo@afyahub.com", "password": "demo123", "role": "learner"},
+]
+
+DEMO_COURSES = [
+    {
+        "title": "Understanding HIV/AIDS",
+        "description": "Comprehensive introduction to HIV/AIDS with video lessons, infographics, and interactive quizzes covering transmission, prevention, and treatment basics.",
+        "image": "https://images.unsplash.com/photo-1576091160399-112ba8d25d1d",
+        "duration": "4 weeks",
+        "level": "Beginner"
+    },
+    {
+        "title": "Prevention Strategies",
+        "description": "Learn effective prevention methods and risk reduction strategies through video lessons, infographics, and interactive quizzes.",
+        "image": "https://images.unsplash.com/photo-1584515933487-779824d29309",
+        "duration": "3 weeks",
+        "level": "Beginner"
+    },
+    {
+        "title": "Living with HIV",
+        "description": "Support and guidance for individuals living with HIV/AIDS featuring video lessons, infographics, and interactive quizzes.",
+        "image": "https://images.unsplash.com/photo-1559757175-5700dde675bc",
+        "duration": "6 weeks",
+        "level": "Intermediate"
+    }
+]
+
+# Lessons of the first demo course
+DEMO_MODULES = [
+    {
+        "title": "What is HIV/AIDS?",
+        "order": 1,
+        "content": "<h2>Introduction to HIV/AIDS</h2><p>HIV (Human Immunodeficiency Virus) is a virus that attacks the body's immune system. If left untreated, HIV can lead to AIDS (Acquired Immunodeficiency Syndrome).</p><h3>Key Points:</h3><ul><li>HIV weakens the immune system</li><li>Early detection is crucial</li><li>Treatment is available and effective</li></ul>",
+        "video_url": "https://www.youtube.com/embed/0d_2nk8LD-M"
+    },
+    {
+        "title": "How HIV is Transmitted",
+        "order": 2,
+        "content": "<h2>Transmission Methods</h2><p>HIV is transmitted through specific body fluids including blood, semen, vaginal fluids, and breast milk.</p><h3>Common Transmission Routes:</h3><ul><li>Unprotected sexual contact</li><li>Sharing needles</li><li>Mother to child during pregnancy/birth</li></ul>",
+        "video_url": "https://www.youtube.com/embed/GR5K756WUw0"
+    },
+    {
+        "title": "HIV Testing",
+        "order": 3,
+        "content": "<h2>Getting Tested</h2><p>Regular testing is crucial for early detection and treatment. HIV tests are confidential, quick, and widely available.</p><h3>Testing Options:</h3><ul><li>Rapid tests (results in 20 minutes)</li><li>Laboratory tests</li><li>Home testing kits</li></ul>",
+        "video_url": "https://www.youtube.com/embed/NeEF_JKF8mI"
+    },
+    {
+        "title": "Treatment Options",
+        "order": 4,
+        "content": "<h2>Antiretroviral Therapy (ART)</h2><p>Modern treatments can help people with HIV live long, healthy lives. ART suppresses the virus and prevents transmission.</p><h3>Benefits of Treatment:</h3><ul><li>Reduces viral load</li><li>Strengthens immune system</li><li>Prevents transmission (U=U)</li></ul>",
+        "video_url": "https://www.youtube.com/embed/libKVRa01L8"
+    }
+]
+
+DEMO_RESOURCES = [
+    {
+        "name": "Kenyatta National Hospital VCT",
+        "type": "testing_center",
+        "description": "Free HIV testing and counseling services",
+        "address": "Hospital Rd, Upper Hill, Nairobi",
+        "phone": "+254-20-2726300",
+        "email": "info@knh.or.ke",
+        "website": "https://knh.or.ke",
+        "latitude": -1.3010,
+        "longitude": 36.8073,
+        "hours": "Mon-Fri 8AM-5PM, Sat 8AM-12PM",
+        "services": "HIV Testing, STD Testing, Counseling, PrEP"
+    },
+    {
+        "name": "Kenya AIDS NGOs Consortium (KANCO)",
+        "type": "support_service",
+        "description": "Peer support and advocacy for people living with HIV",
+        "address": "Argwings Kodhek Rd, Hurlingham, Nairobi",
+        "phone": "+254-20-2715790",
+        "email": "info@kanco.org",
+        "website": "https://kanco.org",
+        "latitude": -1.2966,
+        "longitude": 36.7967,
+        "hours": "24/7 Hotline, Office: Mon-Fri 8AM-5PM",
+        "services": "Peer Support, Legal Aid, Advocacy, Community Outreach"
+    },
+    {
+        "name": "Mombasa Counseling Center",
+        "type": "counseling",
+        "description": "Mental health and wellness support",
+        "address": "Digo Rd, Mombasa",
+        "phone": "+254-41-2312345",
+        "email": "help@mombasacounseling.org",
+        "website": "https://mombasacounseling.org",
+        "latitude": -4.0610,
+        "longitude": 39.6730,
+        "hours": "Mon-Sat 9AM-6PM",
+        "services": "Individual Therapy, Group Therapy, Crisis Intervention"
+    },
+    {
+        "name": "Kisumu District Hospital VCT",
+        "type": "testing_center",
+        "description": "Comprehensive HIV care and treatment",
+        "address": "Kakamega Rd, Kisumu",
+        "phone": "+254-57-2023456",
+        "email": "vct@kisumuhospital.go.ke",
+        "website": "https://kisumuhospital.go.ke",
+        "latitude": -0.0917,
+        "longitude": 34.7680,
+        "hours": "Mon-Fri 8AM-5PM",
+        "services": "HIV Testing, Treatment, PrEP, PEP, Specialist Care"
+    },
+    {
+        "name": "Nakuru Family Health Options Kenya",
+        "type": "support_service",
+        "description": "Family planning and HIV prevention services",
+        "address": "Kenyatta Ave, Nakuru",
+        "phone": "+254-51-2212345",
+        "email": "nakuru@fhok.org",
+        "website": "https://fhok.org",
+        "latitude": -0.2833,
+        "longitude": 36.0667,
+        "hours": "Mon-Fri 8AM-5PM, Sat 9AM-1PM",
+        "services": "Family Planning, HIV Prevention, Youth Services"
+    },
+    {
+        "name": "Eldoret AMPATH Center",
+        "type": "testing_center",
+        "description": "Academic Model Providing Access to Healthcare",
+        "address": "Moi Teaching Hospital, Eldoret",
+        "phone": "+254-53-2033471",
+        "email": "info@ampath.org",
+        "website": "https://ampath.org",
+        "latitude": 0.5143,
+        "longitude": 35.2698,
+        "hours": "Mon-Fri 7AM-6PM",
+        "services": "HIV Testing, Treatment, Research, Training"
+    }
+]
+
+# Synthetic rows per unit of ``--scale``; modules and comments are per parent
+SCALE_UNIT = {"users": 1000, "courses": 20, "modules": 10, "topics": 5000, "comments": 3, "resources": 5000}
+SYNTHETIC_PASSWORD = "learner123"
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.afyahub.com"
+SYNTHETIC_COURSE = "Synthetic course"
+SYNTHETIC_TOPIC = "Synthetic question"
+SYNTHETIC_RESOURCE = "Synthetic facility"
+TOWNS = [(-1.29, 36.82), (-4.04, 39.67), (-0.09, 34.77), (-0.30, 36.07), (0.51, 35.27), (-0.42, 36.95)]
+LESSON = "<h2>Lesson</h2><p>" + "Taking treatment every day keeps the viral load suppressed. " * 30 + "</p>"
+
+def synthetic_email(i: int) -> str:
+    return f"learner{i}@{SYNTHETIC_EMAIL_DOMAIN}"
+
+def scaled(scale: float) -> dict:
+    """Synthetic data set sizes for ``--scale``."""
+    return {
+        name: count if name in ("modules", "comments") else int(round(count * scale))
+        for name, count in SCALE_UNIT.items()
+    }
+
+def _existing(connection: Connection, column, values) -> set:
+    return set(connection.execute(select(column).where(column.in_(values))).scalars())
+
+def seed_demo(connection: Connection) -> dict:
+    """Insert whichever demo accounts, courses (with lessons) and resources are missing."""
+    inserted = {"users": 0, "courses": 0, "modules": 0, "resources": 0}
+    emails = _existing(connection, User.email, [u["email"] for u in DEMO_USERS])
+    users = [
+        {"name": u["name"], "email": u["email"], "hashed_password": get_password_hash(u["password"]), "role": u["role"]}
+        for u in DEMO_USERS if u["email"] not in emails
+    ]
+    if users:
+        connection.execute(insert(User), users)
+        inserted["users"] = len(users)
+
+    titles = _existing(connection, Course.title, [c["title"] for c in DEMO_COURSES])
+    courses = [c for c in DEMO_COURSES if c["title"] not in titles]
+    if courses:
+        course_ids = dict(connection.execute(insert(Course).returning(Course.title, Course.id), courses).all())
+        inserted["courses"] = len(courses)
+        first = DEMO_COURSES[0]["title"]
+        if first in course_ids:
+            connection.execute(insert(Module), [{"course_id": course_ids[first], **m} for m in DEMO_MODULES])
+            inserted["modules"] = len(DEMO_MODULES)
+
+    names = _existing(connection, Resource.name, [r["name"] for r in DEMO_RESOURCES])
+    resources = [r for r in DEMO_RESOURCES if r["name"] not in names]
+    if resources:
+        connection.execute(insert(Resource), resources)
+        inserted["resources"] = len(resources)
+    return inserted
+
+def _count(connection: Connection, column, prefix: str) -> int:
+    return connection.execute(select(func.count()).where(column.like(f"{prefix}%"))).scalar_one()
+
+def seed_synthetic(connection: Connection, rng: random.Random, users: int, courses: int, modules: int,
+                   topics: int, comments: int, resources: int, password: str = SYNTHETIC_PASSWORD) -> dict:
+    """Top the synthetic data set up to the given sizes.
+
+    Synthetic rows are numbered and always inserted in order, so the rows
+    already present are counted and only the rest are generated. Learners
+    sign in as ``synthetic_email(i)`` with ``password``; each new learner is
+    enrolled in three courses with half of each course's lessons completed.
+    Returns the ids of every synthetic user, course, module and topic (users
+    in number order) and what was inserted.
+    """
+    now = datetime.utcnow()
+    inserted = dict.fromkeys(("users", "courses", "modules", "enrollments", "progress", "topics", "comments", "resources"), 0)
+
+    have = _count(connection, User.email, f"%@{SYNTHETIC_EMAIL_DOMAIN}")
+    new_user_ids = []
+    if users > have:
+        hashed = get_password_hash(password)
+        new_user_ids = connection.execute(insert(User).returning(User.id), [
+            {"name": f"Learner {i}", "email": synthetic_email(i), "hashed_password": hashed,
+             "role": "learner", "is_active": True, "created_at": now}
+            for i in range(have, users)
+        ]).scalars().all()
+        inserted["users"] = len(new_user_ids)
+
+    have = _count(connection, Course.title, SYNTHETIC_COURSE)
+    if courses > have:
+        course_ids = connection.execute(insert(Course).returning(Course.id), [
+            {"title": f"{SYNTHETIC_COURSE} {c}", "description": "Living well with HIV. " * 10, "level": "Beginner",
+             "duration": "4 weeks", "created_at": now}
+            for c in range(have, courses)
+        ]).scalars().all()
+        inserted["courses"] = len(course_ids)
+        if modules:
+            inserted["modules"] = len(connection.execute(insert(Module).returning(Module.id), [
+                {"course_id": course_id, "title": f"Lesson {m}", "order": m, "content": LESSON}
+                for course_id in course_ids for m in range(modules)
+            ]).all())
+
+    user_ids = connection.execute(
+        select(User.id).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}")).order_by(User.id)
+    ).scalars().all()
+    course_ids = connection.execute(
+        select(Course.id).where(Course.title.like(f"{SYNTHETIC_COURSE}%")).order_by(Course.id)
+    ).scalars().all()
+    module_rows = connection.execute(
+        select(Module.id, Module.course_id).where(Module.course_id.in_(select(Course.id).where(Course.title.like(f"{SYNTHETIC_COURSE}%"))))
+        .order_by(Module.course_id, Module.order)
+    ).all()
+    lessons = {}
+    for module_id, course_id in module_rows:
+        lessons.setdefault(course_id, []).append(module_id)
+
+    enrollments, progress = [], []
+    for user_id in new_user_ids:
+        for course_id in rng.sample(course_ids, min(3, len(course_ids))):
+            enrollments.append({"user_id": user_id, "course_id": course_id, "enrolled_at": now})
+            course_lessons = lessons.get(course_id, [])
+            for module_id in rng.sample(course_lessons, len(course_lessons) // 2):
+                progress.append({"user_id": user_id, "module_id": module_id, "completed": True, "completed_at": now})
+    if enrollments:
+        connection.execute(insert(Enrollment), enrollments)
+    if progress:
+        connection.execute(insert(Progress), progress)
+    inserted["enrollments"], inserted["progress"] = len(enrollments), len(progress)
+
+    have = _count(connection, ForumTopic.title, SYNTHETIC_TOPIC)
+    if topics > have and user_ids:
+        new_topic_ids = connection.execute(insert(ForumTopic).returning(ForumTopic.id), [
+            {"user_id": rng.choice(user_ids), "title": f"{SYNTHETIC_TOPIC} {t}",
+             "content": "How do I manage side effects? " * 10, "category": "general",
+             "created_at": now - timedelta(minutes=t)}
+            for t in range(have, topics)
+        ]).scalars().all()
+        inserted["topics"] = len(new_topic_ids)
+        if comments:
+            connection.execute(insert(ForumComment), [
+                {"topic_id": topic_id, "user_id": rng.choice(user_ids), "content": "Thank you for sharing.", "created_at": now}
+                for topic_id in new_topic_ids for _ in range(comments)
+            ])
+            inserted["comments"] = len(new_topic_ids) * comments
+    topic_ids = connection.execute(
+        select(ForumTopic.id).where(ForumTopic.title.like(f"{SYNTHETIC_TOPIC}%")).order_by(ForumTopic.id)
+    ).scalars().all()
+
+    have = _count(connection, Resource.name, SYNTHETIC_RESOURCE)
+    if resources > have:
+        connection.execute(insert(Resource), [
+            {"name": f"{SYNTHETIC_RESOURCE} {i}", "type": "testing_center",
+             "latitude": town[0] + rng.gauss(0, 0.1), "longitude": town[1] + rng.gauss(0, 0.1)}
+            for i, town in ((i, rng.choice(TOWNS)) for i in range(have, resources))
+        ])
+        inserted["resources"] = resources - have
+
+    return {
+        "users": user_ids,
+        "courses": course_ids,
+        "modules": [module_id for module_id, _ in module_rows],
+        "topics": topic_ids,
+        "inserted": inserted
+    }
@@ -0,0 +1,207 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import Date, and_, cast, delete, func, select, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..db.database import dialect_insert
+from ..models.user import User
+from ..models.course import Course, Module, Enrollment, Progress, UserCourseProgress
+from ..models.stats import DailyStats, CourseStats, LearnerActivity
+
+totals_cache = TTLCache(1, settings.ADMIN_STATS_TTL_SECONDS)
+
+def _today() -> date:
+    return datetime.utcnow().date()
+
+async def _increment(db: AsyncSession, model, key: dict, **amounts):
+    """Upsert a rollup row, adding ``amounts`` to its counters."""
+    stmt = dialect_insert(db, model).values(**key, **amounts)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={name: getattr(model, name) + getattr(stmt.excluded, name) for name in amounts}
+    ))
+
+async def _mark_active(db: AsyncSession, user_id: int, day: date):
+    result = await db.execute(
+        dialect_insert(db, LearnerActivity)
+        .values(day=day, user_id=user_id)
+        .on_conflict_do_nothing(index_elements=["day", "user_id"])
+    )
+    if result.rowcount:
+        await _increment(db, DailyStats, {"day": day}, active_learners=1)
+
+async def record_enrollment(db: AsyncSession, user_id: int, course_id: int):
+    day = _today()
+    await _increment(db, DailyStats, {"day": day}, enrollments=1)
+    await _increment(db, CourseStats, {"course_id": course_id}, enrollments=1)
+    await _mark_active(db, user_id, day)
+
+async def record_progress(db: AsyncSession, user_id: int, course_id: int, previous: int, completed: int, total: int):
+    """Fold one progress write into the rollups given the course counter before and after it.
+
+    Daily counters record completions as they happen; only the course's
+    current completions go down when one is undone.
+    """
+    day = _today()
+    await _mark_active(db, user_id, day)
+    if completed > previous:
+        await _increment(db, DailyStats, {"day": day}, module_completions=completed - previous)
+    was_done = total > 0 and previous >= total
+    is_done = total > 0 and completed >= total
+    if is_done and not was_done:
+        await _increment(db, DailyStats, {"day": day}, course_completions=1)
+        await _increment(db, CourseStats, {"course_id": course_id}, completions=1)
+    elif was_done and not is_done:
+        await _increment(db, CourseStats, {"course_id": course_id}, completions=-1)
+
+def _finished_learners(course_id: int):
+    return (
+        select(func.count())
+        .select_from(UserCourseProgress)
+        .where(
+            UserCourseProgress.course_id == course_id,
+            UserCourseProgress.total_modules > 0,
+            UserCourseProgress.completed_modules >= UserCourseProgress.total_modules
+        )
+        .scalar_subquery()
+    )
+
+async def recount_course_completions(db: AsyncSession, course_id: int):
+    """Recount learners who finished a course; needed after its module list changes."""
+    result = await db.execute(
+        update(CourseStats)
+        .where(CourseStats.course_id == course_id)
+        .values(completions=_finished_learners(course_id))
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        await db.execute(
+            dialect_insert(db, CourseStats)
+            .values(course_id=course_id, enrollments=0, completions=_finished_learners(course_id))
+            .on_conflict_do_nothing(index_elements=["course_id"])
+        )
+
+async def get_totals(db: AsyncSession):
+    """Return the dashboard totals from one query, cached for ADMIN_STATS_TTL_SECONDS."""
+    totals = totals_cache.get("totals")
+    if totals is None:
+        count = lambda model: select(func.count()).select_from(model).scalar_subquery()
+        row = (await db.execute(select(count(User), count(Course), count(Enrollment), count(Module)))).one()
+        totals = {
+            "totalUsers": row[0],
+            "totalCourses": row[1],
+            "totalEnrollments": row[2],
+            "totalModules": row[3]
+        }
+        totals_cache.set("totals", totals)
+    return totals
+
+async def get_activity(db: AsyncSession, days: int):
+    since = _today() - timedelta(days=days - 1)
+    daily = await db.scalars(select(DailyStats).where(DailyStats.day >= since).order_by(DailyStats.day))
+    courses = await db.execute(
+        select(Course.id, Course.title, CourseStats.enrollments, CourseStats.completions)
+        .join(CourseStats, CourseStats.course_id == Course.id)
+        .order_by(Course.id)
+    )
+    return {
+        "daily": [{
+            "day": d.day.isoformat(),
+            "enrollments": d.enrollments,
+            "moduleCompletions": d.module_completions,
+            "courseCompletions": d.course_completions,
+            "activeLearners": d.active_learners
+        } for d in daily],
+        "courses": [{
+            "id": c.id,
+            "title": c.title,
+            "enrollments": c.enrollments,
+            "completions": c.completions
+        } for c in courses]
+    }
+
+def _day(db: AsyncSession, column):
+    if db.bind.dialect.name == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+async def rebuild_rollups(db: AsyncSession):
+    """Recompute every rollup from enrollments, progress and the course counters.
+
+    Course completion days are taken from the learner's latest completed
+    module in that course. Daily counters rebuilt this way only reflect the
+    current rows, so completions that were later undone, which the live
+    counters keep, are not counted.
+    Run after ``rebuild_course_progress``.
+    """
+    for model in (DailyStats, CourseStats, LearnerActivity):
+        await db.execute(delete(model))
+    
+    daily = {}
+    def add(day, **amounts):
+        row = daily.setdefault(_as_date(day), {"enrollments": 0, "module_completions": 0, "course_completions": 0, "active_learners": 0})
+        for name, amount in amounts.items():
+            row[name] += amount
+    
+    enrolled_day = _day(db, Enrollment.enrolled_at)
+    for day, n in await db.execute(
+        select(enrolled_day, func.count()).where(Enrollment.enrolled_at.isnot(None)).group_by(enrolled_day)
+    ):
+        add(day, enrollments=n)
+    completed_day = _day(db, Progress.completed_at)
+    for day, n in await db.execute(
+        select(completed_day, func.count())
+        .where(Progress.completed == 1, Progress.completed_at.isnot(None))
+        .group_by(completed_day)
+    ):
+        add(day, module_completions=n)
+    finished = (
+        select(func.max(Progress.completed_at).label("finished_at"))
+        .join(Module, Module.id == Progress.module_id)
+        .join(UserCourseProgress, and_(
+            UserCourseProgress.user_id == Progress.user_id,
+            UserCourseProgress.course_id == Module.course_id
+        ))
+        .where(
+            Progress.completed == 1,
+            UserCourseProgress.total_modules > 0,
+            UserCourseProgress.completed_modules >= UserCourseProgress.total_modules
+        )
+        .group_by(Progress.user_id, Module.course_id)
+        .subquery()
+    )
+    finished_day = _day(db, finished.c.finished_at)
+    for day, n in await db.execute(
+        select(finished_day, func.count()).where(finished.c.finished_at.isnot(None)).group_by(finished_day)
+    ):
+        add(day, course_completions=n)
+    activity = union(
+        select(_day(db, Enrollment.enrolled_at).label("day"), Enrollment.user_id)
+        .where(Enrollment.enrolled_at.isnot(None), Enrollment.user_id.isnot(None)),
+        select(_day(db, Progress.completed_at).label("day"), Progress.user_id)
+        .where(Progress.completed_at.isnot(None), Progress.user_id.isnot(None))
+    ).subquery()
+    active = [{"day": _as_date(day), "user_id": user_id} for day, user_id in await db.execute(select(activity))]
+    for row in active:
+        add(row["day"], active_learners=1)
+    
+    if active:
+        await db.execute(dialect_insert(db, LearnerActivity), active)
+    if daily:
+        await db.execute(dialect_insert(db, DailyStats), [{"day": day, **row} for day, row in daily.items()])
+    course_rows = [
+        {"course_id": course_id, "enrollments": enrollments, "completions": 0}
+        for course_id, enrollments in await db.execute(
+            select(Enrollment.course_id, func.count())
+            .where(Enrollment.course_id.isnot(None))
+            .group_by(Enrollment.course_id)
+        )
+    ]
+    if course_rows:
+        await db.execute(dialect_insert(db, CourseStats), course_rows)
+    for row in course_rows:
+        await recount_course_completions(db, row["course_id"])
+    return len(daily)
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+from ..models.course import Course, Module, Enrollment, Progress
+from ..models.forum import ForumTopic
+from ..models.sync import Tombstone
+from .forum import topic_summary, topic_summary_query
+from .progress import get_module_course_ids, write_progress
+
+# Offline clients keep a sync token (the server time of their last sync) and
+# ask for rows whose ``updated_at`` is newer, plus tombstones for deletions.
+# Changesets are idempotent upserts, so re-sending a few rows is harmless;
+# the window is widened by SYNC_OVERLAP_SECONDS so a row stamped just before
+# a token but committed just after it is not missed.
+
+DELETED_KEYS = {"course": "courses", "module": "modules", "topic": "topics"}
+
+def _retention() -> timedelta:
+    return timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+async def record_deletions(db: AsyncSession, kind: str, ids):
+    """Leave a tombstone for each deleted row and prune expired ones."""
+    if not ids:
+        return
+    now = datetime.utcnow()
+    await db.execute(delete(Tombstone).where(Tombstone.deleted_at < now - _retention()))
+    await db.execute(insert(Tombstone), [{"kind": kind, "ref_id": ref_id, "deleted_at": now} for ref_id in ids])
+
+async def get_changes(db: AsyncSession, user_id: int, since: Optional[datetime], now: datetime):
+    """Collect the learner's changeset since ``since``, or a full snapshot.
+
+    A snapshot is returned when there is no token or it is older than the
+    tombstone retention, since deletions before then can no longer be
+    reported. Clients apply ``deleted`` before upserting the changed rows.
+    """
+    reset = since is None or since < now - _retention()
+    after = None if reset else since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+
+    def changed(query, column):
+        return query if after is None else query.where(column > after)
+
+    courses = await db.scalars(changed(select(Course), Course.updated_at).order_by(Course.id))
+    modules = await db.scalars(
+        changed(select(Module).where(Module.course_id.isnot(None)), Module.updated_at)
+        .order_by(Module.course_id, Module.order)
+    )
+    topics = (await db.execute(
+        changed(topic_summary_query(), ForumTopic.updated_at)
+        .order_by(ForumTopic.updated_at.desc(), ForumTopic.id.desc())
+        .limit(settings.SYNC_MAX_TOPICS + 1)
+    )).all()
+    progress = await db.scalars(
+        changed(select(Progress).where(Progress.user_id == user_id, Progress.module_id.isnot(None)), Progress.updated_at)
+        .order_by(Progress.module_id)
+    )
+    enrollments = await db.scalars(
+        changed(select(Enrollment).where(Enrollment.user_id == user_id, Enrollment.course_id.isnot(None)), Enrollment.updated_at)
+        .order_by(Enrollment.course_id)
+    )
+    deleted = {key: [] for key in DELETED_KEYS.values()}
+    if after is not None:
+        tombstones = await db.execute(
+            select(Tombstone.kind, Tombstone.ref_id).where(Tombstone.deleted_at > after).order_by(Tombstone.id)
+        )
+        for kind, ref_id in tombstones:
+            deleted[DELETED_KEYS[kind]].append(ref_id)
+    return {
+        "reset": reset,
+        "courses": courses.all(),
+        "modules": modules.all(),
+        # Topics beyond the limit are left to the paginated forum list
+        "topics": [topic_summary(t) for t in topics[:settings.SYNC_MAX_TOPICS]],
+        "topics_truncated": len(topics) > settings.SYNC_MAX_TOPICS,
+        "progress": progress.all(),
+        "enrollments": enrollments.all(),
+        "deleted": deleted
+    }
+
+def _as_server_time(value: Optional[datetime], now: datetime) -> datetime:
+    """Naive UTC, as stored; missing or future client times become ``now``."""
+    if value is None:
+        return now
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(value, now)
+
+async def apply_progress_updates(db: AsyncSession, user_id: int, updates):
+    """Apply queued offline progress writes within the caller's transaction.
+
+    Each module keeps whichever write happened last, so an update queued
+    before the server row was last changed (from another device, say) is
+    left alone. Returns ``(applied, stale, rejected)`` module ids, where
+    rejected modules no longer exist.
+    """
+    now = datetime.utcnow()
+    latest = {}
+    for update in updates:
+        at = _as_server_time(update.updated_at, now)
+        if update.module_id not in latest or at >= latest[update.module_id][1]:
+            latest[update.module_id] = (update.completed, at)
+    if not latest:
+        return [], [], []
+
+    course_ids = await get_module_course_ids(db, list(latest))
+    rejected = sorted(latest.keys() - course_ids.keys())
+    entries = {module_id: entry for module_id, entry in latest.items() if module_id in course_ids}
+    if not entries:
+        return [], [], rejected
+    written, _ = await write_progress(db, user_id, entries, course_ids)
+    applied = sorted(p.module_id for p in written)
+    stale = sorted(entries.keys() - set(applied))
+    return applied, stale, rejected
@@ -0,0 +1,86 @@
+"""Measure worker cold start: a fresh interpreter importing the app and answering its first requests.
+
+Each run starts a new Python process that imports ``app.main``, then serves
+``GET /api/health`` and a first database-backed request in-process, the way
+a newly forked worker would. Importing the app must not touch the database;
+the first run checks that by pointing it at a database file that does not
+exist yet. Exits non-zero when the median time to the first response exceeds
+``--budget-ms``, so CI can keep startup in check:
+
+    python -m benchmarks.cold_start --runs 10 --budget-ms 2500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--runs", type=int, default=10, help="processes to start")
+parser.add_argument("--budget-ms", type=float, default=2500, help="allowed median time to the first response")
+args = parser.parse_args()
+
+WORKER = """
+import asyncio, json, os, time
+started = time.perf_counter()
+import httpx
+from app.main import app
+imported = time.perf_counter()
+schema_untouched = not os.path.exists(os.environ["BENCH_DB_PATH"])
+
+async def first_requests():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        (await client.get("/api/health")).raise_for_status()
+        health = time.perf_counter()
+        if os.path.exists(os.environ["BENCH_DB_PATH"]):
+            (await client.get("/api/forum/topics")).raise_for_status()
+        return health
+
+health = asyncio.run(first_requests())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "health_ms": (health - started) * 1000,
+    "first_query_ms": (time.perf_counter() - started) * 1000,
+    "schema_untouched": schema_untouched
+}))
+"""
+
+def start_worker(db_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", BENCH_DB_PATH=db_path)
+    began = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", WORKER], env=env, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - began) * 1000
+    return result
+
+def migrate(db_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], env=env, check=True, capture_output=True)
+
+def main():
+    db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+    db_path = os.path.join(db_dir, "bench.db")
+
+    first = start_worker(db_path)
+    if not first["schema_untouched"] or os.path.exists(db_path):
+        print("importing the app touched the database")
+        return 1
+    migrate(db_path)
+
+    runs = [start_worker(db_path) for _ in range(args.runs)]
+    for key, label in (("import_ms", "import app.main"), ("health_ms", "first response"),
+                       ("first_query_ms", "first DB query"), ("process_ms", "process exit")):
+        values = [r[key] for r in runs]
+        print(f"{label:<16} p50={statistics.median(values):7.1f}ms max={max(values):7.1f}ms")
+
+    median = statistics.median(r["health_ms"] for r in runs)
+    if median > args.budget_ms:
+        print(f"\nOVER BUDGET: first response after {median:.0f}ms, budget {args.budget_ms:.0f}ms")
+        return 1
+    print(f"\nwithin budget ({median:.0f}ms of {args.budget_ms:.0f}ms)")
+    return 0
+
+sys.exit(main())
@@ -0,0 +1,91 @@
+"""Measure bandwidth and CPU per request with and without response compression.
+
+Seeds a catalog of ``--courses`` x ``--modules`` HTML lessons in a throwaway
+SQLite database and requests the course list (compressed per request by the
+middleware) and a module list (served precompressed) with each encoding:
+
+    python -m benchmarks.compression --courses 10 --modules 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--courses", type=int, default=10, help="courses in the catalog")
+parser.add_argument("--modules", type=int, default=50, help="modules per course")
+parser.add_argument("--requests", type=int, default=100, help="requests per endpoint and encoding")
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.db.database import SessionLocal, Base, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.course import Course, Module  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+# Deployments create the schema with the migrations; a throwaway database
+# can take it straight from the models
+Base.metadata.create_all(bind=engine)
+
+WORDS = ("antiretroviral therapy viral load immune system clinic adherence testing prevention counselling "
+         "support stigma partner pregnancy nutrition medication appointment results community health "
+         "worker symptoms treatment options care confidential youth family").split()
+
+def lesson(rng):
+    paragraphs = [
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + ".</p>"
+        for _ in range(6)
+    ]
+    items = "".join(f"<li>{rng.choice(WORDS)} {rng.choice(WORDS)}</li>" for _ in range(5))
+    return f"<h2>{rng.choice(WORDS).title()}</h2>" + "".join(paragraphs) + f"<ul>{items}</ul>"
+
+ENCODINGS = ["identity", "gzip", "br"]
+
+def seed():
+    rng = random.Random(7)
+    db = SessionLocal()
+    user = User(name="Bench", email="bench@afyahub.com", hashed_password="x", role="learner")
+    db.add(user)
+    for c in range(args.courses):
+        course = Course(title=f"Course {c}", description="Living well with HIV. " * 10, level="Beginner")
+        course.modules = [
+            Module(title=f"Lesson {m}", order=m, content=lesson(rng), video_url="https://www.youtube.com/embed/x")
+            for m in range(args.modules)
+        ]
+        db.add(course)
+    db.commit()
+    token = create_access_token({"sub": user.email, "uid": user.id})
+    db.close()
+    return token
+
+async def measure(client, label, path, headers):
+    for encoding in ENCODINGS:
+        request_headers = {**headers, "Accept-Encoding": encoding}
+        await client.get(path, headers=request_headers)  # warm caches
+        wire_bytes = 0
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        for _ in range(args.requests):
+            response = await client.get(path, headers=request_headers)
+            wire_bytes += response.num_bytes_downloaded
+        cpu = (time.process_time() - cpu) / args.requests
+        wall = (time.perf_counter() - wall) / args.requests
+        print(f"{label:<14} {encoding:<9} {wire_bytes / args.requests / 1024:8.1f}KiB/request "
+              f"cpu={cpu * 1000:6.2f}ms wall={wall * 1000:6.2f}ms")
+
+async def main():
+    token = seed()
+    auth = {"Authorization": f"Bearer {token}"}
+    print(f"{args.courses} courses x {args.modules} modules")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await measure(client, "course list", f"/api/courses/?limit={args.courses}", auth)
+        await measure(client, "module list", "/api/courses/1/modules", {})
+
+asyncio.run(main())
@@ -0,0 +1,75 @@
+"""Measure forum event fan-out to many idle subscribers in one worker.
+
+Opens ``--subscribers`` subscriptions on the in-process hub, each read by its
+own task the way an SSE or WebSocket connection reads it, then publishes
+``--events`` events and reports how long publishing takes and how long each
+event takes to reach every subscriber. ``--stalled`` subscribers never read,
+to show them being dropped once their queue fills:
+
+    python -m benchmarks.forum_events --subscribers 10000 --events 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--subscribers", type=int, default=10000, help="idle subscribers")
+parser.add_argument("--events", type=int, default=20, help="events to publish")
+parser.add_argument("--stalled", type=int, default=10, help="subscribers that never read their queue")
+parser.add_argument("--queue-size", type=int, default=8, help="per-subscriber queue size")
+args = parser.parse_args()
+
+from app.core.events import EventHub, LocalEventBroker  # noqa: E402
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def reader(hub, ready, latencies, sent_at):
+    async with hub.subscribe() as subscription:
+        ready.release()
+        async for message in subscription.messages():
+            latencies.append(time.perf_counter() - sent_at[0])
+
+async def stalled(hub, ready, done):
+    async with hub.subscribe():
+        ready.release()
+        await done.wait()
+
+async def main():
+    hub = EventHub(LocalEventBroker(), args.queue_size, 3600)
+    ready = asyncio.Semaphore(0)
+    done = asyncio.Event()
+    latencies, sent_at = [], [0.0]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(reader(hub, ready, latencies, sent_at)) for _ in range(args.subscribers)]
+    tasks += [asyncio.create_task(stalled(hub, ready, done)) for _ in range(args.stalled)]
+    for _ in tasks:
+        await ready.acquire()
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / len(tasks)
+    tracemalloc.stop()
+    print(f"{args.subscribers} readers + {args.stalled} stalled, {per_subscriber / 1024:.1f}KiB per subscriber")
+
+    publish_ms, fanout_ms = [], []
+    for i in range(args.events):
+        latencies.clear()
+        sent_at[0] = time.perf_counter()
+        await hub.publish("comment.created", {"id": i, "topicId": 1, "content": "Thank you for sharing", "author": "Amina"})
+        publish_ms.append((time.perf_counter() - sent_at[0]) * 1000)
+        while len(latencies) < args.subscribers:
+            await asyncio.sleep(0)
+        fanout_ms.append(max(latencies) * 1000)
+    print(f"publish      p50={statistics.median(publish_ms):7.2f}ms max={max(publish_ms):7.2f}ms")
+    print(f"all received p50={statistics.median(fanout_ms):7.2f}ms p99={percentile(fanout_ms, 0.99):7.2f}ms "
+          f"max={max(fanout_ms):7.2f}ms")
+    print(hub.stats())
+
+    done.set()
+    await hub.close()
+    await asyncio.gather(*tasks)
+
+asyncio.run(main())
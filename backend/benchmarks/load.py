@@ -0,0 +1,265 @@
+"""Drive realistic request mixes against the API and report per-endpoint latency.
+
+Seeds synthetic users, courses, modules, enrollments, progress, forum topics
+and resources at the requested scale in a throwaway SQLite database, runs the
+app in-process over an ASGI transport and, for each scenario, sends
+``--requests`` requests from ``--concurrency`` virtual users:
+
+- login: a login storm
+- browse: catalog, course, module and progress pages
+- progress: single and batch progress writes, then a delta sync
+- forum: topic list pages and topic detail
+- mixed: all of the above, weighted roughly like production traffic
+
+Throughput, p50/p95/p99 latency and errors are reported per endpoint along
+with the number of SQL statements one warm request issues. ``--save`` writes
+the results as a JSON baseline; ``--compare`` checks a run against one and
+exits non-zero on a regression, so CI can run:
+
+    python -m benchmarks.load --compare benchmarks/baselines/load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--users", type=int, default=1000, help="learners to seed")
+parser.add_argument("--courses", type=int, default=20, help="courses to seed")
+parser.add_argument("--modules", type=int, default=10, help="modules per course")
+parser.add_argument("--topics", type=int, default=5000, help="forum topics to seed")
+parser.add_argument("--comments", type=int, default=3, help="comments per topic")
+parser.add_argument("--resources", type=int, default=5000, help="resources to seed")
+parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+parser.add_argument("--logins", type=int, default=50, help="requests in the login scenario (bcrypt bound)")
+parser.add_argument("--concurrency", type=int, default=20, help="virtual users per scenario")
+parser.add_argument("--scenario", action="append", help="scenario to run (repeatable); default all")
+parser.add_argument("--seed", type=int, default=7, help="random seed for data and request mixes")
+parser.add_argument("--save", help="write the results to this JSON file")
+parser.add_argument("--compare", help="baseline JSON to check the results against")
+parser.add_argument("--latency-tolerance", type=float, default=1.0,
+                    help="allowed p95 growth over the baseline, as a fraction (1.0 = twice as slow)")
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app.main import app  # noqa: E402
+from app.api.pagination import encode_cursor  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.database import AsyncSessionLocal, async_engine, engine, Base  # noqa: E402
+from app.services.progress import rebuild_course_progress  # noqa: E402
+from app.services.seed import TOWNS, seed_synthetic, synthetic_email  # noqa: E402
+from app.services.stats import rebuild_rollups  # noqa: E402
+
+# Deployments create the schema with the migrations; a throwaway database
+# can take it straight from the models
+Base.metadata.create_all(bind=engine)
+
+PASSWORD = "load-password"
+
+executed = {"statements": 0}
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def count_statement(*_):
+    executed["statements"] += 1
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def seed(rng):
+    """Bulk-load the synthetic data set and return the ids the scenarios pick from."""
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        data = seed_synthetic(connection, rng, args.users, args.courses, args.modules,
+                              args.topics, args.comments, args.resources, PASSWORD)
+    inserted = data["inserted"]
+    print(f"seeded {inserted['users']} users, {inserted['courses']} courses, {inserted['modules']} modules, "
+          f"{inserted['progress']} progress rows, {inserted['topics']} topics, {inserted['resources']} resources "
+          f"in {time.perf_counter() - start:.1f}s")
+    data["tokens"] = {user_id: create_access_token({"sub": synthetic_email(i), "uid": user_id})
+                      for i, user_id in enumerate(data["users"])}
+    return data
+
+async def rebuild_counters():
+    async with AsyncSessionLocal() as db:
+        await rebuild_course_progress(db)
+        await rebuild_rollups(db)
+        await db.commit()
+
+# Each step picks its inputs and returns (endpoint, method, url, json body, user id or None).
+
+def login(rng, data):
+    i = rng.randrange(len(data["users"]))
+    return "POST /api/auth/login", "POST", "/api/auth/login", {"email": synthetic_email(i), "password": PASSWORD}, None
+
+def course_list(rng, data):
+    return "GET /api/courses", "GET", "/api/courses/?limit=20", None, rng.choice(data["users"])
+
+def course_detail(rng, data):
+    return "GET /api/courses/{id}", "GET", f"/api/courses/{rng.choice(data['courses'])}", None, rng.choice(data["users"])
+
+def module_list(rng, data):
+    return "GET /api/courses/{id}/modules", "GET", f"/api/courses/{rng.choice(data['courses'])}/modules", None, None
+
+def user_progress(rng, data):
+    return "GET /api/users/progress", "GET", "/api/users/progress", None, rng.choice(data["users"])
+
+def progress_write(rng, data):
+    module_id = rng.choice(data["modules"])
+    return ("POST /api/courses/modules/{id}/progress", "POST", f"/api/courses/modules/{module_id}/progress",
+            {"completed": rng.random() < 0.8}, rng.choice(data["users"]))
+
+def progress_batch(rng, data):
+    updates = [{"module_id": m, "completed": True} for m in rng.sample(data["modules"], 10)]
+    return "POST /api/courses/progress:batch", "POST", "/api/courses/progress:batch", updates, rng.choice(data["users"])
+
+def delta_sync(rng, data):
+    since = encode_cursor(datetime.utcnow() - timedelta(minutes=5))
+    return "GET /api/sync", "GET", f"/api/sync?since={since}", None, rng.choice(data["users"])
+
+def topic_list(rng, data):
+    return "GET /api/forum/topics", "GET", "/api/forum/topics?limit=20", None, None
+
+def topic_page(rng, data):
+    created_at = datetime.utcnow() - timedelta(minutes=rng.randrange(len(data["topics"])))
+    cursor = encode_cursor(created_at, max(data["topics"]) + 1)
+    return "GET /api/forum/topics?cursor", "GET", f"/api/forum/topics?limit=20&cursor={cursor}", None, None
+
+def topic_detail(rng, data):
+    return "GET /api/forum/topics/{id}", "GET", f"/api/forum/topics/{rng.choice(data['topics'])}", None, None
+
+def nearby(rng, data):
+    lat, lng = rng.choice(TOWNS)
+    return "GET /api/resources?near", "GET", f"/api/resources/?near={lat},{lng}&limit=10", None, rng.choice(data["users"])
+
+SCENARIOS = {
+    "login": [(login, 1)],
+    "browse": [(course_list, 3), (course_detail, 3), (module_list, 3), (user_progress, 1)],
+    "progress": [(progress_write, 6), (progress_batch, 1), (delta_sync, 3)],
+    "forum": [(topic_list, 5), (topic_page, 3), (topic_detail, 4)],
+    "mixed": [
+        (login, 1), (course_list, 8), (course_detail, 8), (module_list, 8), (user_progress, 4),
+        (progress_write, 8), (progress_batch, 1), (delta_sync, 4),
+        (topic_list, 10), (topic_page, 4), (topic_detail, 8), (nearby, 4)
+    ],
+}
+
+async def send(client, data, step):
+    endpoint, method, url, body, user_id = step
+    headers = {"Authorization": f"Bearer {data['tokens'][user_id]}"} if user_id else {}
+    start = time.perf_counter()
+    response = await client.request(method, url, json=body, headers=headers)
+    return endpoint, time.perf_counter() - start, response.status_code
+
+async def count_queries(client, data, rng, steps):
+    """SQL statements per warm request of each endpoint, measured one request at a time."""
+    counts = {}
+    for make_step, _ in steps:
+        step = make_step(rng, data)
+        await send(client, data, step)  # fill caches
+        before = executed["statements"]
+        await send(client, data, step)
+        counts[step[0]] = executed["statements"] - before
+    return counts
+
+async def run_scenario(client, data, name):
+    rng = random.Random(f"{args.seed}:{name}")
+    steps = SCENARIOS[name]
+    queries = await count_queries(client, data, rng, steps)
+    total = args.logins if name == "login" else args.requests
+    makers, weights = zip(*steps)
+    plan = [rng.choices(makers, weights)[0](rng, data) for _ in range(total)]
+    samples, errors = {}, {}
+
+    async def virtual_user(worker):
+        for step in plan[worker::args.concurrency]:
+            endpoint, elapsed, status = await send(client, data, step)
+            samples.setdefault(endpoint, []).append(elapsed)
+            if status >= 400:
+                errors[endpoint] = errors.get(endpoint, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(w) for w in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "throughput": round(total / elapsed, 1),
+        "endpoints": {
+            endpoint: {
+                "requests": len(ms),
+                "p50_ms": round(statistics.median(ms), 2),
+                "p95_ms": round(percentile(ms, 95), 2),
+                "p99_ms": round(percentile(ms, 99), 2),
+                "errors": errors.get(endpoint, 0),
+                "queries": queries[endpoint]
+            }
+            for endpoint, ms in ((e, [s * 1000 for s in v]) for e, v in sorted(samples.items()))
+        }
+    }
+
+def report(name, result):
+    print(f"\n{name}: {result['requests']} requests, {result['throughput']:.1f} req/s")
+    print(f"  {'endpoint':<42} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'err':>4} {'sql':>4}")
+    for endpoint, r in result["endpoints"].items():
+        print(f"  {endpoint:<42} {r['requests']:>5} {r['p50_ms']:>7.2f}ms {r['p95_ms']:>7.2f}ms "
+              f"{r['p99_ms']:>7.2f}ms {r['errors']:>4} {r['queries']:>4}")
+
+def regressions(results, baseline):
+    """Compare against a baseline: more SQL, errors or a slower p95 beyond the tolerance."""
+    problems = []
+    for name, result in results.items():
+        expected = baseline["scenarios"].get(name, {}).get("endpoints", {})
+        for endpoint, r in result["endpoints"].items():
+            if r["errors"]:
+                problems.append(f"{name} {endpoint}: {r['errors']} errors")
+            if endpoint not in expected:
+                continue
+            was = expected[endpoint]
+            if r["queries"] > was["queries"]:
+                problems.append(f"{name} {endpoint}: {r['queries']} SQL statements, baseline {was['queries']}")
+            if r["p95_ms"] > was["p95_ms"] * (1 + args.latency_tolerance):
+                problems.append(f"{name} {endpoint}: p95 {r['p95_ms']:.2f}ms, baseline {was['p95_ms']:.2f}ms")
+    return problems
+
+async def main():
+    rng = random.Random(args.seed)
+    data = seed(rng)
+    await rebuild_counters()
+    names = args.scenario or list(SCENARIOS)
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in names:
+            results[name] = await run_scenario(client, data, name)
+            report(name, results[name])
+
+    config = {key: getattr(args, key) for key in
+              ("users", "courses", "modules", "topics", "comments", "resources", "requests", "logins", "concurrency", "seed")}
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"config": config, "scenarios": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nwrote {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print(f"\nwarning: baseline was recorded with {baseline['config']}")
+        problems = regressions(results, baseline)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"\nno regressions against {args.compare}")
+
+asyncio.run(main())
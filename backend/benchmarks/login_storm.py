@@ -0,0 +1,84 @@
+"""Measure /api/health latency while a burst of logins is in progress.
+
+Runs the app in-process over an ASGI transport against a throwaway SQLite
+database, so it needs no running server:
+
+    python -m benchmarks.login_storm --logins 200 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--logins", type=int, default=200, help="total login requests in the storm")
+parser.add_argument("--concurrency", type=int, default=100, help="logins in flight at once")
+parser.add_argument("--probe-interval", type=float, default=0.005, help="seconds between health probes")
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.db.database import SessionLocal, Base, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+
+# Deployments create the schema with the migrations; a throwaway database
+# can take it straight from the models
+Base.metadata.create_all(bind=engine)
+
+EMAIL, PASSWORD = "storm@afyahub.com", "storm-password"
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summary(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<22} n={len(ms):<5} p50={statistics.median(ms):7.2f}ms "
+          f"p99={percentile(ms, 99):7.2f}ms max={max(ms):7.2f}ms")
+
+async def probe(client, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/health")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(args.probe_interval)
+
+async def login(client, semaphore, statuses):
+    async with semaphore:
+        response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+async def main():
+    db = SessionLocal()
+    db.add(User(name="Storm", email=EMAIL, hashed_password=get_password_hash(PASSWORD)))
+    db.commit()
+    db.close()
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle, stop = [], asyncio.Event()
+        idle_probe = asyncio.create_task(probe(client, stop, idle))
+        await asyncio.sleep(1)
+        stop.set()
+        await idle_probe
+        
+        storm, stop, statuses = [], asyncio.Event(), {}
+        semaphore = asyncio.Semaphore(args.concurrency)
+        storm_probe = asyncio.create_task(probe(client, stop, storm))
+        start = time.perf_counter()
+        await asyncio.gather(*(login(client, semaphore, statuses) for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await storm_probe
+    
+    summary("health (idle)", idle)
+    summary("health (login storm)", storm)
+    print(f"logins: {args.logins} in {elapsed:.2f}s ({args.logins / elapsed:.1f}/s), statuses {statuses}")
+
+asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Measure nearest-resource lookup latency over synthetic facilities.
+
+Loads ``--facilities`` resources into a throwaway SQLite database, half of
+them clustered around Kenyan towns and half spread across the country, then
+times k-nearest queries and checks them against a brute-force scan:
+
+    python -m benchmarks.nearest --facilities 100000 --queries 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--facilities", type=int, default=100_000, help="synthetic resources to load")
+parser.add_argument("--queries", type=int, default=500, help="lookups to time per query shape")
+parser.add_argument("--k", type=int, default=10, help="resources returned per lookup")
+parser.add_argument("--seed", type=int, default=7, help="random seed for the synthetic data")
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+
+from sqlalchemy import insert  # noqa: E402
+from app.main import app  # noqa: E402,F401 - registers every model
+from app.db.database import AsyncSessionLocal, engine, Base  # noqa: E402
+from app.models.resource import Resource  # noqa: E402
+from app.services.resources import find_nearest, haversine_km  # noqa: E402
+
+# Deployments create the schema with the migrations; a throwaway database
+# can take it straight from the models
+Base.metadata.create_all(bind=engine)
+
+TOWNS = [(-1.29, 36.82), (-4.04, 39.67), (-0.09, 34.77), (-0.30, 36.07), (0.51, 35.27), (-0.42, 36.95)]
+TYPES = ["testing_center", "support_service", "counseling"]
+LAT_RANGE, LNG_RANGE = (-4.7, 5.0), (33.9, 41.9)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summary(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<22} n={len(ms):<5} p50={statistics.median(ms):7.2f}ms "
+          f"p99={percentile(ms, 99):7.2f}ms max={max(ms):7.2f}ms")
+
+def random_point(rng):
+    if rng.random() < 0.5:
+        lat, lng = rng.choice(TOWNS)
+        return lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05)
+    return rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+
+def load_facilities(rng):
+    points = [random_point(rng) for _ in range(args.facilities)]
+    with engine.begin() as connection:
+        connection.execute(insert(Resource), [
+            {"name": f"Facility {i}", "type": rng.choice(TYPES), "latitude": lat, "longitude": lng}
+            for i, (lat, lng) in enumerate(points)
+        ])
+    return points
+
+async def time_lookups(label, make_point, check, **options):
+    samples = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(args.queries):
+            lat, lng = make_point()
+            start = time.perf_counter()
+            nearest = await find_nearest(db, lat, lng, args.k, **options)
+            samples.append(time.perf_counter() - start)
+            check(lat, lng, nearest)
+    summary(label, samples)
+
+def brute_force_check(points):
+    def check(lat, lng, nearest):
+        expected = sorted(haversine_km(lat, lng, *p) for p in points)[:args.k]
+        got = [distance for _, distance in nearest]
+        assert all(abs(a - b) < 1e-9 for a, b in zip(got, expected)), (lat, lng)
+    return check
+
+async def main():
+    rng = random.Random(args.seed)
+    points = load_facilities(rng)
+    checked = brute_force_check(points)
+    unchecked = lambda *_: None
+    await time_lookups("in a town", lambda: random_point(rng), unchecked)
+    await time_lookups("rural", lambda: (rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)), unchecked)
+    await time_lookups("25km radius", lambda: random_point(rng), unchecked, radius_km=25)
+    await time_lookups("by type", lambda: random_point(rng), unchecked, type="counseling")
+    args.queries = min(args.queries, 20)
+    await time_lookups("brute-force verified", lambda: random_point(rng), checked)
+
+asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Compare per-module progress POSTs against one batch request.
+
+Seeds a course of ``--modules`` modules in a throwaway SQLite database and,
+for each round, marks every module complete (then incomplete on the next
+round, so each round really writes) either with one
+``POST /api/courses/modules/{id}/progress`` per module or with a single
+``POST /api/courses/progress:batch``:
+
+    python -m benchmarks.progress_batch --modules 50 --rounds 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--modules", type=int, default=50, help="modules updated per round")
+parser.add_argument("--rounds", type=int, default=20, help="rounds per approach")
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app.main import app  # noqa: E402
+from app.db.database import SessionLocal, async_engine, Base, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.course import Course, Module  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+# Deployments create the schema with the migrations; a throwaway database
+# can take it straight from the models
+Base.metadata.create_all(bind=engine)
+
+statements = 0
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def count_statement(*_):
+    global statements
+    statements += 1
+
+def seed():
+    db = SessionLocal()
+    user = User(name="Bench", email="bench@afyahub.com", hashed_password="x", role="learner")
+    course = Course(title="Course", description="Living well with HIV.", level="Beginner")
+    course.modules = [Module(title=f"Lesson {m}", order=m, content="<p>Lesson</p>") for m in range(args.modules)]
+    db.add_all([user, course])
+    db.commit()
+    token = create_access_token({"sub": user.email, "uid": user.id})
+    module_ids = [m.id for m in course.modules]
+    db.close()
+    return token, module_ids
+
+async def single_calls(client, headers, module_ids, completed):
+    for module_id in module_ids:
+        response = await client.post(f"/api/courses/modules/{module_id}/progress", json={"completed": completed}, headers=headers)
+        response.raise_for_status()
+
+async def one_batch(client, headers, module_ids, completed):
+    response = await client.post(
+        "/api/courses/progress:batch",
+        json=[{"module_id": module_id, "completed": completed} for module_id in module_ids],
+        headers=headers
+    )
+    response.raise_for_status()
+
+async def measure(label, run, client, headers, module_ids):
+    global statements
+    await run(client, headers, module_ids, False)  # warm up
+    samples = []
+    statements = 0
+    for i in range(args.rounds):
+        start = time.perf_counter()
+        await run(client, headers, module_ids, i % 2 == 0)
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<14} p50={statistics.median(samples):8.2f}ms max={max(samples):8.2f}ms "
+          f"statements/round={statements / args.rounds:6.1f}")
+
+async def main():
+    token, module_ids = seed()
+    headers = {"Authorization": f"Bearer {token}"}
+    print(f"{args.modules} modules per round, {args.rounds} rounds")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await measure(f"{args.modules} x single", single_calls, client, headers, module_ids)
+        await measure("1 x batch", one_batch, client, headers, module_ids)
+
+asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Measure /api/search query latency over a large synthetic forum.
+
+Bulk-loads ``--documents`` forum posts straight into the search index of a
+throwaway SQLite database, then times ranked searches through the search
+service:
+
+    python -m benchmarks.search --documents 1000000 --queries 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--documents", type=int, default=200_000, help="synthetic posts to index")
+parser.add_argument("--queries", type=int, default=200, help="searches to time per query shape")
+parser.add_argument("--seed", type=int, default=7, help="random seed for the synthetic corpus")
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_dir}/bench.db"
+
+from sqlalchemy import text  # noqa: E402
+from app.main import app  # noqa: E402,F401 - registers every model
+from app.db.database import AsyncSessionLocal, engine, Base  # noqa: E402
+from app.services.search import SQLITE, doc_id, search_documents  # noqa: E402
+
+# Deployments create the schema with the migrations; a throwaway database
+# can take it straight from the models
+Base.metadata.create_all(bind=engine)
+
+TOPICS = ["hiv", "prep", "testing", "treatment", "stigma", "clinic", "nairobi", "mombasa",
+          "kisumu", "adherence", "viral", "counselling", "pregnancy", "support", "youth"]
+BATCH_SIZE = 10_000
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summary(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<22} n={len(ms):<5} p50={statistics.median(ms):7.2f}ms "
+          f"p99={percentile(ms, 99):7.2f}ms max={max(ms):7.2f}ms")
+
+def load_corpus(rng, vocabulary):
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        for first in range(1, args.documents + 1, BATCH_SIZE):
+            rows = []
+            for ref_id in range(first, min(first + BATCH_SIZE, args.documents + 1)):
+                words = rng.choices(vocabulary, k=40) + rng.sample(TOPICS, 2)
+                rng.shuffle(words)
+                rows.append({
+                    "doc_id": doc_id("topic", ref_id),
+                    "kind": "topic",
+                    "ref_id": ref_id,
+                    "parent_id": None,
+                    "title": " ".join(words[:6]),
+                    "body": " ".join(words[6:])
+                })
+            connection.execute(text(SQLITE["insert"]), rows)
+    print(f"indexed {args.documents} documents in {time.perf_counter() - start:.1f}s")
+
+async def time_queries(label, make_query):
+    samples = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(args.queries):
+            q = make_query()
+            start = time.perf_counter()
+            await search_documents(db, q, 20)
+            samples.append(time.perf_counter() - start)
+    summary(label, samples)
+
+async def main():
+    rng = random.Random(args.seed)
+    vocabulary = [f"w{n}" for n in range(20_000)]
+    load_corpus(rng, vocabulary)
+    await time_queries("rare term", lambda: rng.choice(vocabulary))
+    await time_queries("two rare terms", lambda: " ".join(rng.sample(vocabulary, 2)))
+    await time_queries("rare + common term", lambda: f"{rng.choice(vocabulary)} {rng.choice(TOPICS)}")
+    await time_queries("common term", lambda: rng.choice(TOPICS))
+
+asyncio.run(main())
@@ -0,0 +1,81 @@
+"""Compare response serialization paths for a 500-module catalog.
+
+Builds the catalog as in-memory ORM objects (no database) and times the
+generic ``jsonable_encoder`` path against pydantic response models rendered
+by ``ORJSONResponse``, and against assembling the cached catalog fragments:
+
+    python -m benchmarks.serialization --courses 10 --modules 50
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--courses", type=int, default=10, help="courses in the catalog")
+parser.add_argument("--modules", type=int, default=50, help="modules per course")
+parser.add_argument("--rounds", type=int, default=200, help="serializations to time per path")
+args = parser.parse_args()
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from typing import List  # noqa: E402
+from app.models import user  # noqa: E402,F401 - registers the User mapper
+from app.models.course import Course, Module  # noqa: E402
+from app.schemas.course import CourseResponse  # noqa: E402
+from app.services.catalog import course_fragment  # noqa: E402
+
+LESSON = "<h2>Lesson</h2><p>" + "Antiretroviral therapy keeps the viral load suppressed. " * 20 + "</p>"
+
+def build_catalog():
+    courses = []
+    for c in range(1, args.courses + 1):
+        course = Course(id=c, title=f"Course {c}", description="About HIV care " * 10,
+                        image="https://example.org/image.jpg", duration="4 weeks",
+                        level="Beginner", created_at=datetime(2026, 1, 1))
+        course.modules = [
+            Module(id=c * 1000 + m, course_id=c, title=f"Module {m}", content=LESSON,
+                   video_url="https://www.youtube.com/embed/x", order=m)
+            for m in range(1, args.modules + 1)
+        ]
+        courses.append(course)
+    return courses
+
+def as_dicts(courses):
+    # What a handler without a response model hands to jsonable_encoder.
+    return [{
+        "id": c.id, "title": c.title, "description": c.description, "image": c.image,
+        "duration": c.duration, "level": c.level, "created_at": c.created_at,
+        "modules": [{"id": m.id, "course_id": m.course_id, "title": m.title, "content": m.content,
+                     "video_url": m.video_url, "order": m.order} for m in c.modules],
+        "enrolled": False
+    } for c in courses]
+
+def time_path(label, render):
+    samples = []
+    size = len(render())
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        render()
+        samples.append(time.perf_counter() - start)
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<34} {size / 1024:7.1f}KiB p50={statistics.median(ms):7.3f}ms max={max(ms):7.3f}ms")
+
+def main():
+    courses = build_catalog()
+    catalog = TypeAdapter(List[CourseResponse])
+    fragments = [course_fragment(c) for c in courses]
+    print(f"{args.courses} courses x {args.modules} modules = {args.courses * args.modules} modules")
+    time_path("jsonable_encoder + JSONResponse", lambda: JSONResponse(jsonable_encoder(as_dicts(courses))).body)
+    time_path("jsonable_encoder + json.dumps", lambda: json.dumps(jsonable_encoder(as_dicts(courses))).encode())
+    time_path("response model + ORJSONResponse", lambda: ORJSONResponse(
+        catalog.dump_python(catalog.validate_python(courses, from_attributes=True), mode="json")
+    ).body)
+    time_path("response model dump_json", lambda: catalog.dump_json(
+        catalog.validate_python(courses, from_attributes=True)
+    ))
+    time_path("cached fragments", lambda: ("[" + ",".join(f + '"enrolled":false}' for f in fragments) + "]").encode())
+
+main()
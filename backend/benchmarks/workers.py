@@ -0,0 +1,154 @@
+"""Measure how catalog throughput scales with the number of server workers.
+
+For each worker count, starts ``serve.py`` against a freshly migrated and
+seeded SQLite database, waits for ``/api/health/ready``, then has
+``--clients`` load-generator processes request ``GET /api/courses`` as the
+demo learner for ``--seconds``. Reports throughput, latency and scaling
+efficiency (throughput per worker against one worker). When the machine has
+enough CPUs, the server and the load generators are pinned to separate ones
+so they do not compete:
+
+    python -m benchmarks.workers --workers 1 --workers 2 --workers 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from app.core.server import available_cpus
+
+CPUS = available_cpus()
+DEFAULT_WORKERS = sorted({1} | {2 ** i for i in range(8) if 2 ** i <= CPUS // 2})
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--workers", type=int, action="append",
+                    help=f"worker count to measure (repeatable); default {DEFAULT_WORKERS}")
+parser.add_argument("--clients", type=int, help="load-generator processes; default the CPUs left over")
+parser.add_argument("--concurrency", type=int, default=64, help="open connections across all clients")
+parser.add_argument("--seconds", type=float, default=10, help="measurement time per worker count")
+parser.add_argument("--min-efficiency", type=float, default=0,
+                    help="exit non-zero when any worker count's efficiency falls below this (e.g. 0.8)")
+args = parser.parse_args()
+
+PATH = "/api/courses/?limit=20"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def prepare_database(env):
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], env=env, check=True, capture_output=True)
+    subprocess.run([sys.executable, "seed_data.py"], env=env, check=True, capture_output=True)
+
+def start_server(env, workers, cpus):
+    port = free_port()
+    server = subprocess.Popen(
+        # Only reads the catalog, so the per-worker caches cannot go stale
+        [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+         "--per-worker-state"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        preexec_fn=(lambda: os.sched_setaffinity(0, cpus)) if cpus else None
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url + "/api/health/ready").status_code == 200:
+                return server, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"{workers} worker(s) did not become ready")
+
+def stop_server(server):
+    server.send_signal(signal.SIGTERM)
+    server.wait(timeout=60)
+
+def generate_load(url, token, concurrency, seconds, cpus):
+    """Run in a client process: request the catalog until the time is up; return latencies and errors."""
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    latencies, errors = [], 0
+
+    async def run():
+        limits = httpx.Limits(max_connections=concurrency)
+        headers = {"Authorization": f"Bearer {token}"}
+        async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=30) as client:
+            deadline = time.perf_counter() + seconds
+
+            async def user():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get(PATH)
+                    latencies.append(time.perf_counter() - start)
+                    if response.status_code >= 400:
+                        errors += 1
+
+            await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    asyncio.run(run())
+    return latencies, errors
+
+def measure(url, token, clients, client_cpus):
+    share = max(1, args.concurrency // clients)
+    jobs = [(url, token, share, args.seconds, client_cpus) for _ in range(clients)]
+    # Warm every worker's caches and connection pool first
+    generate_load(url, token, share, 1, client_cpus)
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.starmap(generate_load, jobs)
+    latencies = sorted(ms * 1000 for result in results for ms in result[0])
+    return {
+        "throughput": len(latencies) / args.seconds,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "errors": sum(result[1] for result in results)
+    }
+
+def main():
+    counts = sorted(set(args.workers or DEFAULT_WORKERS))
+    clients = args.clients or max(1, CPUS - max(counts))
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    pinned = len(cpus) >= max(counts) + clients
+    if not pinned:
+        print(f"warning: {len(cpus) or CPUS} CPUs cannot fit {max(counts)} workers and {clients} clients apart; "
+              f"they will compete and scaling will look worse than it is\n")
+
+    db_dir = tempfile.mkdtemp(prefix="afyahub-bench-")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_dir}/bench.db")
+    prepare_database(env)
+
+    results = {}
+    print(f"{'workers':>7} {'req/s':>9} {'p50':>9} {'p99':>9} {'err':>5} {'speedup':>8} {'efficiency':>10}")
+    for workers in counts:
+        server_cpus = set(cpus[:workers]) if pinned else None
+        client_cpus = set(cpus[max(counts):]) if pinned else None
+        server, url = start_server(env, workers, server_cpus)
+        try:
+            login = httpx.post(url + "/api/auth/login", json={"email": "demo@afyahub.com", "password": "demo123"})
+            token = login.raise_for_status().json()["access_token"]
+            result = results[workers] = measure(url, token, clients, client_cpus)
+        finally:
+            stop_server(server)
+        speedup = result["throughput"] / results[counts[0]]["throughput"] * counts[0]
+        result["efficiency"] = speedup / workers
+        print(f"{workers:>7} {result['throughput']:>9.1f} {result['p50']:>7.2f}ms {result['p99']:>7.2f}ms "
+              f"{result['errors']:>5} {speedup:>7.2f}x {result['efficiency']:>10.0%}")
+
+    below = [w for w, r in results.items() if r["efficiency"] < args.min_efficiency or r["errors"]]
+    if below:
+        print(f"\nbelow {args.min_efficiency:.0%} efficiency or with errors at {below} worker(s)")
+        return 1
+    return 0
+
+sys.exit(main())
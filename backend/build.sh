@@ -1,3 +1,4 @@
 #!/bin/bash
 pip install -r requirements.txt
+alembic upgrade head
 python seed_data.py
\ No newline at end of file
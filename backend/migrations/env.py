@@ -0,0 +1,45 @@
+from logging.config import fileConfig
+from alembic import context
+from app.core.config import settings
+from app.db.database import Base, create_db_engine, normalize_database_url
+from app.models import user, course, forum, resource, stats, sync  # noqa: F401 - register tables
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def include_object(object, name, type_, reflected, compare_to):
+    # search_index is created with raw DDL (see app/models/search.py), so keep
+    # autogenerate from proposing to drop it or its FTS5 shadow tables.
+    return not (type_ == "table" and reflected and name.startswith("search_index"))
+
+def run_migrations_offline():
+    context.configure(
+        url=normalize_database_url(settings.DATABASE_URL),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    engine = create_db_engine(settings.DATABASE_URL)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,117 @@
+"""Baseline schema
+
+Databases created by ``Base.metadata.create_all`` before migrations existed
+already have these tables, so each one is only created when missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def _create_table(name, *columns):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+        op.create_index(f"ix_{name}_id", name, ["id"])
+
+def upgrade():
+    _create_table(
+        "users",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String, nullable=False),
+        sa.Column("email", sa.String, nullable=False),
+        sa.Column("hashed_password", sa.String, nullable=False),
+        sa.Column("role", sa.String),
+        sa.Column("phone", sa.String),
+        sa.Column("bio", sa.String),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("created_at", sa.DateTime),
+    )
+    indexes = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("users")}
+    if "ix_users_email" not in indexes:
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    _create_table(
+        "courses",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("title", sa.String, nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("image", sa.String),
+        sa.Column("duration", sa.String),
+        sa.Column("level", sa.String),
+        sa.Column("created_at", sa.DateTime),
+    )
+    _create_table(
+        "modules",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("course_id", sa.Integer, sa.ForeignKey("courses.id")),
+        sa.Column("title", sa.String, nullable=False),
+        sa.Column("content", sa.Text),
+        sa.Column("video_url", sa.String),
+        sa.Column("order", sa.Integer),
+    )
+    _create_table(
+        "enrollments",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id")),
+        sa.Column("course_id", sa.Integer, sa.ForeignKey("courses.id")),
+        sa.Column("enrolled_at", sa.DateTime),
+    )
+    _create_table(
+        "progress",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id")),
+        sa.Column("module_id", sa.Integer, sa.ForeignKey("modules.id")),
+        sa.Column("completed", sa.Integer),
+        sa.Column("completed_at", sa.DateTime),
+    )
+    _create_table(
+        "forum_topics",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id")),
+        sa.Column("title", sa.String, nullable=False),
+        sa.Column("content", sa.Text),
+        sa.Column("category", sa.String),
+        sa.Column("created_at", sa.DateTime),
+    )
+    _create_table(
+        "forum_comments",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("topic_id", sa.Integer, sa.ForeignKey("forum_topics.id")),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id")),
+        sa.Column("content", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+    )
+    _create_table(
+        "resources",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String, nullable=False),
+        sa.Column("type", sa.String, nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("address", sa.String),
+        sa.Column("phone", sa.String),
+        sa.Column("email", sa.String),
+        sa.Column("website", sa.String),
+        sa.Column("latitude", sa.Float),
+        sa.Column("longitude", sa.Float),
+        sa.Column("hours", sa.String),
+        sa.Column("services", sa.Text),
+    )
+    if not sa.inspect(op.get_bind()).has_table("user_course_progress"):
+        op.create_table(
+            "user_course_progress",
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("course_id", sa.Integer, sa.ForeignKey("courses.id"), primary_key=True),
+            sa.Column("completed_modules", sa.Integer, nullable=False),
+            sa.Column("total_modules", sa.Integer, nullable=False),
+        )
+
+def downgrade():
+    for name in ("user_course_progress", "resources", "forum_comments", "forum_topics",
+                 "progress", "enrollments", "modules", "courses", "users"):
+        op.drop_table(name)
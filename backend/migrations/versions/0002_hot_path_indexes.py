@@ -0,0 +1,57 @@
+"""Indexes and uniqueness for hot lookups
+
+Collapses duplicate enrollments and progress rows (keeping the oldest row,
+and keeping a module completed if any duplicate was) before adding the
+unique indexes that the enroll and progress upserts rely on. Run
+``python rebuild_progress.py`` afterwards if duplicates were removed.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("uq_enrollments_user_id_course_id", "enrollments", ["user_id", "course_id"], True),
+    ("uq_progress_user_id_module_id", "progress", ["user_id", "module_id"], True),
+    ("ix_progress_module_id", "progress", ["module_id"], False),
+    ("ix_modules_course_id_order", "modules", ["course_id", "order"], False),
+    ("ix_forum_topics_created_at_id", "forum_topics", ["created_at", "id"], False),
+    ("ix_forum_comments_topic_id", "forum_comments", ["topic_id"], False),
+    ("ix_resources_type_id", "resources", ["type", "id"], False),
+]
+
+def _existing_indexes(table):
+    return {i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+
+def upgrade():
+    op.execute("""
+        UPDATE progress SET completed = (
+            SELECT MAX(p2.completed) FROM progress p2
+            WHERE p2.user_id = progress.user_id AND p2.module_id = progress.module_id
+        )
+        WHERE user_id IS NOT NULL AND module_id IS NOT NULL
+    """)
+    op.execute("""
+        DELETE FROM progress WHERE user_id IS NOT NULL AND module_id IS NOT NULL AND id NOT IN (
+            SELECT MIN(id) FROM progress GROUP BY user_id, module_id
+        )
+    """)
+    op.execute("""
+        DELETE FROM enrollments WHERE user_id IS NOT NULL AND course_id IS NOT NULL AND id NOT IN (
+            SELECT MIN(id) FROM enrollments GROUP BY user_id, course_id
+        )
+    """)
+    for name, table, columns, unique in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns, unique=unique)
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,49 @@
+"""Admin dashboard rollup tables
+
+Creates the daily and per-course rollups read by ``/api/admin/stats/activity``.
+Run ``python rebuild_progress.py`` afterwards to backfill them from existing
+enrollments and progress.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def _counter(name):
+    return sa.Column(name, sa.Integer, nullable=False, server_default="0")
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("daily_stats"):
+        op.create_table(
+            "daily_stats",
+            sa.Column("day", sa.Date, primary_key=True),
+            _counter("enrollments"),
+            _counter("module_completions"),
+            _counter("course_completions"),
+            _counter("active_learners"),
+        )
+    if not inspector.has_table("course_stats"):
+        op.create_table(
+            "course_stats",
+            sa.Column("course_id", sa.Integer, sa.ForeignKey("courses.id"), primary_key=True),
+            _counter("enrollments"),
+            _counter("completions"),
+        )
+    if not inspector.has_table("learner_activity"):
+        op.create_table(
+            "learner_activity",
+            sa.Column("day", sa.Date, primary_key=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), primary_key=True),
+        )
+
+def downgrade():
+    for name in ("learner_activity", "course_stats", "daily_stats"):
+        op.drop_table(name)
@@ -0,0 +1,37 @@
+"""Full-text search index
+
+Creates ``search_index`` as an FTS5 virtual table on SQLite and as a table
+with a generated, GIN-indexed ``tsvector`` column on Postgres. Run
+``python rebuild_search.py`` afterwards to index existing content.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, parent_id UNINDEXED, title, body, "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        )
+    else:
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS search_index ("
+            "doc_id BIGINT PRIMARY KEY, kind VARCHAR NOT NULL, ref_id INTEGER NOT NULL, parent_id INTEGER, "
+            "title TEXT NOT NULL DEFAULT '', body TEXT NOT NULL DEFAULT '', "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', title), 'A') || "
+            "setweight(to_tsvector('english', body), 'B')) STORED)"
+        )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_search_index_document ON search_index USING GIN (document)")
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,28 @@
+"""Index resource coordinates for nearest-resource lookups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_resources_latitude_longitude", ["latitude", "longitude"]),
+    ("ix_resources_type_latitude_longitude", ["type", "latitude", "longitude"]),
+]
+
+def upgrade():
+    indexes = {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("resources")}
+    for name, columns in INDEXES:
+        if name not in indexes:
+            op.create_index(name, "resources", columns)
+
+def downgrade():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="resources")
@@ -0,0 +1,54 @@
+"""Change tracking for offline delta sync
+
+Adds ``updated_at`` to the rows served by ``/api/sync`` and the
+``tombstones`` table that records deletions. Existing rows are stamped
+with the migration time.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+TRACKED = [
+    ("courses", "ix_courses_updated_at", ["updated_at"]),
+    ("modules", "ix_modules_updated_at", ["updated_at"]),
+    ("forum_topics", "ix_forum_topics_updated_at", ["updated_at"]),
+    ("progress", "ix_progress_user_id_updated_at", ["user_id", "updated_at"]),
+    ("enrollments", "ix_enrollments_user_id_updated_at", ["user_id", "updated_at"]),
+]
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    now = datetime.utcnow()
+    for table, index, columns in TRACKED:
+        if "updated_at" not in {c["name"] for c in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("updated_at", sa.DateTime))
+        op.execute(
+            sa.text(f"UPDATE {table} SET updated_at = :now WHERE updated_at IS NULL").bindparams(now=now)
+        )
+        if index not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(index, table, columns)
+    if not inspector.has_table("tombstones"):
+        op.create_table(
+            "tombstones",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("kind", sa.String, nullable=False),
+            sa.Column("ref_id", sa.Integer, nullable=False),
+            sa.Column("deleted_at", sa.DateTime, nullable=False),
+        )
+        op.create_index("ix_tombstones_deleted_at", "tombstones", ["deleted_at"])
+
+def downgrade():
+    op.drop_table("tombstones")
+    for table, index, _ in TRACKED:
+        op.drop_index(index, table_name=table)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+import sys
+from app.db.database import AsyncSessionLocal
+from app.models import user, forum, resource, stats  # noqa: F401 - register tables
+from app.services.progress import find_progress_drift, rebuild_course_progress
+from app.services.stats import rebuild_rollups
+
+parser = argparse.ArgumentParser(description="Recompute the user_course_progress counters and dashboard rollups from raw rows.")
+parser.add_argument("--check", action="store_true", help="only report counters that disagree with raw rows")
+args = parser.parse_args()
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        if args.check:
+            drift = await find_progress_drift(db)
+            for user_id, course_id, stored, expected in drift:
+                print(f"user {user_id} course {course_id}: stored {stored}, expected {expected}")
+            print(f"{len(drift)} counters out of sync")
+            return 1 if drift else 0
+        
+        rows = await rebuild_course_progress(db)
+        days = await rebuild_rollups(db)
+        await db.commit()
+        print(f"Rebuilt {rows} course progress counters and {days} days of dashboard rollups")
+        return 0
+
+sys.exit(asyncio.run(main()))
@@ -0,0 +1,12 @@
+import asyncio
+from app.db.database import AsyncSessionLocal
+from app.models import user, course, forum, resource, stats  # noqa: F401 - register tables
+from app.services.search import rebuild_search_index
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        documents = await rebuild_search_index(db)
+        await db.commit()
+        print(f"Indexed {documents} search documents")
+
+asyncio.run(main())
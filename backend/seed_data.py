@@ -1,111 +1,66 @@
-from app.db.database import SessionLocal, engine, Base
-from app.models.user import User
-from app.models.course import Course, Module
-from app.models.forum import ForumTopic, ForumComment
-from app.core.security import get_password_hash
+"""Seed the demo accounts, courses and resources, plus synthetic data on request.
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+Only missing rows are inserted, in one transaction, so this is safe to run
+on every deploy. Apply the migrations first:
 
-db = SessionLocal()
+    alembic upgrade head
+    python seed_data.py               # demo data
+    python seed_data.py --scale 10    # plus 10,000 learners, 50,000 topics, ...
+"""
+import argparse
+import asyncio
+import random
+import time
+from app.db.database import AsyncSessionLocal, engine
+from app.services.progress import rebuild_course_progress
+from app.services.search import rebuild_search_index
+from app.services.seed import SCALE_UNIT, SYNTHETIC_PASSWORD, scaled, seed_demo, seed_synthetic, synthetic_email
+from app.services.stats import rebuild_rollups
 
-# Create admin user
-admin = db.query(User).filter(User.email == "admin@afyahub.com").first()
-if not admin:
-    admin = User(
-        name="Admin User",
-        email="admin@afyahub.com",
-        hashed_password=get_password_hash("admin123"),
-        role="admin"
-    )
-    db.add(admin)
-    print("Admin user created")
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--scale", type=float, default=0,
+                    help=f"synthetic data to add, in units of {SCALE_UNIT['users']} learners, "
+                         f"{SCALE_UNIT['courses']} courses, {SCALE_UNIT['topics']} topics and "
+                         f"{SCALE_UNIT['resources']} resources")
+parser.add_argument("--seed", type=int, default=7, help="random seed for synthetic data")
+args = parser.parse_args()
 
-# Create demo user
-demo = db.query(User).filter(User.email == "demo@afyahub.com").first()
-if not demo:
-    demo = User(
-        name="Demo User",
-        email="demo@afyahub.com",
-        hashed_password=get_password_hash("demo123"),
-        role="learner"
-    )
-    db.add(demo)
-    print("Demo user created")
+async def rebuild(search: bool, counters: bool):
+    async with AsyncSessionLocal() as db:
+        if search:
+            print(f"Search index built with {await rebuild_search_index(db)} documents")
+        if counters:
+            await rebuild_course_progress(db)
+            await rebuild_rollups(db)
+            print("Progress counters and dashboard rollups rebuilt")
+        await db.commit()
 
-db.commit()
+def report(label: str, inserted: dict):
+    added = ", ".join(f"{count} {name}" for name, count in inserted.items() if count)
+    print(f"{label}: {added or 'nothing to add'}")
 
-# Create sample courses
-if db.query(Course).count() == 0:
-    courses_data = [
-        {
-            "title": "Understanding HIV/AIDS",
-            "description": "Comprehensive introduction to HIV/AIDS with video lessons, infographics, and interactive quizzes covering transmission, prevention, and treatment basics.",
-            "image": "https://images.unsplash.com/photo-1576091160399-112ba8d25d1d",
-            "duration": "4 weeks",
-            "level": "Beginner"
-        },
-        {
-            "title": "Prevention Strategies",
-            "description": "Learn effective prevention methods and risk reduction strategies through video lessons, infographics, and interactive quizzes.",
-            "image": "https://images.unsplash.com/photo-1584515933487-779824d29309",
-            "duration": "3 weeks",
-            "level": "Beginner"
-        },
-        {
-            "title": "Living with HIV",
-            "description": "Support and guidance for individuals living with HIV/AIDS featuring video lessons, infographics, and interactive quizzes.",
-            "image": "https://images.unsplash.com/photo-1559757175-5700dde675bc",
-            "duration": "6 weeks",
-            "level": "Intermediate"
-        }
-    ]
-    
-    for course_data in courses_data:
-        course = Course(**course_data)
-        db.add(course)
-        db.commit()
-        db.refresh(course)
-        
-        # Add modules to first course
-        if course.title == "Understanding HIV/AIDS":
-            modules = [
-                {
-                    "title": "What is HIV/AIDS?", 
-                    "order": 1, 
-                    "content": "<h2>Introduction to HIV/AIDS</h2><p>HIV (Human Immunodeficiency Virus) is a virus that attacks the body's immune system. If left untreated, HIV can lead to AIDS (Acquired Immunodeficiency Syndrome).</p><h3>Key Points:</h3><ul><li>HIV weakens the immune system</li><li>Early detection is crucial</li><li>Treatment is available and effective</li></ul>",
-                    "video_url": "https://www.youtube.com/embed/0d_2nk8LD-M"
-                },
-                {
-                    "title": "How HIV is Transmitted", 
-                    "order": 2, 
-                    "content": "<h2>Transmission Methods</h2><p>HIV is transmitted through specific body fluids including blood, semen, vaginal fluids, and breast milk.</p><h3>Common Transmission Routes:</h3><ul><li>Unprotected sexual contact</li><li>Sharing needles</li><li>Mother to child during pregnancy/birth</li></ul>",
-                    "video_url": "https://www.youtube.com/embed/GR5K756WUw0"
-                },
-                {
-                    "title": "HIV Testing", 
-                    "order": 3, 
-                    "content": "<h2>Getting Tested</h2><p>Regular testing is crucial for early detection and treatment. HIV tests are confidential, quick, and widely available.</p><h3>Testing Options:</h3><ul><li>Rapid tests (results in 20 minutes)</li><li>Laboratory tests</li><li>Home testing kits</li></ul>",
-                    "video_url": "https://www.youtube.com/embed/NeEF_JKF8mI"
-                },
-                {
-                    "title": "Treatment Options", 
-                    "order": 4, 
-                    "content": "<h2>Antiretroviral Therapy (ART)</h2><p>Modern treatments can help people with HIV live long, healthy lives. ART suppresses the virus and prevents transmission.</p><h3>Benefits of Treatment:</h3><ul><li>Reduces viral load</li><li>Strengthens immune system</li><li>Prevents transmission (U=U)</li></ul>",
-                    "video_url": "https://www.youtube.com/embed/libKVRa01L8"
-                },
-            ]
-            
-            for module_data in modules:
-                module = Module(course_id=course.id, **module_data)
-                db.add(module)
-        
-        print(f"Course created: {course.title}")
+def main():
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        inserted = seed_demo(connection)
+        report("Demo data", inserted)
+        if args.scale > 0:
+            synthetic = seed_synthetic(connection, random.Random(args.seed), **scaled(args.scale))["inserted"]
+            report("Synthetic data", synthetic)
+            for name, count in synthetic.items():
+                inserted[name] = inserted.get(name, 0) + count
 
-db.commit()
-db.close()
+    # Rows inserted in bulk bypass the write paths that keep these up to date
+    search = any(inserted.get(name) for name in ("courses", "modules", "topics", "comments"))
+    counters = any(inserted.get(name) for name in ("enrollments", "progress"))
+    if search or counters:
+        asyncio.run(rebuild(search, counters))
 
-print("\nDatabase seeded successfully!")
-print("\nDefault credentials:")
-print("Admin: admin@afyahub.com / admin123")
-print("Demo: demo@afyahub.com / demo123")
+    print(f"\nDatabase seeded in {time.perf_counter() - start:.1f}s")
+    print("\nDefault credentials:")
+    print("Admin: admin@afyahub.com / admin123")
+    print("Demo: demo@afyahub.com / demo123")
+    if args.scale > 0:
+        print(f"Synthetic learners: {synthetic_email(0)} ... / {SYNTHETIC_PASSWORD}")
+
+main()
@@ -0,0 +1,37 @@
+"""Run the API in production with several worker processes.
+
+On SIGTERM every worker stops accepting connections, ends event streams and
+gives in-flight requests up to ``--graceful-shutdown`` seconds to finish.
+Apply the migrations and seed first; the workers never touch the schema:
+
+    python serve.py                  # WEB_CONCURRENCY workers, else one per CPU
+    python serve.py --workers 4 --port 8000
+
+Several workers need CATALOG_CACHE_URL and FORUM_EVENTS_URL (and
+REPLICA_STICKY_URL with a replica) pointing at Redis. Without them the
+automatic count is one worker and an explicit one is refused.
+"""
+import argparse
+import sys
+from app.core.config import settings
+from app.core.server import serve, worker_count
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--host", default="0.0.0.0", help="interface to listen on")
+parser.add_argument("--port", type=int, default=settings.PORT, help="port to listen on (PORT)")
+parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY,
+                    help="worker processes (WEB_CONCURRENCY); 0 for one per available CPU")
+parser.add_argument("--graceful-shutdown", type=int, default=settings.GRACEFUL_SHUTDOWN_SECONDS,
+                    help="seconds in-flight requests get to finish after SIGTERM (GRACEFUL_SHUTDOWN_SECONDS)")
+parser.add_argument("--per-worker-state", action="store_true",
+                    help="run several workers even though caches and forum events stay inside each one")
+
+# Workers are spawned and re-import this file, so only the parent parses
+# arguments and starts the server
+if __name__ == "__main__":
+    args = parser.parse_args()
+    try:
+        workers = worker_count(args.workers, args.per_worker_state)
+    except ValueError as e:
+        parser.error(f"{e}, or pass --per-worker-state")
+    sys.exit(serve("app.main:app", args.host, args.port, workers, args.graceful_shutdown))
@@ -7,6 +7,11 @@ if exist venv\Scripts\activate.bat (
     call venv\Scripts\activate.bat
 )
 
+REM Apply database migrations
+echo Migrating database...
+alembic upgrade head
+echo.
+
 REM Run seed data
 echo Seeding database...
 python seed_data.py
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import tempfile
+
+# Settings and engines are created on import, so the database has to be
+# chosen before the app is imported
+DB_DIR = tempfile.mkdtemp(prefix="afyahub-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_DIR}/primary.db"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from contextlib import contextmanager  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.api.dependencies import user_cache  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.db.database import Base, async_engine, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.catalog import catalog_cache  # noqa: E402
+
+@pytest.fixture(autouse=True)
+def database():
+    """A fresh schema for every test, taken straight from the models."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    user_cache.clear()
+    # Catalog entries cached by an earlier test become unreachable
+    asyncio.run(catalog_cache.bump())
+    yield engine
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a new event loop, closing the pooled connections it opened."""
+    def run(coro):
+        async def scenario():
+            try:
+                return await coro
+            finally:
+                await async_engine.dispose()
+        return asyncio.run(scenario())
+    return run
+
+@pytest.fixture
+def api():
+    def client():
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return client
+
+@pytest.fixture
+def make_user():
+    """Insert a user and return ``(id, Authorization header)`` for them."""
+    def make_user(email: str, role: str = "learner", password: str = "password"):
+        with Session(engine) as session:
+            user = User(name=email.split("@")[0], email=email, role=role, hashed_password=get_password_hash(password))
+            session.add(user)
+            session.commit()
+            token = create_access_token({"sub": user.email, "uid": user.id})
+            return user.id, {"Authorization": f"Bearer {token}"}
+    return make_user
+
+@contextmanager
+def count_statements(target=None):
+    """Count the SQL statements ``target`` (the async engine by default) executes inside the block."""
+    target = target if target is not None else async_engine.sync_engine
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", before_cursor_execute)
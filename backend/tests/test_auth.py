@@ -0,0 +1,44 @@
+def test_deactivated_user_is_rejected_even_with_a_cached_session(run, api, make_user):
+    user_id, headers = make_user("learner@example.com")
+    _, admin = make_user("admin@example.com", role="admin")
+
+    async def scenario():
+        async with api() as client:
+            # Puts the learner in the user cache
+            assert (await client.get("/api/users/profile", headers=headers)).status_code == 200
+            response = await client.put(f"/api/admin/users/{user_id}", json={"is_active": False}, headers=admin)
+            assert response.status_code == 200
+            assert (await client.get("/api/users/profile", headers=headers)).status_code == 403
+            login = await client.post("/api/auth/login", json={"email": "learner@example.com", "password": "password"})
+            assert login.status_code == 403
+
+            await client.put(f"/api/admin/users/{user_id}", json={"is_active": True}, headers=admin)
+            assert (await client.get("/api/users/profile", headers=headers)).status_code == 200
+
+    run(scenario())
+
+def test_demoted_admin_loses_admin_routes_at_once(run, api, make_user):
+    _, admin = make_user("admin@example.com", role="admin")
+    other_id, other = make_user("second-admin@example.com", role="admin")
+
+    async def scenario():
+        async with api() as client:
+            assert (await client.get("/api/admin/users", headers=other)).status_code == 200
+            await client.put(f"/api/admin/users/{other_id}", json={"role": "learner"}, headers=admin)
+            assert (await client.get("/api/admin/users", headers=other)).status_code == 403
+
+    run(scenario())
+
+def test_null_fields_leave_the_user_unchanged(run, api, make_user):
+    user_id, headers = make_user("learner@example.com")
+    _, admin = make_user("admin@example.com", role="admin")
+
+    async def scenario():
+        async with api() as client:
+            response = await client.put(f"/api/admin/users/{user_id}", json={"role": None, "is_active": None},
+                                        headers=admin)
+            assert response.status_code == 200
+            assert response.json()["role"] == "learner"
+            assert (await client.get("/api/users/profile", headers=headers)).status_code == 200
+
+    run(scenario())
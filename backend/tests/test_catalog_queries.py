@@ -0,0 +1,58 @@
+from sqlalchemy.orm import Session
+from app.db.database import AsyncSessionLocal, engine
+from app.models.course import Course, Enrollment, Module
+from app.services.catalog import build_catalog_page, catalog_cache
+from conftest import count_statements
+
+MODULES_PER_COURSE = 4
+
+def add_courses(count: int, enroll_user_id: int = None):
+    with Session(engine) as session:
+        for i in range(count):
+            course = Course(title=f"Course {i}", description="About it", level="Beginner",
+                            modules=[Module(title=f"Module {m}", content="Text", order=m)
+                                     for m in range(MODULES_PER_COURSE)])
+            session.add(course)
+            session.flush()
+            if enroll_user_id is not None and i % 2 == 0:
+                session.add(Enrollment(user_id=enroll_user_id, course_id=course.id))
+        session.commit()
+
+def test_catalog_page_is_built_in_two_queries_for_any_size(run):
+    async def build(expected):
+        async with AsyncSessionLocal() as db:
+            with count_statements() as statements:
+                page = await build_catalog_page(db, None, 50)
+        assert len(page["ids"]) == expected
+        return len(statements)
+
+    add_courses(1)
+    one = run(build(1))
+    add_courses(29)
+    many = run(build(30))
+    # One for the courses, one IN query for all of their modules
+    assert one == many == 2
+
+def test_course_list_endpoint_issues_the_same_queries_for_1_and_n_courses(run, api, make_user):
+    user_id, headers = make_user("learner@example.com")
+
+    async def request_catalog(expected):
+        async with api() as client:
+            # Load the caller into the user cache, then drop the cached catalog
+            assert (await client.get("/api/users/profile", headers=headers)).status_code == 200
+            await catalog_cache.bump()
+            with count_statements() as cold:
+                response = await client.get("/api/courses/?limit=50", headers=headers)
+            assert response.status_code == 200
+            assert len(response.json()) == expected
+            with count_statements() as warm:
+                assert (await client.get("/api/courses/?limit=50", headers=headers)).status_code == 200
+        return len(cold), len(warm)
+
+    add_courses(1, user_id)
+    one = run(request_catalog(1))
+    add_courses(29, user_id)
+    many = run(request_catalog(30))
+    # Courses, their modules and the caller's enrollments; a cached page
+    # only needs the enrollments
+    assert one == many == (3, 1)
@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+# The default budget of benchmarks/cold_start.py, measured the same way
+FIRST_RESPONSE_BUDGET_MS = 2500
+
+WORKER = """
+import time
+started = time.perf_counter()
+import asyncio, json, sqlite3
+connections = []
+_connect = sqlite3.connect
+def connect(*args, **kwargs):
+    connections.append(args[0] if args else kwargs.get("database"))
+    return _connect(*args, **kwargs)
+sqlite3.connect = connect
+
+import httpx
+from app.main import app
+
+async def start_and_serve():
+    async with app.router.lifespan_context(app):
+        opened_on_startup = len(connections)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            (await client.get("/api/health")).raise_for_status()
+        return opened_on_startup
+
+opened_on_startup = asyncio.run(start_and_serve())
+print(json.dumps({
+    "first_response_ms": (time.perf_counter() - started) * 1000,
+    "opened_on_startup": opened_on_startup,
+    "opened": len(connections)
+}))
+"""
+
+def test_worker_starts_and_answers_without_touching_the_database(tmp_path):
+    db_path = tmp_path / "untouched.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    env.pop("DATABASE_REPLICA_URL", None)
+    output = subprocess.run([sys.executable, "-c", WORKER], cwd=BACKEND, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["opened_on_startup"] == 0
+    assert result["opened"] == 0
+    assert not db_path.exists()
+    assert result["first_response_ms"] < FIRST_RESPONSE_BUDGET_MS
@@ -0,0 +1,43 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import engine
+from app.models.course import Course, Module
+
+def add_course(modules: int, content: str = "") -> int:
+    with Session(engine) as session:
+        course = Course(title="Course", description="About it",
+                        modules=[Module(title=f"Module {m}", content=content, order=m) for m in range(modules)])
+        session.add(course)
+        session.commit()
+        return course.id
+
+def revalidate(run, api, headers, url, accept_encoding):
+    """Fetch ``url``, then revalidate with the ETag it returned; return both responses."""
+    async def scenario():
+        async with api() as client:
+            first = await client.get(url, headers={**headers, "Accept-Encoding": accept_encoding})
+            second = await client.get(url, headers={
+                **headers, "Accept-Encoding": accept_encoding, "If-None-Match": first.headers["etag"]
+            })
+            return first, second
+    return run(scenario())
+
+def test_small_body_keeps_a_plain_etag_on_304(run, api, make_user):
+    _, headers = make_user("learner@example.com")
+    course_id = add_course(0)
+    first, second = revalidate(run, api, headers, f"/api/courses/{course_id}", "gzip, br")
+    assert len(first.content) < settings.COMPRESSION_MIN_SIZE
+    assert "content-encoding" not in first.headers
+    assert not first.headers["etag"].endswith(('-gzip"', '-br"'))
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+
+def test_encoded_body_gets_the_same_etag_on_200_and_304(run, api, make_user):
+    _, headers = make_user("learner@example.com")
+    course_id = add_course(20, "Lesson text " * 50)
+    for encoding in ("gzip", "br"):
+        first, second = revalidate(run, api, headers, f"/api/courses/{course_id}", encoding)
+        assert first.headers["content-encoding"] == encoding
+        assert first.headers["etag"].endswith(f'-{encoding}"')
+        assert second.status_code == 304
+        assert second.headers["etag"] == first.headers["etag"]
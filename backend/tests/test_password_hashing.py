@@ -0,0 +1,33 @@
+import asyncio
+import threading
+import pytest
+from app.core.security import HashingBusyError, PasswordHasher
+
+def test_cancelled_callers_give_their_queue_slots_back(run):
+    hasher = PasswordHasher(workers=1, max_queue=2)
+    release = threading.Event()
+
+    async def scenario():
+        # Occupies the only worker, so the next two jobs wait in the queue
+        blocker = asyncio.ensure_future(hasher.run(release.wait))
+        while hasher.in_flight == 0:
+            await asyncio.sleep(0.001)
+        waiting = [asyncio.ensure_future(hasher.run(str, i)) for i in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HashingBusyError):
+            await hasher.run(str, "over the limit")
+
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
+        assert hasher.stats()["queued"] == 0
+
+        release.set()
+        await blocker
+        assert await hasher.run(str, 3) == "3"
+        assert hasher.stats()["queued"] == 0
+
+    try:
+        run(scenario())
+    finally:
+        release.set()
@@ -0,0 +1,47 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.core.profiler import PROFILE_HEADER, PROFILE_ID_HEADER
+from app.db.database import engine
+from app.models.user import User
+
+def set_role(user_id: int, role: str):
+    with Session(engine) as session:
+        session.execute(update(User).where(User.id == user_id).values(role=role))
+        session.commit()
+
+def get_profile_token(run, api, headers) -> str:
+    async def request():
+        async with api() as client:
+            response = await client.post("/api/admin/profile/token", headers=headers)
+            assert response.status_code == 200
+            return response.json()["token"]
+    return run(request())
+
+def test_profile_token_is_not_an_access_token(run, api, make_user):
+    _, headers = make_user("admin@example.com", role="admin")
+    token = get_profile_token(run, api, headers)
+
+    async def scenario():
+        async with api() as client:
+            for path in ("/api/admin/users", "/api/users/profile"):
+                response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 401
+    run(scenario())
+
+def test_profile_token_profiles_requests_only_while_its_subject_is_an_admin(run, api, make_user):
+    admin_id, headers = make_user("admin@example.com", role="admin")
+    token = get_profile_token(run, api, headers)
+
+    async def profiled():
+        async with api() as client:
+            response = await client.get("/api/health", headers={PROFILE_HEADER: token})
+            assert response.status_code == 200
+            profile_id = response.headers.get(PROFILE_ID_HEADER)
+            if profile_id is not None:
+                profile = await client.get(f"/api/admin/profiles/{profile_id}", headers=headers)
+                assert profile.status_code == 200
+            return profile_id is not None
+
+    assert run(profiled())
+    set_role(admin_id, "learner")
+    assert not run(profiled())
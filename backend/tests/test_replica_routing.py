@@ -0,0 +1,76 @@
+import asyncio
+import sqlite3
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+from app.core.cache import MemoryCacheBackend
+from app.db import database
+from app.models.course import Course, Enrollment
+from conftest import DB_DIR
+
+STICKY_SECONDS = 0.5
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Route reads to a second SQLite file copied from the primary now, which never catches up."""
+    source, copy = sqlite3.connect(f"{DB_DIR}/primary.db"), sqlite3.connect(f"{DB_DIR}/replica.db")
+    source.backup(copy)
+    source.close()
+    copy.close()
+    read_engine = database.create_async_db_engine(f"sqlite:///{DB_DIR}/replica.db")
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(database, "AsyncReadSessionLocal",
+                        async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False))
+    monkeypatch.setattr(database, "recent_writers", MemoryCacheBackend(100, STICKY_SECONDS))
+    return read_engine
+
+def add_course() -> int:
+    with Session(database.engine) as session:
+        course = Course(title="Course", description="About it", level="Beginner")
+        session.add(course)
+        session.commit()
+        return course.id
+
+def enroll(user_id: int, course_id: int):
+    with Session(database.engine) as session:
+        session.add(Enrollment(user_id=user_id, course_id=course_id))
+        session.commit()
+
+def test_reads_go_to_the_replica(run, api, make_user, replica):
+    user_id, headers = make_user("reader@example.com")
+    enroll(user_id, add_course())
+
+    async def scenario():
+        try:
+            async with api() as client:
+                response = await client.get("/api/courses/user/progress", headers=headers)
+                assert response.status_code == 200
+                # Written to the primary only
+                assert response.json()["enrolledCourses"] == 0
+        finally:
+            await replica.dispose()
+    run(scenario())
+
+def test_writers_read_from_the_primary_until_the_pin_expires(run, api, make_user, replica):
+    _, writer = make_user("writer@example.com")
+    reader_id, reader = make_user("reader@example.com")
+    course_id = add_course()
+    enroll(reader_id, course_id)
+
+    async def enrolled_courses(client, headers):
+        response = await client.get("/api/courses/user/progress", headers=headers)
+        assert response.status_code == 200
+        return response.json()["enrolledCourses"]
+
+    async def scenario():
+        try:
+            async with api() as client:
+                assert (await client.post(f"/api/courses/{course_id}/enroll", headers=writer)).status_code == 200
+                assert await enrolled_courses(client, writer) == 1
+                # Only the caller that wrote is pinned
+                assert await enrolled_courses(client, reader) == 0
+                await asyncio.sleep(STICKY_SECONDS + 0.1)
+                assert await enrolled_courses(client, writer) == 0
+        finally:
+            await replica.dispose()
+    run(scenario())
@@ -0,0 +1,9 @@
+def test_radius_without_near_is_rejected(run, api):
+    async def scenario():
+        async with api() as client:
+            response = await client.get("/api/resources/?radius_km=5")
+            assert response.status_code == 400
+            assert response.json()["detail"] == "radius_km requires near"
+            assert (await client.get("/api/resources/?near=-1.29,36.82&radius_km=5")).status_code == 200
+
+    run(scenario())
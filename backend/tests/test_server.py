@@ -0,0 +1,35 @@
+import pytest
+from app.core import server
+from app.core.config import settings
+
+REDIS = "redis://localhost:6379/0"
+
+@pytest.fixture
+def cpus(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 4)
+
+def share_state(monkeypatch, replica: bool = False):
+    monkeypatch.setattr(settings, "CATALOG_CACHE_URL", REDIS)
+    monkeypatch.setattr(settings, "FORUM_EVENTS_URL", REDIS)
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", "sqlite:///replica.db" if replica else "")
+
+def test_one_worker_until_state_is_shared(monkeypatch, cpus):
+    assert server.unshared_state() == ["CATALOG_CACHE_URL", "FORUM_EVENTS_URL"]
+    assert server.worker_count() == 1
+    assert server.worker_count(1) == 1
+    with pytest.raises(ValueError, match="CATALOG_CACHE_URL"):
+        server.worker_count(2)
+    assert server.worker_count(2, per_worker_state=True) == 2
+    assert server.worker_count(per_worker_state=True) == 4
+
+    share_state(monkeypatch)
+    assert server.worker_count() == 4
+    assert server.worker_count(2) == 2
+
+def test_a_replica_also_needs_shared_write_pins(monkeypatch, cpus):
+    share_state(monkeypatch, replica=True)
+    assert server.unshared_state() == ["REPLICA_STICKY_URL"]
+    assert server.worker_count() == 1
+
+    monkeypatch.setattr(settings, "REPLICA_STICKY_URL", REDIS)
+    assert server.worker_count() == 4
@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.db.database import AsyncSessionLocal, _write_locks
+from app.models.user import User
+
+def write_lock() -> asyncio.Lock:
+    return _write_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+
+def rename(user_id: int, name: str):
+    return update(User).where(User.id == user_id).values(name=name)
+
+def test_reads_do_not_take_the_lock(run, make_user):
+    make_user("reader@example.com")
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await db.scalar(select(User.id))
+            assert not write_lock().locked()
+    run(scenario())
+
+@pytest.mark.parametrize("end", ["commit", "rollback", "close"])
+def test_lock_is_held_from_the_first_write_until_the_transaction_ends(run, make_user, end):
+    user_id, _ = make_user("writer@example.com")
+
+    async def scenario():
+        db = AsyncSessionLocal()
+        await db.execute(rename(user_id, "Renamed"))
+        assert write_lock().locked()
+        await getattr(db, end)()
+        assert not write_lock().locked()
+        await db.close()
+    run(scenario())
+
+def test_lock_is_released_when_the_block_raises(run, make_user):
+    user_id, _ = make_user("writer@example.com")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with AsyncSessionLocal() as db:
+                await db.execute(rename(user_id, "Renamed"))
+                raise RuntimeError("handler failed")
+        assert not write_lock().locked()
+    run(scenario())
+
+def test_lock_is_released_when_commit_fails(run, make_user):
+    make_user("taken@example.com")
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            db.add(User(name="Duplicate", email="taken@example.com", hashed_password="x"))
+            with pytest.raises(IntegrityError):
+                await db.commit()
+        # The failed session keeps its connection until it is rolled back or closed
+        assert not write_lock().locked()
+    run(scenario())
+
+def test_a_second_writer_waits_for_the_first_to_commit(run, make_user):
+    user_id, _ = make_user("writer@example.com")
+
+    async def scenario():
+        order = []
+
+        async def second():
+            async with AsyncSessionLocal() as db:
+                await db.execute(rename(user_id, "Second"))
+                order.append("second wrote")
+                await db.commit()
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(rename(user_id, "First"))
+            waiting = asyncio.create_task(second())
+            await asyncio.sleep(0.05)
+            order.append("first committed")
+            await db.commit()
+        await asyncio.wait_for(waiting, 5)
+        assert order == ["first committed", "second wrote"]
+        assert not write_lock().locked()
+    run(scenario())
+
+@pytest.mark.parametrize("write", ["autoflush", "run_sync"])
+def test_writes_outside_execute_wait_for_the_lock(run, write):
+    async def scenario():
+        order = []
+
+        async def writer():
+            async with AsyncSessionLocal(autoflush=True) as db:
+                db.add(User(name="New", email="new@example.com", hashed_password="x"))
+                if write == "autoflush":
+                    # Flushes the pending INSERT before the SELECT
+                    assert await db.scalar(select(User.id).where(User.email == "new@example.com"))
+                else:
+                    await db.run_sync(lambda session: session.flush())
+                order.append("wrote")
+                await db.commit()
+
+        # Held as another session would hold it, leaving the file itself
+        # unlocked, so only the lock can hold the writer back
+        async with write_lock():
+            waiting = asyncio.create_task(writer())
+            await asyncio.sleep(0.05)
+            order.append("released")
+        await asyncio.wait_for(waiting, 5)
+        assert order == ["released", "wrote"]
+        assert not write_lock().locked()
+    run(scenario())
@@ -0,0 +1,42 @@
+from sqlalchemy.orm import Session
+from app.db.database import engine
+from app.models.course import Course, Module
+
+def add_course() -> tuple:
+    with Session(engine) as session:
+        course = Course(title="Course", description="About it", level="Beginner",
+                        modules=[Module(title="Module", content="Text", order=0)])
+        session.add(course)
+        session.commit()
+        return course.id, course.modules[0].id
+
+def test_daily_course_completions_count_completions_recorded_that_day(run, api, make_user):
+    _, learner = make_user("learner@example.com")
+    _, admin = make_user("admin@example.com", role="admin")
+    course_id, module_id = add_course()
+
+    async def scenario():
+        async with api() as client:
+            async def set_completed(completed: bool):
+                response = await client.post(f"/api/courses/modules/{module_id}/progress",
+                                             json={"completed": completed}, headers=learner)
+                assert response.status_code == 200
+
+            async def completions():
+                activity = (await client.get("/api/admin/stats/activity?days=1", headers=admin)).json()
+                return activity["daily"][-1]["courseCompletions"], activity["courses"][0]["completions"]
+
+            assert (await client.post(f"/api/courses/{course_id}/enroll", headers=learner)).status_code == 200
+            await set_completed(True)
+            assert await completions() == (1, 1)
+            # Undoing a completion only changes who has finished the course now
+            await set_completed(False)
+            assert await completions() == (1, 0)
+            await set_completed(True)
+            assert await completions() == (2, 1)
+            module = {"title": "New module", "order": 1, "course_id": course_id}
+            assert (await client.post(f"/api/admin/courses/{course_id}/modules", json=module,
+                                      headers=admin)).status_code == 200
+            assert await completions() == (2, 0)
+
+    run(scenario())